@@ -0,0 +1,192 @@
+"""
+Polaris Adaptive Precision Engine
+Cheapest-sufficient arithmetic for each distance request, with certified error bounds
+
+calculate_distance_high_precision always pays for 50-digit Decimal, even
+though _precision_for_delta / required_decimals usually ask for only 6-12
+decimals, which float64 delivers. certified_distance picks the cheapest
+backend that provably meets the requested precision:
+
+    float64   d = d₀ + rate · years_ago in hardware floats (rate = -v_r)
+    exact     fixed_point.calculate_distance_fixed (scaled integers)
+
+The float64 value comes with an a-priori bound on its absolute error:
+every rounding step is bounded by the unit roundoff u = 2⁻⁵³. The value
+is then rounded to the requested number of decimals and the rounding is
+certified: it is accepted only if every value inside ± bound rounds to
+the same decimal string. Near-ties, uncertain precision estimates and
+bounds too wide for the precision go to the exact engine. Results are
+therefore identical to exact arithmetic and carry the bound that
+justified them.
+
+The float64 checks touch only floats (the per-star d₀ and rate are
+memoized), so a request that falls through costs a few float operations
+more than calling the exact engine directly. A double-double rung was
+dropped: with its exact (hi, lo) setup and certificate it measured 3-4x
+slower than the scaled-integer engine it was meant to spare.
+
+Run:
+    python adaptive_precision.py --years 0 1 100 1e-6 --stars Polaris Sirius
+"""
+
+import argparse
+from collections import namedtuple
+from decimal import Decimal
+from functools import lru_cache
+import math
+import sys
+
+from fixed_point import FixedDistance, calculate_distance_fixed
+from polaris import KM_PER_LIGHT_YEAR, SECONDS_PER_YEAR
+from popular_stars import STAR_INDEX
+
+# Unit roundoff of IEEE 754 binary64
+UNIT_ROUNDOFF = 2.0 ** -53
+
+# float64 is used only if its error bound is below this fraction of 10^-precision,
+# so that its rounding certificate fails only for values within that distance of a tie
+DISPATCH_MARGIN = 1e-3
+
+# v · 10^p must stay below this for its fractional part to be exact in float64
+FLOAT64_EXACT_LIMIT = 2.0 ** 52
+
+# Precision rule of _precision_for_delta
+MIN_PRECISION = 6
+GUARD_DIGITS = 3
+
+# |Δd| above which the precision rule gives MIN_PRECISION whatever the float rounding
+MIN_PRECISION_DELTA = 1.001e-3
+
+# Exact float64 powers of ten for the rounding scale
+POWERS_OF_TEN = tuple(10.0 ** p for p in range(23))
+
+
+class CertifiedDistance(namedtuple("CertifiedDistance", ["scaled", "precision", "error_bound_ly", "backend"])):
+    """
+    A distance rounded to `precision` decimals, with its certificate
+
+    scaled / 10^precision is exactly what exact arithmetic rounds to
+    (half-even); error_bound_ly bounds the error of the unrounded value the
+    backend computed (0.0 for the exact backend). A named tuple of plain
+    values keeps the float64 path to a single small allocation; the
+    FixedDistance is built on access.
+    """
+    __slots__ = ()
+
+    @property
+    def distance(self):
+        return FixedDistance(self.scaled, self.precision)
+
+    @property
+    def distance_ly(self):
+        # Correctly rounded: int / int true division rounds once
+        return self.scaled / 10 ** self.precision
+
+
+def _ratio(value):
+    """Exact (numerator, denominator) of a number written as a decimal string"""
+    return Decimal(str(value)).as_integer_ratio()
+
+
+@lru_cache(maxsize=4096)
+def _star_terms(distance_ly, radial_velocity_km_s):
+    """
+    Correctly rounded float64 d₀ and rate (ly per Julian year ago, i.e. -v_r)
+
+    Derived from the exact ratios of the catalog values (int / int true
+    division rounds once), so they do not depend on the Decimal context.
+    Also returns float_decimals, the most decimals a float64 result at d₀
+    can ever certify (its error bound is at least 2u|d₀|); requests for
+    more go to the exact engine without evaluating the bound.
+
+    Returns:
+        Tuple (d0, rate, float_decimals)
+    """
+    v_num, v_den = _ratio(radial_velocity_km_s)
+    km_num, km_den = KM_PER_LIGHT_YEAR.as_integer_ratio()
+    d_num, d_den = _ratio(distance_ly)
+    d0 = d_num / d_den
+    rate = -v_num * int(SECONDS_PER_YEAR) * km_den / (v_den * km_num)
+    float_decimals = math.floor(math.log10(DISPATCH_MARGIN / (2.0 * UNIT_ROUNDOFF * abs(d0)))) if d0 else len(POWERS_OF_TEN) - 1
+    return d0, rate, min(float_decimals, len(POWERS_OF_TEN) - 1)
+
+
+def _float64_result(d0, delta, t, precision):
+    """float64 d₀ + Δd rounded to precision decimals, certified (None when not certified)"""
+    value = d0 + delta
+    # |d0_f - d0| ≤ u|d0|, rate·t carries ≤ 3u (1u more when t is not exact), the sum ≤ u|value|
+    delta_factor = 3.01 if t.is_integer() and abs(t) < FLOAT64_EXACT_LIMIT else 4.01
+    bound = UNIT_ROUNDOFF * (abs(d0) + delta_factor * abs(delta) + 1.01 * abs(value)) * 1.001
+    scale = POWERS_OF_TEN[precision]
+    if bound * scale > DISPATCH_MARGIN:
+        return None
+    x = value * scale
+    if abs(x) >= FLOAT64_EXACT_LIMIT:
+        return None
+    # x carries ≤ u|x| more; its fractional part is exact below 2^52
+    x_bound = (bound * scale + UNIT_ROUNDOFF * abs(x)) * 1.001
+    whole = math.floor(x)
+    fraction = x - whole
+    if abs(fraction - 0.5) <= x_bound:
+        return None
+    return CertifiedDistance(whole + (fraction > 0.5), precision, bound, "float64")
+
+
+def certified_distance(star, years_ago, max_precision=18):
+    """
+    Distance at years_ago rounded to the precision rule, by the cheapest certified backend
+
+    Args:
+        star: Star object with distance_ly and radial_velocity_km_s
+        years_ago: Negative for future, positive for past (0 = current)
+        max_precision: Maximum decimal precision
+
+    Returns:
+        CertifiedDistance (same digits and precision as
+        fixed_point.calculate_distance_fixed)
+    """
+    d0, rate, float_decimals = _star_terms(star.distance_ly, star.radial_velocity_km_s)
+    t = float(years_ago)
+    delta = rate * t
+    magnitude = abs(delta)
+    # Precision rule on the float Δd: it is within a few u of the exact one, so
+    # trunc(-log10|Δd|) is certain unless -log10|Δd| is within 1e-9 of an integer.
+    # An underflowed product is not an exact zero.
+    precision = None
+    if magnitude > MIN_PRECISION_DELTA or (magnitude == 0.0 and not (t and rate)):
+        precision = MIN_PRECISION
+    elif magnitude:
+        digits = -math.log10(magnitude)
+        if abs(digits - round(digits)) >= 1e-9:
+            precision = max(MIN_PRECISION, min(max_precision, int(digits) + GUARD_DIGITS))
+
+    if precision is not None and precision <= float_decimals:
+        result = _float64_result(d0, delta, t, precision)
+        if result is not None:
+            return result
+
+    distance, precision = calculate_distance_fixed(star, years_ago, max_precision)
+    return CertifiedDistance(distance.scaled, precision, 0.0, "exact")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Distances by the cheapest certified arithmetic backend")
+    parser.add_argument("--stars", nargs="+", default=["Polaris"])
+    parser.add_argument("--years", nargs="+", default=["0", "1", "100", "-500", "1e-6"],
+                        help="Epochs in years ago (negative for future)")
+    parser.add_argument("--max-precision", type=int, default=18)
+    args = parser.parse_args(argv)
+
+    for name in args.stars:
+        star = STAR_INDEX.get(name)
+        if star is None:
+            parser.error(f"unknown star: {name}")
+        for years in args.years:
+            result = certified_distance(star, float(years), args.max_precision)
+            print(f"{star.name:<12}{years:>10}  {result.distance} ly  ±{result.error_bound_ly:.1e} "
+                  f"({result.precision} decimals, {result.backend})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,10 +3,8 @@ Polaris Real-Time API Server
 Provides live distance calculations for frontend
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, jsonify, request, Response, stream_with_context
 from flask_cors import CORS
-from datetime import datetime, timezone
-from decimal import Decimal, getcontext
 import json
 import os
 from dotenv import load_dotenv
@@ -28,121 +26,133 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from polaris import POLARIS, calculate_distance_high_precision, KM_PER_LIGHT_YEAR, DAYS_PER_YEAR, SECONDS_PER_DAY, Star
+from polaris import POLARIS, KM_PER_LIGHT_YEAR, DAYS_PER_YEAR, SECONDS_PER_DAY
+from polaris import get_star_kinematics
+from polaris import iter_historical_polaris_timeline_json, timeline_period_count
+from adaptive_precision import certified_distance
+from precession import current_pole_separation
+from popular_stars import POPULAR_STARS, STAR_INDEX
+from response_cache import ResponseCache, bucket_time, precision_bucket_seconds
+from live_stream import DistanceTicker, iter_sse_events
+from timeline_store import TimelineNotFoundError, TimelineStore
+from timeline_tiles import TimelineTiles
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for frontend
 
-# Popular Stars Database - 20 most famous stars
-POPULAR_STARS = [
-    Star(name="Sirius", catalog_id="HIP 32349", distance_ly=8.66, radial_velocity_km_s=-5.50,
-         distance_ly_uncertainty=0.01, ra_hours=6.752481, dec_degrees=-16.716116,
-         proper_motion_ra_mas_yr=-546.05, proper_motion_dec_mas_yr=-1223.14,
-         spectral_type="A1V", magnitude=-1.46),
-    Star(name="Canopus", catalog_id="HIP 30438", distance_ly=310.0, radial_velocity_km_s=20.5,
-         distance_ly_uncertainty=5.0, ra_hours=6.399198, dec_degrees=-52.695661,
-         proper_motion_ra_mas_yr=19.93, proper_motion_dec_mas_yr=23.24,
-         spectral_type="F0II", magnitude=-0.74),
-    Star(name="Alpha Centauri A", catalog_id="HIP 71683", distance_ly=4.37, radial_velocity_km_s=-21.6,
-         distance_ly_uncertainty=0.01, ra_hours=14.660766, dec_degrees=-60.835154,
-         proper_motion_ra_mas_yr=-3679.25, proper_motion_dec_mas_yr=473.67,
-         spectral_type="G2V", magnitude=0.01),
-    Star(name="Arcturus", catalog_id="HIP 69673", distance_ly=36.7, radial_velocity_km_s=-5.19,
-         distance_ly_uncertainty=0.3, ra_hours=14.261272, dec_degrees=19.182409,
-         proper_motion_ra_mas_yr=-1093.45, proper_motion_dec_mas_yr=-1999.40,
-         spectral_type="K1.5III", magnitude=-0.05),
-    Star(name="Vega", catalog_id="HIP 91262", distance_ly=25.04, radial_velocity_km_s=-13.9,
-         distance_ly_uncertainty=0.07, ra_hours=18.615649, dec_degrees=38.783693,
-         proper_motion_ra_mas_yr=200.94, proper_motion_dec_mas_yr=286.23,
-         spectral_type="A0V", magnitude=0.03),
-    Star(name="Capella", catalog_id="HIP 24608", distance_ly=42.9, radial_velocity_km_s=29.8,
-         distance_ly_uncertainty=0.5, ra_hours=5.278151, dec_degrees=45.997991,
-         proper_motion_ra_mas_yr=75.52, proper_motion_dec_mas_yr=-426.86,
-         spectral_type="G5III+G0III", magnitude=0.08),
-    Star(name="Rigel", catalog_id="HIP 24436", distance_ly=860.0, radial_velocity_km_s=20.7,
-         distance_ly_uncertainty=50.0, ra_hours=5.242298, dec_degrees=-8.201694,
-         proper_motion_ra_mas_yr=1.87, proper_motion_dec_mas_yr=-0.56,
-         spectral_type="B8Ia", magnitude=0.13),
-    Star(name="Procyon", catalog_id="HIP 37279", distance_ly=11.46, radial_velocity_km_s=-3.2,
-         distance_ly_uncertainty=0.05, ra_hours=7.655026, dec_degrees=5.224988,
-         proper_motion_ra_mas_yr=-714.59, proper_motion_dec_mas_yr=-1036.80,
-         spectral_type="F5IV-V", magnitude=0.38),
-    Star(name="Betelgeuse", catalog_id="HIP 27989", distance_ly=640.0, radial_velocity_km_s=21.91,
-         distance_ly_uncertainty=100.0, ra_hours=5.919531, dec_degrees=7.407063,
-         proper_motion_ra_mas_yr=27.33, proper_motion_dec_mas_yr=10.86,
-         spectral_type="M1-M2Ia-Iab", magnitude=0.50),
-    Star(name="Achernar", catalog_id="HIP 7588", distance_ly=139.0, radial_velocity_km_s=16.0,
-         distance_ly_uncertainty=2.0, ra_hours=1.628567, dec_degrees=-57.236757,
-         proper_motion_ra_mas_yr=87.00, proper_motion_dec_mas_yr=-38.24,
-         spectral_type="B6Vep", magnitude=0.46),
-    Star(name="Hadar", catalog_id="HIP 68702", distance_ly=390.0, radial_velocity_km_s=-22.3,
-         distance_ly_uncertainty=20.0, ra_hours=14.063798, dec_degrees=-60.373039,
-         proper_motion_ra_mas_yr=-33.96, proper_motion_dec_mas_yr=-23.67,
-         spectral_type="B1III", magnitude=0.61),
-    Star(name="Altair", catalog_id="HIP 97649", distance_ly=16.73, radial_velocity_km_s=-26.1,
-         distance_ly_uncertainty=0.05, ra_hours=19.846309, dec_degrees=8.868322,
-         proper_motion_ra_mas_yr=536.82, proper_motion_dec_mas_yr=385.54,
-         spectral_type="A7V", magnitude=0.76),
-    Star(name="Spica", catalog_id="HIP 65474", distance_ly=262.0, radial_velocity_km_s=1.0,
-         distance_ly_uncertainty=5.0, ra_hours=13.419883, dec_degrees=-11.161322,
-         proper_motion_ra_mas_yr=-42.50, proper_motion_dec_mas_yr=-31.73,
-         spectral_type="B1III-IV+B2V", magnitude=0.98),
-    Star(name="Antares", catalog_id="HIP 80763", distance_ly=550.0, radial_velocity_km_s=-3.4,
-         distance_ly_uncertainty=30.0, ra_hours=16.490132, dec_degrees=-26.432002,
-         proper_motion_ra_mas_yr=-12.11, proper_motion_dec_mas_yr=-23.30,
-         spectral_type="M1.5Iab-Ib", magnitude=1.06),
-    Star(name="Pollux", catalog_id="HIP 37826", distance_ly=33.78, radial_velocity_km_s=3.23,
-         distance_ly_uncertainty=0.09, ra_hours=7.755381, dec_degrees=28.026199,
-         proper_motion_ra_mas_yr=-625.69, proper_motion_dec_mas_yr=-45.95,
-         spectral_type="K0III", magnitude=1.14),
-    Star(name="Fomalhaut", catalog_id="HIP 113368", distance_ly=25.13, radial_velocity_km_s=6.5,
-         distance_ly_uncertainty=0.09, ra_hours=22.960838, dec_degrees=-29.622237,
-         proper_motion_ra_mas_yr=328.95, proper_motion_dec_mas_yr=-164.67,
-         spectral_type="A3V", magnitude=1.16),
-    Star(name="Deneb", catalog_id="HIP 102098", distance_ly=2615.0, radial_velocity_km_s=-4.7,
-         distance_ly_uncertainty=215.0, ra_hours=20.690533, dec_degrees=45.280338,
-         proper_motion_ra_mas_yr=1.99, proper_motion_dec_mas_yr=1.95,
-         spectral_type="A2Ia", magnitude=1.25),
-    Star(name="Regulus", catalog_id="HIP 49669", distance_ly=79.3, radial_velocity_km_s=5.9,
-         distance_ly_uncertainty=0.7, ra_hours=10.139589, dec_degrees=11.967209,
-         proper_motion_ra_mas_yr=-249.40, proper_motion_dec_mas_yr=4.91,
-         spectral_type="B7V", magnitude=1.36),
-    Star(name="Adhara", catalog_id="HIP 33579", distance_ly=430.0, radial_velocity_km_s=27.3,
-         distance_ly_uncertainty=20.0, ra_hours=6.977088, dec_degrees=-28.972083,
-         proper_motion_ra_mas_yr=2.63, proper_motion_dec_mas_yr=2.29,
-         spectral_type="B2II", magnitude=1.50),
-    Star(name="Castor", catalog_id="HIP 36850", distance_ly=51.55, radial_velocity_km_s=5.2,
-         distance_ly_uncertainty=0.19, ra_hours=7.576640, dec_degrees=31.888316,
-         proper_motion_ra_mas_yr=-206.33, proper_motion_dec_mas_yr=-148.18,
-         spectral_type="A1V+A2Vm", magnitude=1.58)
-]
+# Upper bound on the number of periods a single streamed timeline may contain
+TIMELINE_STREAM_MAX_PERIODS = int(os.getenv('TIMELINE_STREAM_MAX_PERIODS', '5000000'))
+
+# Time-bucketed cache for the live distance endpoints
+RESPONSE_CACHE = ResponseCache(max_bytes=int(os.getenv('RESPONSE_CACHE_MAX_BYTES', str(8 * 1024 * 1024))))
+RESPONSE_CACHE_MIN_AGE = float(os.getenv('RESPONSE_CACHE_MIN_AGE', '1'))
+RESPONSE_CACHE_MAX_AGE = float(os.getenv('RESPONSE_CACHE_MAX_AGE', '300'))
+
+# Shared ticker behind the /api/stream/distances Server-Sent Events endpoint
+DISTANCE_TICKER = DistanceTicker(tick_seconds=float(os.getenv('LIVE_STREAM_TICK_SECONDS', '1')))
+LIVE_STREAM_MAX_STARS = int(os.getenv('LIVE_STREAM_MAX_STARS', '50'))
+LIVE_STREAM_MAX_INTERVAL = 3600
+
+# Precomputed timeline store behind /api/timeline/<star>; missing or stale
+# timelines are rebuilt in the background with the default range and
+# intervals (or ahead of time with `python timeline_store.py`)
+TIMELINE_STORE = TimelineStore(
+    os.getenv('TIMELINE_STORE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'timeline_store')),
+    build_spec={"start_year": 2025, "end_year": -3200, "future_year": 2500, "intervals": [100, 10, 1]}
+)
+TIMELINE_MAX_POINTS = int(os.getenv('TIMELINE_MAX_POINTS', '5000'))
+
+# Lazily computed tiles for resolutions and ranges outside the store
+TIMELINE_TILES = TimelineTiles(max_tiles=int(os.getenv('TIMELINE_TILE_CACHE_SIZE', '512')))
+TIMELINE_TILE_MAX_POINTS = int(os.getenv('TIMELINE_TILE_MAX_POINTS', '200000'))
+
+def current_distance(star):
+    """
+    Current distance of a star (0 years ago) and its certified rounding
+    
+    distance_ly is the unrounded d₀ that distance_km/au/parsec are derived
+    from; certified_distance adds the precision rule's number of decimals
+    and the exactly rounded digits at that precision.
+    
+    Returns:
+        Dict with distance_ly, distance_ly_precision and distance_ly_certified
+    """
+    certified = certified_distance(star, 0, max_precision=18)
+    return {
+        "distance_ly": float(get_star_kinematics(star).distance_decimal),
+        "distance_ly_precision": certified.precision,
+        "distance_ly_certified": str(certified.distance)
+    }
+
+def star_payload(star):
+    """
+    JSON payload for one star at the current epoch
+    
+    Unit conversions come from the memoized per-star kinematics, so no
+    Decimal objects are built per request.
+    """
+    kinematics = get_star_kinematics(star)
+    return {
+        "name": star.name,
+        "catalog_id": star.catalog_id,
+        **current_distance(star),
+        "distance_km": kinematics.distance_km,
+        "distance_au": kinematics.distance_au,
+        "distance_parsec": kinematics.distance_parsec,
+        "radial_velocity_km_s": star.radial_velocity_km_s,
+        "movement_direction": "away" if star.radial_velocity_km_s > 0 else "toward",
+        "distance_ly_uncertainty": star.distance_ly_uncertainty,
+        "ra_hours": star.ra_hours,
+        "dec_degrees": star.dec_degrees,
+        "spectral_type": star.spectral_type,
+        "magnitude": star.magnitude,
+        "proper_motion_ra_mas_yr": star.proper_motion_ra_mas_yr,
+        "proper_motion_dec_mas_yr": star.proper_motion_dec_mas_yr
+    }
+
+def cache_bucket_seconds(stars):
+    """Cache bucket length for responses about the given stars"""
+    return precision_bucket_seconds(stars, min_seconds=RESPONSE_CACHE_MIN_AGE, max_seconds=RESPONSE_CACHE_MAX_AGE)
+
+def star_bucket_seconds(star_name):
+    """Cache bucket length for /api/star/<star_name>"""
+    star = STAR_INDEX.get(star_name)
+    return cache_bucket_seconds([star] if star else [])
 
 @app.route('/api/current-distance', methods=['GET'])
+@RESPONSE_CACHE.cached('current-distance', lambda: cache_bucket_seconds([POLARIS]))
 def get_current_distance():
     """Get current real-time distance to Polaris"""
     try:
-        # Calculate current distance (0 years ago = current)
-        distance, precision = calculate_distance_high_precision(POLARIS, 0, max_precision=18)
+        # Current distance (0 years ago) and its certified precision
+        distance = current_distance(POLARIS)
+        kinematics = get_star_kinematics(POLARIS)
         
-        # Get current time
-        now = datetime.now(timezone.utc)
+        # Start of the cache bucket: the body is shared by every request in it
+        now = bucket_time()
         
         # Calculate distance change per second for animation
         distance_change_per_second = POLARIS.radial_velocity_km_s * SECONDS_PER_DAY / float(KM_PER_LIGHT_YEAR) / 86400
         
+        # Angular distance from the north celestial pole of date (precession + nutation)
+        pole_separation, pole_separation_rate = current_pole_separation(POLARIS, now)
+        
         response = {
-            "distance_ly": distance,
-            "distance_km": float(Decimal(str(distance)) * KM_PER_LIGHT_YEAR),
-            "distance_au": float(Decimal(str(distance)) * Decimal('63241.077')),  # 1 ly = 63241.077 AU
-            "distance_parsec": float(Decimal(str(distance)) / Decimal('3.261563777167433')),
-            "precision": precision,
+            "distance_ly": distance["distance_ly"],
+            "distance_ly_certified": distance["distance_ly_certified"],
+            "distance_km": kinematics.distance_km,
+            "distance_au": kinematics.distance_au,  # 1 ly = 63241.077 AU
+            "distance_parsec": kinematics.distance_parsec,
+            "precision": distance["distance_ly_precision"],
             "timestamp": now.isoformat(),
             "radial_velocity_km_s": POLARIS.radial_velocity_km_s,
             "movement_direction": "away" if POLARIS.radial_velocity_km_s > 0 else "toward",
             "distance_change_per_second_ly": distance_change_per_second,
             "distance_change_per_hour_ly": distance_change_per_second * 3600,
             "distance_change_per_day_ly": distance_change_per_second * 86400,
-            "uncertainty_ly": POLARIS.distance_ly_uncertainty
+            "uncertainty_ly": POLARIS.distance_ly_uncertainty,
+            "north_pole_separation_deg": pole_separation,
+            "north_pole_separation_change_per_year_deg": pole_separation_rate
         }
         
         return jsonify(response)
@@ -151,104 +161,181 @@ def get_current_distance():
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/popular-stars', methods=['GET'])
+@RESPONSE_CACHE.cached('popular-stars', lambda: cache_bucket_seconds(POPULAR_STARS))
 def get_popular_stars():
     """Get data for 20 popular stars"""
     try:
-        stars_data = []
-        for star in POPULAR_STARS:
-            distance, precision = calculate_distance_high_precision(star, 0, max_precision=18)
-            stars_data.append({
-                "name": star.name,
-                "catalog_id": star.catalog_id,
-                "distance_ly": distance,
-                "distance_km": float(Decimal(str(distance)) * KM_PER_LIGHT_YEAR),
-                "distance_au": float(Decimal(str(distance)) * Decimal('63241.077')),
-                "distance_parsec": float(Decimal(str(distance)) / Decimal('3.261563777167433')),
-                "radial_velocity_km_s": star.radial_velocity_km_s,
-                "movement_direction": "away" if star.radial_velocity_km_s > 0 else "toward",
-                "distance_ly_uncertainty": star.distance_ly_uncertainty,
-                "ra_hours": star.ra_hours,
-                "dec_degrees": star.dec_degrees,
-                "spectral_type": star.spectral_type,
-                "magnitude": star.magnitude,
-                "proper_motion_ra_mas_yr": star.proper_motion_ra_mas_yr,
-                "proper_motion_dec_mas_yr": star.proper_motion_dec_mas_yr
-            })
+        stars_data = [star_payload(star) for star in POPULAR_STARS]
         
         return jsonify({"stars": stars_data, "count": len(stars_data)})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/star/<star_name>', methods=['GET'])
+@RESPONSE_CACHE.cached('star', star_bucket_seconds)
 def get_star_info(star_name):
     """Get detailed info for a specific star"""
     try:
-        star = None
-        for s in POPULAR_STARS:
-            if s.name.lower() == star_name.lower():
-                star = s
-                break
-        
-        if not star and star_name.lower() == "polaris":
-            star = POLARIS
+        star = STAR_INDEX.get(star_name)
         
         if not star:
             return jsonify({"error": "Star not found"}), 404
         
-        distance, precision = calculate_distance_high_precision(star, 0, max_precision=18)
+        return jsonify(star_payload(star))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/stream/distances', methods=['GET'])
+def stream_distances():
+    """
+    Server-Sent Events stream of live distances
+    
+    Query parameters:
+        stars: Comma-separated star names/IDs (default: Polaris)
+        interval: Seconds between updates (default: 3)
+    """
+    try:
+        names = [name.strip() for name in request.args.get('stars', 'Polaris').split(',') if name.strip()]
+        interval = request.args.get('interval', 3.0, type=float)
         
-        response = {
-            "name": star.name,
-            "catalog_id": star.catalog_id,
-            "distance_ly": distance,
-            "distance_km": float(Decimal(str(distance)) * KM_PER_LIGHT_YEAR),
-            "distance_au": float(Decimal(str(distance)) * Decimal('63241.077')),
-            "distance_parsec": float(Decimal(str(distance)) / Decimal('3.261563777167433')),
-            "radial_velocity_km_s": star.radial_velocity_km_s,
-            "movement_direction": "away" if star.radial_velocity_km_s > 0 else "toward",
-            "distance_ly_uncertainty": star.distance_ly_uncertainty,
-            "ra_hours": star.ra_hours,
-            "dec_degrees": star.dec_degrees,
-            "spectral_type": star.spectral_type,
-            "magnitude": star.magnitude,
-            "proper_motion_ra_mas_yr": star.proper_motion_ra_mas_yr,
-            "proper_motion_dec_mas_yr": star.proper_motion_dec_mas_yr
-        }
+        if not names:
+            return jsonify({"error": "At least one star is required"}), 400
+        if len(names) > LIVE_STREAM_MAX_STARS:
+            return jsonify({"error": f"At most {LIVE_STREAM_MAX_STARS} stars per stream"}), 400
+        if not 0 < interval <= LIVE_STREAM_MAX_INTERVAL:
+            return jsonify({"error": f"interval must be between 0 and {LIVE_STREAM_MAX_INTERVAL} seconds"}), 400
         
-        return jsonify(response)
+        stars = [STAR_INDEX.get(name) for name in names]
+        missing = [name for name, star in zip(names, stars) if star is None]
+        if missing:
+            return jsonify({"error": "Star not found", "stars": missing}), 404
+        
+        subscription = DISTANCE_TICKER.subscribe(stars, interval)
+        response = Response(iter_sse_events(DISTANCE_TICKER, subscription), mimetype='text/event-stream')
+        response.headers['Cache-Control'] = 'no-cache'
+        response.headers['X-Accel-Buffering'] = 'no'  # Disable proxy buffering
+        return response
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-@app.route('/api/ai-search', methods=['POST'])
-def ai_search():
-    """AI-powered search for space, astronomy, aerospace information"""
+@app.route('/api/star-search', methods=['GET'])
+def search_stars():
+    """Autocomplete / fuzzy search over star names, catalog IDs and aliases"""
     try:
-        data = request.get_json()
-        query = data.get('query', '')
-        context = data.get('context', {})  # Can include star/planet info
+        query = request.args.get('q', '').strip()
+        limit = min(max(request.args.get('limit', 10, type=int), 1), 50)
+        fuzzy = request.args.get('fuzzy', 'true').lower() != 'false'
         
         if not query:
-            return jsonify({"error": "Query is required"}), 400
+            return jsonify({"error": "Query parameter 'q' is required"}), 400
         
-        if not OPENAI_AVAILABLE or not client:
-            # Fallback response if OpenAI is not available
-            return jsonify({
-                "answer": "AI search is not available. Please set OPENAI_API_KEY environment variable.",
-                "sources": [],
-                "travel_time": None,
-                "latest_research": None
-            })
+        matches = [
+            {
+                "name": match["name"],
+                "catalog_id": match["star"].catalog_id,
+                "matched": match["matched"],
+                "match": match["match"]
+            }
+            for match in STAR_INDEX.search(query, limit=limit, fuzzy=fuzzy)
+        ]
+        return jsonify({"query": query, "results": matches, "count": len(matches)})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/polaris-timeline', methods=['GET'])
+def stream_polaris_timeline():
+    """Stream the Polaris historical timeline report as JSON, one period at a time"""
+    try:
+        start_year = request.args.get('start', 2025, type=int)
+        end_year = request.args.get('end', -3200, type=int)
+        future_year = request.args.get('future', None, type=int)
+        interval_years = request.args.get('interval', 100, type=int)
+        
+        if interval_years <= 0:
+            return jsonify({"error": "interval must be positive"}), 400
+        
+        total_periods = timeline_period_count(start_year, end_year, future_year, interval_years)
+        if total_periods > TIMELINE_STREAM_MAX_PERIODS:
+            return jsonify({"error": f"Timeline too large ({total_periods} periods, max {TIMELINE_STREAM_MAX_PERIODS})"}), 400
+        
+        chunks = iter_historical_polaris_timeline_json(
+            POLARIS, start_year, end_year, future_year, interval_years, max_precision=18
+        )
+        return Response(stream_with_context(chunks), mimetype='application/json')
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/timeline/<star_name>', methods=['GET'])
+def get_timeline_slice(star_name):
+    """
+    Return a year window of a star's precomputed timeline as columns
+    
+    Query parameters: from, to (inclusive years), step (years between points)
+    and points (point budget; longer slices are downsampled with MinMax-LTTB).
+    Windows the precomputed store cannot serve (other resolutions, ranges
+    beyond it, timelines still being built) are computed from lazily
+    cached tiles.
+    """
+    try:
+        star = STAR_INDEX.get(star_name)
+        if not star:
+            return jsonify({"error": "Star not found"}), 404
+        
+        max_points = request.args.get('points', TIMELINE_MAX_POINTS, type=int)
+        if max_points > TIMELINE_MAX_POINTS:
+            return jsonify({"error": f"points must not exceed {TIMELINE_MAX_POINTS}"}), 400
+        
+        from_year = request.args.get('from', None, type=int)
+        to_year = request.args.get('to', None, type=int)
+        step = request.args.get('step', None, type=int)
         
-        # Build context-aware prompt
-        system_prompt = """You are an expert AI assistant specialized in astronomy, space exploration, aerospace engineering, and material science. 
+        if TIMELINE_STORE.covers(star, from_year, to_year, step):
+            result = TIMELINE_STORE.query(star, from_year, to_year, step, max_points)
+        else:
+            if (from_year is None or to_year is None) and TIMELINE_STORE.is_building(star):
+                # Serve the range the store is being built with
+                spec = TIMELINE_STORE.build_spec
+                from_year = spec["end_year"] if from_year is None else from_year
+                to_year = (spec["future_year"] or spec["start_year"]) if to_year is None else to_year
+            if from_year is None or to_year is None:
+                return jsonify({"error": "from and to are required outside the precomputed range"}), 400
+            step = step or 1
+            if step > 0 and (to_year - from_year) // step + 1 > TIMELINE_TILE_MAX_POINTS:
+                return jsonify({"error": f"Window too large (max {TIMELINE_TILE_MAX_POINTS} points before downsampling)"}), 400
+            result = TIMELINE_TILES.query(star, from_year, to_year, step, max_points)
+        return jsonify(result)
+    except TimelineNotFoundError:
+        return jsonify({"error": "No precomputed timeline for this star"}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# AI search prompt and model settings (shared with the async server in asgi_server.py)
+AI_SEARCH_SYSTEM_PROMPT = """You are an expert AI assistant specialized in astronomy, space exploration, aerospace engineering, and material science. 
 Provide accurate, detailed, and up-to-date information. When answering questions about celestial bodies:
 - Calculate travel time using current propulsion technology (if applicable)
 - Mention latest research findings
 - Include relevant material science information for space applications
 - Provide aerospace engineering insights
 - Be specific about distances, times, and scientific facts"""
-        
-        user_prompt = f"""Query: {query}
+
+AI_SEARCH_COMPLETION_PARAMS = {
+    "model": "gpt-4",
+    "temperature": 0.7,
+    "max_tokens": 1500
+}
+
+AI_SEARCH_UNAVAILABLE = {
+    "answer": "AI search is not available. Please set OPENAI_API_KEY environment variable.",
+    "sources": [],
+    "travel_time": None,
+    "latest_research": None
+}
+
+def build_ai_search_messages(query, context):
+    """Build the chat messages for an AI search query"""
+    user_prompt = f"""Query: {query}
         
 Context: {json.dumps(context, indent=2) if context else 'None'}
 
@@ -260,39 +347,58 @@ Please provide:
 5. Aerospace engineering insights
 
 Format your response as JSON with keys: answer, travel_time, latest_research, material_science, aerospace_insights"""
+    
+    return [
+        {"role": "system", "content": AI_SEARCH_SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt}
+    ]
+
+def format_ai_search_answer(answer_text, query):
+    """Turn the model's reply into the /api/ai-search response payload"""
+    # Try to parse JSON response, fallback to plain text
+    try:
+        answer_data = json.loads(answer_text)
+    except (TypeError, ValueError):
+        answer_data = {
+            "answer": answer_text,
+            "travel_time": None,
+            "latest_research": None,
+            "material_science": None,
+            "aerospace_insights": None
+        }
+    
+    return {
+        "answer": answer_data.get("answer", answer_text),
+        "travel_time": answer_data.get("travel_time"),
+        "latest_research": answer_data.get("latest_research"),
+        "material_science": answer_data.get("material_science"),
+        "aerospace_insights": answer_data.get("aerospace_insights"),
+        "query": query
+    }
+
+@app.route('/api/ai-search', methods=['POST'])
+def ai_search():
+    """AI-powered search for space, astronomy, aerospace information"""
+    try:
+        data = request.get_json(silent=True) or {}
+        if not isinstance(data, dict):
+            return jsonify({"error": "Request body must be a JSON object"}), 400
+        query = data.get('query', '')
+        context = data.get('context', {})  # Can include star/planet info
         
-        response = client.chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.7,
-            max_tokens=1500
-        )
+        if not query:
+            return jsonify({"error": "Query is required"}), 400
         
-        answer_text = response.choices[0].message.content
+        if not OPENAI_AVAILABLE or not client:
+            # Fallback response if OpenAI is not available
+            return jsonify(AI_SEARCH_UNAVAILABLE)
         
-        # Try to parse JSON response, fallback to plain text
-        try:
-            answer_data = json.loads(answer_text)
-        except:
-            answer_data = {
-                "answer": answer_text,
-                "travel_time": None,
-                "latest_research": None,
-                "material_science": None,
-                "aerospace_insights": None
-            }
+        response = client.chat.completions.create(
+            messages=build_ai_search_messages(query, context),
+            **AI_SEARCH_COMPLETION_PARAMS
+        )
         
-        return jsonify({
-            "answer": answer_data.get("answer", answer_text),
-            "travel_time": answer_data.get("travel_time"),
-            "latest_research": answer_data.get("latest_research"),
-            "material_science": answer_data.get("material_science"),
-            "aerospace_insights": answer_data.get("aerospace_insights"),
-            "query": query
-        })
+        return jsonify(format_ai_search_answer(response.choices[0].message.content, query))
         
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -303,7 +409,10 @@ def health():
     return jsonify({
         "status": "healthy", 
         "service": "Polaris API",
-        "openai_available": OPENAI_AVAILABLE and client is not None
+        "openai_available": OPENAI_AVAILABLE and client is not None,
+        "response_cache": RESPONSE_CACHE.stats(),
+        "timeline_store": TIMELINE_STORE.stats(),
+        "timeline_tiles": TIMELINE_TILES.stats()
     })
 
 if __name__ == '__main__':
@@ -315,8 +424,12 @@ if __name__ == '__main__':
     print("  GET /api/current-distance - Real-time Polaris distance")
     print("  GET /api/popular-stars - Get 20 popular stars data")
     print("  GET /api/star/<name> - Get specific star info")
+    print("  GET /api/star-search?q= - Autocomplete/fuzzy star search")
+    print("  GET /api/polaris-timeline - Stream Polaris timeline JSON")
+    print("  GET /api/timeline/<star>?from=&to=&step=&points= - Timeline window (downsampled)")
+    print("  GET /api/stream/distances?stars=&interval= - Live distance events (SSE)")
     print("  POST /api/ai-search - AI-powered search for space/astronomy info")
     print("  GET /api/health - Health check")
     print("=" * 60)
-    app.run(host='0.0.0.0', port=5000, debug=False)
+    app.run(host='0.0.0.0', port=5000, debug=False, threaded=True)
 
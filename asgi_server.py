@@ -0,0 +1,192 @@
+"""
+Polaris ASGI Server
+Production async serving mode for the Polaris API
+
+Serves the same routes as api_server.py on an ASGI stack (uvicorn):
+- POST /api/ai-search runs natively on the event loop with the async
+  OpenAI client, so a slow AI answer never occupies a worker thread
+- Every other route is the Flask app, run in a bounded thread pool
+  (a2wsgi), so cheap distance endpoints keep answering while AI searches
+  are in flight
+
+Run:
+    python asgi_server.py --workers 4 --port 5000
+or
+    uvicorn asgi_server:application --workers 4 --port 5000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+
+from a2wsgi import WSGIMiddleware
+
+from api_server import (
+    AI_SEARCH_COMPLETION_PARAMS,
+    AI_SEARCH_UNAVAILABLE,
+    app,
+    build_ai_search_messages,
+    format_ai_search_answer,
+)
+
+# Try to import the async OpenAI client, but make it optional
+try:
+    from openai import AsyncOpenAI
+    ASYNC_OPENAI_AVAILABLE = True
+except ImportError:
+    ASYNC_OPENAI_AVAILABLE = False
+
+# Threads per process for the synchronous Flask routes
+WSGI_THREADS = int(os.getenv('POLARIS_WSGI_THREADS', '32'))
+
+# Concurrent AI searches per process and per-search timeout (seconds)
+AI_SEARCH_MAX_CONCURRENCY = int(os.getenv('AI_SEARCH_MAX_CONCURRENCY', '16'))
+AI_SEARCH_TIMEOUT = float(os.getenv('AI_SEARCH_TIMEOUT', '60'))
+
+# Largest accepted /api/ai-search request body
+AI_SEARCH_MAX_BODY_BYTES = 64 * 1024
+
+wsgi_application = WSGIMiddleware(app, workers=WSGI_THREADS)
+
+_async_client = None
+# Created on lifespan startup, inside the serving event loop
+_ai_search_slots = None
+
+
+def get_async_client():
+    """Return the shared AsyncOpenAI client, or None if AI search is not configured"""
+    global _async_client
+    if _async_client is None and ASYNC_OPENAI_AVAILABLE and os.getenv('OPENAI_API_KEY'):
+        _async_client = AsyncOpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+    return _async_client
+
+
+def get_ai_search_slots():
+    """Return the AI search semaphore (created here if the server skipped lifespan startup)"""
+    global _ai_search_slots
+    if _ai_search_slots is None:
+        _ai_search_slots = asyncio.Semaphore(AI_SEARCH_MAX_CONCURRENCY)
+    return _ai_search_slots
+
+
+async def read_body(receive, max_bytes):
+    """Read a complete HTTP request body; returns None if it exceeds max_bytes"""
+    chunks, size = [], 0
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return None
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > max_bytes:
+            return None
+        chunks.append(chunk)
+        if not message.get("more_body", False):
+            return b"".join(chunks)
+
+
+async def send_json(send, status, payload):
+    """Send a JSON response (CORS-enabled like the Flask app)"""
+    body = json.dumps(payload).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode("ascii")),
+            (b"access-control-allow-origin", b"*"),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def ai_search(scope, receive, send):
+    """Non-blocking version of api_server.ai_search"""
+    try:
+        body = await read_body(receive, AI_SEARCH_MAX_BODY_BYTES)
+        if body is None:
+            await send_json(send, 413, {"error": "Request body too large"})
+            return
+        try:
+            data = json.loads(body or b"{}") or {}
+        except ValueError:
+            data = {}
+        if not isinstance(data, dict):
+            await send_json(send, 400, {"error": "Request body must be a JSON object"})
+            return
+        query = data.get('query', '')
+        context = data.get('context', {})  # Can include star/planet info
+
+        if not query:
+            await send_json(send, 400, {"error": "Query is required"})
+            return
+
+        client = get_async_client()
+        if client is None:
+            # Fallback response if OpenAI is not available
+            await send_json(send, 200, AI_SEARCH_UNAVAILABLE)
+            return
+
+        async with get_ai_search_slots():
+            response = await asyncio.wait_for(
+                client.chat.completions.create(
+                    messages=build_ai_search_messages(query, context),
+                    **AI_SEARCH_COMPLETION_PARAMS
+                ),
+                timeout=AI_SEARCH_TIMEOUT
+            )
+
+        await send_json(send, 200, format_ai_search_answer(response.choices[0].message.content, query))
+
+    except asyncio.TimeoutError:
+        await send_json(send, 504, {"error": "AI search timed out"})
+    except Exception as e:
+        await send_json(send, 500, {"error": str(e)})
+
+
+async def lifespan(receive, send):
+    """ASGI lifespan handling: per-process async state lives in the serving loop"""
+    global _ai_search_slots
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            _ai_search_slots = asyncio.Semaphore(AI_SEARCH_MAX_CONCURRENCY)
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            _ai_search_slots = None
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def application(scope, receive, send):
+    """ASGI entry point: async AI search, everything else through the Flask app"""
+    if scope["type"] == "lifespan":
+        await lifespan(receive, send)
+    elif scope["type"] == "http" and scope["path"] == "/api/ai-search" and scope["method"] == "POST":
+        await ai_search(scope, receive, send)
+    else:
+        await wsgi_application(scope, receive, send)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Polaris API on an ASGI server (uvicorn)")
+    parser.add_argument("--host", default=os.getenv('POLARIS_HOST', '0.0.0.0'))
+    parser.add_argument("--port", type=int, default=int(os.getenv('POLARIS_PORT', '5000')))
+    parser.add_argument("--workers", type=int, default=int(os.getenv('POLARIS_WORKERS', '1')),
+                        help="Number of worker processes")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    print("=" * 60)
+    print("POLARIS API SERVER (ASGI)")
+    print("=" * 60)
+    print(f"Starting server on http://{args.host}:{args.port}")
+    print(f"Workers: {args.workers}  |  Threads per worker: {WSGI_THREADS}")
+    print("=" * 60)
+    uvicorn.run("asgi_server:application", host=args.host, port=args.port, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
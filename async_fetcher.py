@@ -0,0 +1,524 @@
+"""
+Polaris Async Data Fetcher
+Concurrent, pooled multi-source queries for whole star catalogs
+
+AstronomicalDataFetcher asks Gaia, Hipparcos and SIMBAD one after another
+for a single star. This module queries all three sources concurrently and
+does so for many stars at once:
+
+- one shared httpx.AsyncClient (keep-alive connection pool)
+- a concurrency limit per host, so SIMBAD and VizieR are not flooded
+- per-request timeouts and retries with exponential backoff and jitter
+  on connection errors, timeouts, HTTP 429 and 5xx (Retry-After honoured)
+- an in-memory cache of per-source results with a time-to-live, and
+  optionally the persistent CatalogCache (conditional revalidation)
+- fetch_many(identifiers) for bulk catalog refreshes
+
+Gaia EDR3 and Hipparcos are read from VizieR tab-separated output
+(nearest match to the identifier, resolved by VizieR/Sesame); SIMBAD uses
+the same request and parser as AstronomicalDataFetcher.fetch_simbad_data.
+Base URLs are constructor arguments, so the fetcher can be pointed at a
+local stub server.
+
+Run:
+    python async_fetcher.py "HIP 11767" Sirius Vega --output fetched_stars.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+import httpx
+
+from catalog_cache import DEFAULT_CACHE_PATH, CatalogCache, conditional_headers, is_fresh, request_fingerprint
+from data_fetcher import SIMBAD_BASE_URL, AstronomicalDataFetcher
+from polaris import PARSEC_LY
+
+# VizieR tab-separated query endpoint
+VIZIER_ASU_URL = "http://vizier.u-strasbg.fr/viz-bin/asu-tsv"
+
+PARSEC_LY_FLOAT = float(PARSEC_LY)
+
+# Source name -> (VizieR catalog, output columns)
+VIZIER_CATALOGS = {
+    "GAIA EDR3": ("I/350/gaiaedr3", "Source,Plx,e_Plx,pmRA,pmDE,RVDR2,e_RVDR2,Gmag"),
+    "Hipparcos": ("I/239/hip_main", "HIP,Plx,e_Plx,pmRA,pmDE,Vmag"),
+}
+
+# Same priority as AstronomicalDataFetcher.get_best_available_data
+SOURCE_PRIORITY = ("GAIA EDR3", "Hipparcos", "SIMBAD")
+
+# Cone search radius around the resolved identifier (arcmin)
+DEFAULT_SEARCH_RADIUS_ARCMIN = 1
+
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_MAX_CONNECTIONS = 64
+DEFAULT_PER_HOST_LIMIT = 8
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+DEFAULT_MAX_BACKOFF = 30.0
+DEFAULT_CACHE_TTL = 24 * 3600
+
+# Stars in flight at once in fetch_many (requests are still bounded per host)
+DEFAULT_CONCURRENCY = 32
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def parse_vizier_tsv(text):
+    """
+    Parse VizieR asu-tsv output
+
+    Comment lines (#), the units line and the dashes line are skipped.
+
+    Args:
+        text: Response body
+
+    Returns:
+        List of dicts (column name -> string value, '' for blanks)
+    """
+    header = None
+    rows = []
+    for line in text.splitlines():
+        if not line.strip() or line.startswith("#"):
+            continue
+        fields = [field.strip() for field in line.split("\t")]
+        if header is None:
+            header = fields
+            continue
+        if not rows and all(not field or set(field) == {"-"} for field in fields):
+            continue
+        if not rows and len(fields) == len(header) and not any(_float(field) is not None for field in fields):
+            # Units line (e.g. "mas  mas  mas/yr")
+            continue
+        rows.append(dict(zip(header, fields)))
+    return rows
+
+
+def _float(value):
+    """Float of a catalog field, None for blanks and non-numbers"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _present(data):
+    """Drop missing fields so lower-priority sources and defaults can fill them"""
+    return {key: value for key, value in data.items() if value is not None}
+
+
+def _parallax_distance(parallax_mas, parallax_error_mas):
+    """Distance fields from a trigonometric parallax (d = 1/p)"""
+    if not parallax_mas or parallax_mas <= 0:
+        return {}
+    distance_parsec = 1000.0 / parallax_mas
+    fields = {
+        "parallax_mas": parallax_mas,
+        "parallax_arcsec": parallax_mas / 1000.0,
+        "distance_parsec": distance_parsec,
+        "distance_ly": distance_parsec * PARSEC_LY_FLOAT,
+        "parallax_error_mas": parallax_error_mas,
+        "distance_method": "Trigonometric parallax (d = 1/p)"
+    }
+    if parallax_error_mas is not None:
+        # First-order propagation: sigma_d = d · sigma_p / p
+        fields["distance_uncertainty_ly"] = fields["distance_ly"] * parallax_error_mas / parallax_mas
+    return fields
+
+
+def parse_gaia_row(row):
+    """Gaia EDR3 VizieR row -> dict in the layout of fetch_gaia_edr3_data"""
+    data = {
+        "source_id": row.get("Source"),
+        **_parallax_distance(_float(row.get("Plx")), _float(row.get("e_Plx"))),
+        "radial_velocity_km_s": _float(row.get("RVDR2")),
+        "radial_velocity_error_km_s": _float(row.get("e_RVDR2")),
+        "proper_motion_ra_mas_yr": _float(row.get("pmRA")),
+        "proper_motion_dec_mas_yr": _float(row.get("pmDE")),
+        "magnitude_g": _float(row.get("Gmag")),
+        "source": "GAIA EDR3"
+    }
+    return _present(data) if "distance_ly" in data else None
+
+
+def parse_hipparcos_row(row):
+    """Hipparcos VizieR row -> dict in the layout of fetch_hipparcos_data"""
+    hip_id = _float(row.get("HIP"))
+    data = {
+        "hip_id": int(hip_id) if hip_id is not None else None,
+        **_parallax_distance(_float(row.get("Plx")), _float(row.get("e_Plx"))),
+        "proper_motion_ra_mas_yr": _float(row.get("pmRA")),
+        "proper_motion_dec_mas_yr": _float(row.get("pmDE")),
+        "magnitude_v": _float(row.get("Vmag")),
+        "source": "Hipparcos"
+    }
+    return _present(data) if "distance_ly" in data else None
+
+
+VIZIER_PARSERS = {
+    "GAIA EDR3": parse_gaia_row,
+    "Hipparcos": parse_hipparcos_row,
+}
+
+
+def combine_sources(identifier, results):
+    """
+    Pick the best source and fill its gaps from the others
+
+    Args:
+        identifier: Queried star identifier
+        results: Dict of source name -> parsed data (or None)
+
+    Returns:
+        Dict in the layout of get_best_available_data plus "identifier" and
+        "sources", or None if no source returned data
+    """
+    available = [source for source in SOURCE_PRIORITY if results.get(source)]
+    if not available:
+        return None
+    combined = dict(results[available[0]])
+    for source in available[1:]:
+        for key, value in results[source].items():
+            if combined.get(key) is None and value is not None:
+                combined[key] = value
+    combined.update({
+        "identifier": identifier,
+        "sources": available,
+        "priority": available[0],
+        "fetch_date": datetime.now(timezone.utc).isoformat()
+    })
+    return combined
+
+
+class AsyncAstronomicalDataFetcher:
+    """
+    Concurrent Gaia/Hipparcos/SIMBAD fetcher with pooling, limits, retries and caching
+
+    Use as an async context manager (or call aclose()) so the connection pool
+    is released.
+
+    Args:
+        simbad_url: SIMBAD sim-id endpoint
+        vizier_url: VizieR asu-tsv endpoint
+        timeout: Per-request timeout in seconds
+        max_connections: Size of the shared connection pool
+        per_host_limit: Requests in flight per host
+        retries: Retries after the first attempt
+        backoff: Base delay of the exponential backoff in seconds
+        max_backoff: Upper bound on a single backoff delay
+        cache_ttl: Seconds a per-source result is reused (0 disables caching)
+        search_radius_arcmin: VizieR cone search radius
+        transport: Optional httpx transport (e.g. httpx.MockTransport)
+        catalog_cache: Optional CatalogCache for raw responses across runs
+    """
+
+    def __init__(self, simbad_url=SIMBAD_BASE_URL, vizier_url=VIZIER_ASU_URL, timeout=DEFAULT_TIMEOUT,
+                 max_connections=DEFAULT_MAX_CONNECTIONS, per_host_limit=DEFAULT_PER_HOST_LIMIT,
+                 retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF, max_backoff=DEFAULT_MAX_BACKOFF,
+                 cache_ttl=DEFAULT_CACHE_TTL, search_radius_arcmin=DEFAULT_SEARCH_RADIUS_ARCMIN,
+                 transport=None, catalog_cache=None):
+        self.simbad_url = simbad_url
+        self.vizier_url = vizier_url
+        self.per_host_limit = per_host_limit
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.cache_ttl = cache_ttl
+        self.search_radius_arcmin = search_radius_arcmin
+        self.catalog_cache = catalog_cache
+        self._client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_connections),
+            transport=transport,
+            follow_redirects=True
+        )
+        self._host_limits = {}
+        self._cache = {}
+        self._simbad_parser = AstronomicalDataFetcher()
+        self.requests = 0
+        self.retried = 0
+        self.failures = 0
+        self.cache_hits = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """Close the connection pool"""
+        await self._client.aclose()
+
+    def _host_limit(self, url):
+        """Semaphore bounding the requests in flight to url's host"""
+        host = urlsplit(url).netloc
+        limit = self._host_limits.get(host)
+        if limit is None:
+            limit = self._host_limits[host] = asyncio.Semaphore(self.per_host_limit)
+        return limit
+
+    def _retry_delay(self, attempt, response=None):
+        """Exponential backoff with full jitter, or the server's Retry-After"""
+        if response is not None:
+            retry_after = _float(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, self.max_backoff)
+        return random.uniform(0, min(self.backoff * 2 ** attempt, self.max_backoff))
+
+    async def get(self, url, params, headers=None):
+        """
+        GET with the per-host limit, retries and backoff
+
+        Returns:
+            httpx.Response with a 2xx status (or 304 for conditional requests)
+
+        Raises:
+            httpx.HTTPError: After the last retry
+        """
+        limit = self._host_limit(url)
+        for attempt in range(self.retries + 1):
+            response = None
+            try:
+                # The slot is released while backing off
+                async with limit:
+                    self.requests += 1
+                    response = await self._client.get(url, params=params, headers=headers)
+                if response.status_code == 304 and headers:
+                    return response
+                if response.status_code not in RETRY_STATUS_CODES:
+                    response.raise_for_status()
+                    return response
+                error = httpx.HTTPStatusError(f"HTTP {response.status_code}", request=response.request,
+                                              response=response)
+            except httpx.TransportError as e:
+                error = e
+            if attempt == self.retries:
+                raise error
+            self.retried += 1
+            await asyncio.sleep(self._retry_delay(attempt, response))
+
+    async def get_body(self, source, catalog, identifier, url, params):
+        """
+        Response body, through the persistent catalog cache when one is set
+
+        Fresh entries are served without a request, expired ones are
+        revalidated, and a stale body is served if the refresh fails.
+
+        Returns:
+            Response body as bytes
+        """
+        if self.catalog_cache is None:
+            return (await self.get(url, params)).content
+        query = request_fingerprint(url, params)
+        entry = self.catalog_cache.get(source, catalog, identifier, query)
+        if entry is not None and is_fresh(entry):
+            return entry.body
+        try:
+            response = await self.get(url, params, conditional_headers(entry))
+        except httpx.HTTPError as e:
+            if entry is None:
+                raise
+            print(f"Serving stale {source} data for {identifier}: {e}")
+            return entry.body
+        if response.status_code == 304:
+            return self.catalog_cache.revalidated(entry, response.headers.get("ETag"),
+                                                  response.headers.get("Last-Modified")).body
+        return self.catalog_cache.put(source, catalog, identifier, response.content, query,
+                                      response.headers.get("ETag"), response.headers.get("Last-Modified"),
+                                      response.headers.get("Content-Type")).body
+
+    async def _cached(self, source, identifier, fetch):
+        """Per-source result from the cache, or fetched and cached; None on failure"""
+        key = (source, identifier)
+        entry = self._cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] < self.cache_ttl:
+            self.cache_hits += 1
+            return entry[1]
+        try:
+            data = await fetch(identifier)
+        except (httpx.HTTPError, ValueError) as e:
+            self.failures += 1
+            print(f"Error fetching {source} data for {identifier}: {e}")
+            return None
+        if self.cache_ttl > 0:
+            self._cache[key] = (time.monotonic(), data)
+        return data
+
+    async def _fetch_vizier(self, source, identifier):
+        catalog, columns = VIZIER_CATALOGS[source]
+        params = {
+            "-source": catalog,
+            "-c": identifier,
+            "-c.rm": self.search_radius_arcmin,
+            "-out": columns,
+            "-out.add": "_r",
+            "-sort": "_r",
+            "-out.max": 1
+        }
+        body = await self.get_body(source, catalog, identifier, self.vizier_url, params)
+        rows = parse_vizier_tsv(body.decode("utf-8", errors="replace"))
+        return VIZIER_PARSERS[source](rows[0]) if rows else None
+
+    async def _fetch_simbad(self, identifier):
+        params = {
+            "Ident": identifier,
+            "output.format": "JSON",
+            "output.params": "all"
+        }
+        body = await self.get_body("SIMBAD", "sim-id", identifier, self.simbad_url, params)
+        data = json.loads(body)
+        result = self._simbad_parser._parse_simbad_data(data)
+        if result is not None and "name" not in data:
+            result["name"] = identifier
+        return result
+
+    async def fetch_gaia_edr3_data(self, identifier):
+        """Nearest Gaia EDR3 source to identifier, or None"""
+        return await self._cached("GAIA EDR3", identifier,
+                                  lambda ident: self._fetch_vizier("GAIA EDR3", ident))
+
+    async def fetch_hipparcos_data(self, identifier):
+        """Nearest Hipparcos entry to identifier, or None"""
+        return await self._cached("Hipparcos", identifier,
+                                  lambda ident: self._fetch_vizier("Hipparcos", ident))
+
+    async def fetch_simbad_data(self, identifier):
+        """SIMBAD entry for identifier, or None"""
+        return await self._cached("SIMBAD", identifier, self._fetch_simbad)
+
+    async def get_best_available_data(self, identifier):
+        """
+        Query all sources concurrently and combine them
+
+        Priority: GAIA EDR3 > Hipparcos > SIMBAD (see combine_sources)
+        """
+        gaia, hipparcos, simbad = await asyncio.gather(
+            self.fetch_gaia_edr3_data(identifier),
+            self.fetch_hipparcos_data(identifier),
+            self.fetch_simbad_data(identifier)
+        )
+        return combine_sources(identifier, {"GAIA EDR3": gaia, "Hipparcos": hipparcos, "SIMBAD": simbad})
+
+    async def fetch_many(self, identifiers, concurrency=DEFAULT_CONCURRENCY, progress=None):
+        """
+        Fetch the best available data for many stars
+
+        Args:
+            identifiers: Iterable of star identifiers
+            concurrency: Stars in flight at once
+            progress: Optional callback(done, total) after each star
+
+        Returns:
+            Dict of identifier -> combined data (None where no source answered),
+            in input order
+        """
+        identifiers = list(dict.fromkeys(identifiers))
+        results = {}
+        limit = asyncio.Semaphore(concurrency)
+        done = 0
+
+        async def fetch_one(identifier):
+            nonlocal done
+            async with limit:
+                results[identifier] = await self.get_best_available_data(identifier)
+            done += 1
+            if progress is not None:
+                progress(done, len(identifiers))
+
+        await asyncio.gather(*(fetch_one(identifier) for identifier in identifiers))
+        return {identifier: results[identifier] for identifier in identifiers}
+
+    def stats(self):
+        """Request counters"""
+        return {
+            "requests": self.requests,
+            "retried": self.retried,
+            "failures": self.failures,
+            "cache_hits": self.cache_hits,
+            "cached_results": len(self._cache)
+        }
+
+
+def fetch_many(identifiers, concurrency=DEFAULT_CONCURRENCY, progress=None, **options):
+    """
+    Synchronous wrapper around AsyncAstronomicalDataFetcher.fetch_many
+
+    Args:
+        identifiers: Iterable of star identifiers
+        concurrency: Stars in flight at once
+        progress: Optional callback(done, total)
+        **options: AsyncAstronomicalDataFetcher arguments
+
+    Returns:
+        Dict of identifier -> combined data (or None)
+    """
+    async def run():
+        async with AsyncAstronomicalDataFetcher(**options) as fetcher:
+            return await fetcher.fetch_many(identifiers, concurrency, progress)
+
+    return asyncio.run(run())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fetch Gaia/Hipparcos/SIMBAD data for many stars concurrently")
+    parser.add_argument("identifiers", nargs="*", help="Star identifiers (e.g. 'HIP 11767', Sirius)")
+    parser.add_argument("--input", help="File with one identifier per line")
+    parser.add_argument("--output", default="fetched_stars.json")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Stars in flight at once")
+    parser.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST_LIMIT, help="Requests in flight per host")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Request timeout in seconds")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES)
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH, help="Catalog cache file")
+    parser.add_argument("--no-cache", action="store_true", help="Always download")
+    parser.add_argument("--simbad-url", default=SIMBAD_BASE_URL)
+    parser.add_argument("--vizier-url", default=VIZIER_ASU_URL)
+    args = parser.parse_args(argv)
+
+    identifiers = list(args.identifiers)
+    if args.input:
+        with open(args.input, encoding="utf-8") as f:
+            identifiers.extend(line.strip() for line in f if line.strip() and not line.startswith("#"))
+    if not identifiers:
+        parser.error("no identifiers given")
+
+    print("=" * 60)
+    print("ASYNC ASTRONOMICAL DATA FETCHER")
+    print("=" * 60)
+    print(f"Stars: {len(identifiers)}  |  Concurrency: {args.concurrency}  |  Per host: {args.per_host}")
+
+    def progress(done, total):
+        if done == total or done % 100 == 0:
+            print(f"  {done}/{total} stars")
+
+    catalog_cache = None if args.no_cache else CatalogCache(args.cache)
+    started = time.perf_counter()
+    results = fetch_many(
+        identifiers, args.concurrency, progress,
+        simbad_url=args.simbad_url, vizier_url=args.vizier_url, timeout=args.timeout,
+        per_host_limit=args.per_host, retries=args.retries, catalog_cache=catalog_cache
+    )
+    elapsed = time.perf_counter() - started
+    if catalog_cache is not None:
+        cache_stats = catalog_cache.stats()
+        print(f"Catalog cache: {cache_stats['hits']} hits, {cache_stats['revalidations']} revalidated, "
+              f"{cache_stats['entries']} entries ({cache_stats['bytes']:,} bytes)")
+        catalog_cache.close()
+
+    found = sum(1 for data in results.values() if data)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"✓ {found}/{len(results)} stars with data saved to {args.output} ({elapsed:.2f} s)")
+    print("=" * 60)
+    return 0 if found else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
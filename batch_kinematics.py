@@ -0,0 +1,148 @@
+"""
+Polaris Batch Kinematics Engine
+Vectorized NumPy evaluation of kinematic extrapolation for many stars and epochs
+
+The scalar functions in polaris.py evaluate one (star, years_ago) pair at a
+time with 50-digit Decimal arithmetic. This module evaluates the same model,
+    d(t) = d₀ + v_r · t,   t = -years_ago
+for a whole list of stars against a whole array of epochs in one pass, using
+NumPy float64 (or longdouble) arrays. An optional check mode recomputes every
+point with the Decimal engine so the batch results stay verifiable.
+"""
+
+import numpy as np
+
+from polaris import (
+    KM_PER_LIGHT_YEAR,
+    SECONDS_PER_YEAR,
+    calculate_distance_high_precision,
+    decimal_context,
+)
+
+# Distance covered in one Julian year at 1 km/s, expressed in light years
+LY_PER_KM_S_YEAR = decimal_context().divide(SECONDS_PER_YEAR, KM_PER_LIGHT_YEAR)
+
+# Default precision bounds (same as calculate_distance_high_precision)
+MIN_PRECISION = 6
+
+
+def star_columns(stars, dtype=np.float64):
+    """
+    Extract the kinematic columns of a sequence of stars as NumPy arrays
+
+    Missing uncertainties are stored as 0.0, which matches the scalar
+    engine: a star without a radial velocity uncertainty only carries its
+    base (parallax) distance uncertainty. A StarCatalog hands over its
+    columns directly, without materializing per-star objects.
+
+    Args:
+        stars: Sequence of Star objects or a StarCatalog
+        dtype: NumPy floating dtype (np.float64 or np.longdouble)
+
+    Returns:
+        Tuple of (distance_ly, radial_velocity_km_s, distance_ly_uncertainty,
+        radial_velocity_uncertainty_km_s) arrays, one element per star
+    """
+    if hasattr(stars, "kinematic_columns"):
+        return stars.kinematic_columns(dtype)
+    stars = list(stars)
+    distance = np.array([star.distance_ly for star in stars], dtype=dtype)
+    rv = np.array([star.radial_velocity_km_s for star in stars], dtype=dtype)
+    distance_unc = np.array([star.distance_ly_uncertainty or 0.0 for star in stars], dtype=dtype)
+    rv_unc = np.array([star.radial_velocity_uncertainty_km_s or 0.0 for star in stars], dtype=dtype)
+    return distance, rv, distance_unc, rv_unc
+
+
+def _ly_per_km_s_year(dtype):
+    """Conversion factor km/s · yr → ly in the requested dtype"""
+    if np.dtype(dtype) == np.dtype(np.longdouble):
+        # Parse from the 50-digit Decimal string so longdouble keeps its extra bits
+        return np.longdouble(str(LY_PER_KM_S_YEAR))
+    return np.dtype(dtype).type(float(LY_PER_KM_S_YEAR))
+
+
+def precision_from_delta(delta_ly, max_precision=18):
+    """
+    Vectorized version of the precision rule in calculate_distance_high_precision
+
+    precision = max(6, min(max_precision, int(-log10|Δd|) + 3)), or 6 when Δd = 0
+
+    Args:
+        delta_ly: Array of distance changes in light years
+        max_precision: Maximum decimal precision
+
+    Returns:
+        Integer array of precisions (same shape as delta_ly)
+    """
+    magnitude = np.abs(np.asarray(delta_ly, dtype=np.float64))
+    nonzero = magnitude > 0
+    log_value = np.zeros_like(magnitude)
+    np.log10(magnitude, out=log_value, where=nonzero)
+    # int() truncates toward zero, so use trunc rather than floor
+    precision = np.trunc(-log_value).astype(np.int64) + 3
+    precision = np.clip(precision, MIN_PRECISION, max(MIN_PRECISION, max_precision))
+    return np.where(nonzero, precision, MIN_PRECISION)
+
+
+def calculate_distances_batch(stars, years_ago, max_precision=18, dtype=np.float64, check_decimal=False):
+    """
+    Calculate distances, precisions and uncertainties for many stars and epochs
+
+    Vectorized equivalent of calling calculate_distance_high_precision and
+    calculate_distance_uncertainty for every (star, epoch) pair:
+
+        d(t) = d₀ + v_r · t,   t = -years_ago
+        σ(t) = sqrt(σ_d0² + (σ_vr · t)²)
+
+    Args:
+        stars: Sequence of Star objects or a StarCatalog
+        years_ago: Scalar or 1-D array of epochs (negative for future, positive for past)
+        max_precision: Maximum decimal precision (default 18)
+        dtype: np.float64 (default) or np.longdouble for extra headroom
+        check_decimal: Recompute every point with the exact Decimal engine and
+            report the largest deviation (slow; meant for validation runs)
+
+    Returns:
+        Dict of arrays shaped (n_stars, n_epochs):
+            "distance_ly", "precision", "uncertainty_ly"
+        With check_decimal=True it also holds "decimal_distance_ly",
+        "max_abs_error_ly" and "precision_mismatches".
+    """
+    if not hasattr(stars, "kinematic_columns"):
+        stars = list(stars)
+    epochs = np.atleast_1d(np.asarray(years_ago, dtype=dtype))
+    if epochs.ndim != 1:
+        raise ValueError("years_ago must be a scalar or a 1-D array")
+
+    distance, rv, distance_unc, rv_unc = star_columns(stars, dtype=dtype)
+    factor = _ly_per_km_s_year(dtype)
+
+    # Δd = v_r · t, converted to light years (t = -years_ago)
+    delta_ly = (rv[:, np.newaxis] * factor) * -epochs[np.newaxis, :]
+    distance_ly = distance[:, np.newaxis] + delta_ly
+    precision = precision_from_delta(delta_ly, max_precision)
+
+    # σ_d = sqrt(σ_d0² + (σ_vr · |t|)²)
+    rv_sigma_ly = (rv_unc[:, np.newaxis] * factor) * np.abs(epochs)[np.newaxis, :]
+    uncertainty_ly = np.hypot(distance_unc[:, np.newaxis], rv_sigma_ly)
+
+    result = {
+        "distance_ly": distance_ly,
+        "precision": precision,
+        "uncertainty_ly": uncertainty_ly,
+    }
+
+    if check_decimal:
+        reference = np.empty(distance_ly.shape, dtype=np.float64)
+        reference_precision = np.empty(precision.shape, dtype=np.int64)
+        for i, star in enumerate(stars):
+            for j, epoch in enumerate(epochs):
+                reference[i, j], reference_precision[i, j] = calculate_distance_high_precision(
+                    star, float(epoch), max_precision
+                )
+        error = np.abs(distance_ly.astype(np.float64) - reference)
+        result["decimal_distance_ly"] = reference
+        result["max_abs_error_ly"] = float(error.max()) if error.size else 0.0
+        result["precision_mismatches"] = int(np.count_nonzero(reference_precision != precision))
+
+    return result
@@ -0,0 +1,389 @@
+"""
+Polaris Bulk Catalog Query
+Batched VizieR TAP queries for many source IDs or cone positions
+
+AstronomicalDataFetcher and the async fetcher ask VizieR about one star
+per request. For bulk refreshes this module sends one TAP (ADQL) request
+per batch instead:
+
+- ID batches: SELECT ... WHERE <id column> IN (...), up to batch_size IDs
+  per request (sent as a POST body, so the URL length does not matter)
+- cone batches: the positions are uploaded as a VOTable table
+  (TAP_UPLOAD.targets) and joined with the catalog through
+  CONTAINS(POINT, CIRCLE), up to upload_size positions per request
+
+Results are requested as CSV and streamed into a StarCatalog by
+catalog_stream in blocks of chunk_size rows, so a refresh of thousands of
+stars costs one round trip and never holds the whole response in memory.
+
+Run:
+    python bulk_query.py --source gaia --ids 131081166581443968 --output-dir gaia_catalog
+    python bulk_query.py --source hipparcos --ids-file hip_ids.txt
+    python bulk_query.py --source hipparcos --cones-file targets.csv --radius 1
+"""
+
+import argparse
+import csv
+import re
+import sys
+import time
+from xml.sax.saxutils import escape
+
+import numpy as np
+import requests
+
+from catalog_stream import DEFAULT_CHUNK_SIZE, response_table, stream_into_catalog
+from star_catalog import StarCatalog
+from timeline_export import export_catalog
+
+# VizieR synchronous TAP endpoint
+TAP_VIZIER_URL = "http://tapvizier.cds.unistra.fr/TAPVizieR/tap/sync"
+
+# Output columns of every bulk query; catalog columns are aliased to these names
+RESULT_COLUMNS = ("source_id", "ra_deg", "dec_deg", "parallax_mas", "parallax_error_mas",
+                  "pmra_mas_yr", "pmdec_mas_yr", "radial_velocity_km_s", "radial_velocity_error_km_s",
+                  "magnitude")
+
+# Source name -> VizieR table, ID column, name prefix and column for each result column
+TAP_CATALOGS = {
+    "GAIA EDR3": {
+        "table": "I/350/gaiaedr3",
+        "id_column": "Source",
+        "prefix": "Gaia EDR3",
+        "columns": {
+            "source_id": "Source",
+            "ra_deg": "RA_ICRS",
+            "dec_deg": "DE_ICRS",
+            "parallax_mas": "Plx",
+            "parallax_error_mas": "e_Plx",
+            "pmra_mas_yr": "pmRA",
+            "pmdec_mas_yr": "pmDE",
+            "radial_velocity_km_s": "RVDR2",
+            "radial_velocity_error_km_s": "e_RVDR2",
+            "magnitude": "Gmag",
+        },
+    },
+    "Hipparcos": {
+        "table": "I/239/hip_main",
+        "id_column": "HIP",
+        "prefix": "HIP",
+        "columns": {
+            "source_id": "HIP",
+            "ra_deg": "RAICRS",
+            "dec_deg": "DEICRS",
+            "parallax_mas": "Plx",
+            "parallax_error_mas": "e_Plx",
+            "pmra_mas_yr": "pmRA",
+            "pmdec_mas_yr": "pmDE",
+            "radial_velocity_km_s": None,
+            "radial_velocity_error_km_s": None,
+            "magnitude": "Vmag",
+        },
+    },
+}
+
+SOURCE_ALIASES = {"gaia": "GAIA EDR3", "hipparcos": "Hipparcos", "hip": "Hipparcos"}
+
+# IDs per ADQL IN (...) list
+DEFAULT_BATCH_SIZE = 5000
+
+# Positions per uploaded targets table
+DEFAULT_UPLOAD_SIZE = 10000
+
+# Cone search radius (arcmin)
+DEFAULT_RADIUS_ARCMIN = 1.0
+
+# Upper bound on rows per request (TAP MAXREC)
+DEFAULT_MAX_RECORDS = 1000000
+
+DEFAULT_TIMEOUT = 120.0
+
+UPLOAD_TABLE = "targets"
+
+
+def resolve_source(source):
+    """Canonical source name ("GAIA EDR3" / "Hipparcos") for a name or alias"""
+    if source in TAP_CATALOGS:
+        return source
+    resolved = SOURCE_ALIASES.get(str(source).lower())
+    if resolved is None:
+        raise ValueError(f"Unknown bulk query source: {source!r} (expected one of {', '.join(TAP_CATALOGS)})")
+    return resolved
+
+
+def parse_source_id(identifier):
+    """
+    Numeric catalog ID of an identifier
+
+    Accepts ints and strings such as "11767", "HIP 11767" or
+    "Gaia DR3 131081166581443968" (the trailing number is used).
+
+    Raises:
+        ValueError: No trailing number
+    """
+    if isinstance(identifier, (int, np.integer)):
+        return int(identifier)
+    match = re.search(r"(\d+)\s*$", str(identifier))
+    if match is None:
+        raise ValueError(f"Not a numeric catalog identifier: {identifier!r}")
+    return int(match.group(1))
+
+
+def _select_list(source, alias=None):
+    """ADQL select list mapping catalog columns to RESULT_COLUMNS"""
+    prefix = f"{alias}." if alias else ""
+    items = []
+    for name, column in TAP_CATALOGS[source]["columns"].items():
+        items.append(f'{prefix}"{column}" AS {name}' if column else f"NULL AS {name}")
+    return ", ".join(items)
+
+
+def build_id_query(source, source_ids):
+    """
+    ADQL query selecting a batch of catalog IDs
+
+    Args:
+        source: "GAIA EDR3" or "Hipparcos"
+        source_ids: Iterable of ints (see parse_source_id)
+
+    Returns:
+        ADQL string
+    """
+    spec = TAP_CATALOGS[source]
+    id_list = ", ".join(str(int(source_id)) for source_id in source_ids)
+    return f'SELECT {_select_list(source)} FROM "{spec["table"]}" WHERE "{spec["id_column"]}" IN ({id_list})'
+
+
+def build_cone_query(source, radius_arcmin=DEFAULT_RADIUS_ARCMIN):
+    """
+    ADQL query joining the uploaded targets table with the catalog
+
+    Every catalog row within radius_arcmin of a target is returned, with
+    the target label and the separation (arcmin), nearest first per target.
+    """
+    spec = TAP_CATALOGS[source]
+    columns = spec["columns"]
+    star = f"POINT('ICRS', c.\"{columns['ra_deg']}\", c.\"{columns['dec_deg']}\")"
+    target = "POINT('ICRS', t.ra, t.dec)"
+    radius_deg = float(radius_arcmin) / 60.0
+    return (
+        f"SELECT t.target AS target, DISTANCE({star}, {target}) * 60 AS separation_arcmin, "
+        f"{_select_list(source, 'c')} "
+        f'FROM "{spec["table"]}" AS c JOIN TAP_UPLOAD.{UPLOAD_TABLE} AS t '
+        f"ON 1 = CONTAINS({star}, CIRCLE('ICRS', t.ra, t.dec, {radius_deg!r})) "
+        f"ORDER BY target, separation_arcmin"
+    )
+
+
+def targets_votable(positions):
+    """
+    VOTable document for the TAP upload of cone positions
+
+    Args:
+        positions: Iterable of (label, ra_degrees, dec_degrees)
+
+    Returns:
+        VOTable as bytes
+    """
+    rows = "".join(
+        f"<TR><TD>{escape(str(label))}</TD><TD>{float(ra)!r}</TD><TD>{float(dec)!r}</TD></TR>"
+        for label, ra, dec in positions
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<VOTABLE version="1.3" xmlns="http://www.ivoa.net/xml/VOTable/v1.3">'
+        f'<RESOURCE><TABLE name="{UPLOAD_TABLE}">'
+        '<FIELD name="target" datatype="char" arraysize="*"/>'
+        '<FIELD name="ra" datatype="double" unit="deg" ucd="pos.eq.ra"/>'
+        '<FIELD name="dec" datatype="double" unit="deg" ucd="pos.eq.dec"/>'
+        f"<DATA><TABLEDATA>{rows}</TABLEDATA></DATA>"
+        "</TABLE></RESOURCE></VOTABLE>"
+    ).encode("utf-8")
+
+
+def star_positions(stars):
+    """(name, ra_degrees, dec_degrees) of every star with coordinates"""
+    return [(star.name, star.ra_hours * 15.0, star.dec_degrees) for star in stars
+            if star.ra_hours is not None and star.dec_degrees is not None]
+
+
+class BulkCatalogQuery:
+    """
+    Batched VizieR TAP client streaming results into a StarCatalog
+
+    Args:
+        tap_url: Synchronous TAP endpoint
+        batch_size: IDs per request
+        upload_size: Cone positions per request
+        chunk_size: Rows appended to the catalog at once
+        max_records: TAP MAXREC of every request
+        timeout: Request timeout in seconds
+        session: Optional requests.Session
+    """
+
+    def __init__(self, tap_url=TAP_VIZIER_URL, batch_size=DEFAULT_BATCH_SIZE, upload_size=DEFAULT_UPLOAD_SIZE,
+                 chunk_size=DEFAULT_CHUNK_SIZE, max_records=DEFAULT_MAX_RECORDS, timeout=DEFAULT_TIMEOUT,
+                 session=None):
+        self.tap_url = tap_url
+        self.batch_size = batch_size
+        self.upload_size = upload_size
+        self.chunk_size = chunk_size
+        self.max_records = max_records
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        self.requests = 0
+        self.rows = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the HTTP session"""
+        self.session.close()
+
+    def _post(self, query, files=None, upload=None):
+        """Send one ADQL query and return the streaming response"""
+        data = {
+            "REQUEST": "doQuery",
+            "LANG": "ADQL",
+            "FORMAT": "csv",
+            "MAXREC": self.max_records,
+            "QUERY": query,
+        }
+        if upload:
+            data["UPLOAD"] = upload
+        self.requests += 1
+        response = self.session.post(self.tap_url, data=data, files=files, timeout=self.timeout, stream=True)
+        response.raise_for_status()
+        return response
+
+    def _stream(self, source, response, catalog, targets=None):
+        passthrough = {"target": targets} if targets is not None else None
+        with response:
+            result = stream_into_catalog(response_table(response), catalog, self.chunk_size,
+                                         TAP_CATALOGS[source]["prefix"], passthrough)
+        self.rows += result["appended"]
+        return result["appended"]
+
+    def query_ids(self, source, identifiers, catalog=None):
+        """
+        Fetch many catalog entries by ID, one request per batch_size IDs
+
+        Args:
+            source: "GAIA EDR3" / "Hipparcos" (or "gaia" / "hipparcos")
+            identifiers: Iterable of IDs (see parse_source_id)
+            catalog: StarCatalog to append to (a new one by default)
+
+        Returns:
+            StarCatalog with one row per found entry
+
+        Raises:
+            ValueError: Unknown source or non-numeric identifier
+            requests.RequestException: Network or HTTP error
+        """
+        source = resolve_source(source)
+        source_ids = list(dict.fromkeys(parse_source_id(identifier) for identifier in identifiers))
+        catalog = StarCatalog() if catalog is None else catalog
+        for start in range(0, len(source_ids), self.batch_size):
+            query = build_id_query(source, source_ids[start:start + self.batch_size])
+            self._stream(source, self._post(query), catalog)
+        return catalog
+
+    def query_cones(self, source, positions, radius_arcmin=DEFAULT_RADIUS_ARCMIN, catalog=None):
+        """
+        Cone search around many positions, one request per upload_size positions
+
+        Args:
+            source: "GAIA EDR3" / "Hipparcos" (or "gaia" / "hipparcos")
+            positions: Iterable of (label, ra_degrees, dec_degrees); see star_positions
+            radius_arcmin: Cone radius
+            catalog: StarCatalog to append to (a new one by default)
+
+        Returns:
+            Tuple (catalog, targets): targets[i] is the label of the position
+            whose cone matched the i-th appended row (nearest matches first)
+
+        Raises:
+            ValueError: Unknown source
+            requests.RequestException: Network or HTTP error
+        """
+        source = resolve_source(source)
+        positions = list(positions)
+        catalog = StarCatalog() if catalog is None else catalog
+        targets = []
+        query = build_cone_query(source, radius_arcmin)
+        for start in range(0, len(positions), self.upload_size):
+            votable = targets_votable(positions[start:start + self.upload_size])
+            files = {UPLOAD_TABLE: (f"{UPLOAD_TABLE}.xml", votable, "application/x-votable+xml")}
+            response = self._post(query, files=files, upload=f"{UPLOAD_TABLE},param:{UPLOAD_TABLE}")
+            self._stream(source, response, catalog, targets)
+        return catalog, targets
+
+    def stats(self):
+        """Request and row counters"""
+        return {"requests": self.requests, "rows": self.rows}
+
+
+def _read_cones(path):
+    """(label, ra_degrees, dec_degrees) rows of a CSV file (optional header)"""
+    positions = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.reader(f):
+            if len(row) < 3 or row[0].startswith("#"):
+                continue
+            try:
+                positions.append((row[0].strip(), float(row[1]), float(row[2])))
+            except ValueError:
+                continue  # Header line
+    return positions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk Gaia EDR3 / Hipparcos queries through VizieR TAP")
+    parser.add_argument("--source", default="gaia", help="gaia or hipparcos")
+    parser.add_argument("--ids", nargs="*", default=[], help="Catalog IDs (e.g. 11767, 'HIP 11767')")
+    parser.add_argument("--ids-file", help="File with one catalog ID per line")
+    parser.add_argument("--cones-file", help="CSV of label,ra_degrees,dec_degrees")
+    parser.add_argument("--radius", type=float, default=DEFAULT_RADIUS_ARCMIN, help="Cone radius (arcmin)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="IDs per request")
+    parser.add_argument("--upload-size", type=int, default=DEFAULT_UPLOAD_SIZE, help="Positions per request")
+    parser.add_argument("--tap-url", default=TAP_VIZIER_URL)
+    parser.add_argument("--output-dir", default="bulk_catalog", help="Catalog export directory (timeline_export)")
+    args = parser.parse_args(argv)
+
+    try:
+        source = resolve_source(args.source)
+    except ValueError as e:
+        parser.error(str(e))
+    identifiers = list(args.ids)
+    if args.ids_file:
+        with open(args.ids_file, encoding="utf-8") as f:
+            identifiers.extend(line.strip() for line in f if line.strip() and not line.startswith("#"))
+    if not identifiers and not args.cones_file:
+        parser.error("no --ids, --ids-file or --cones-file given")
+
+    print("=" * 60)
+    print(f"BULK {source.upper()} QUERY (VizieR TAP)")
+    print("=" * 60)
+
+    started = time.perf_counter()
+    with BulkCatalogQuery(args.tap_url, batch_size=args.batch_size, upload_size=args.upload_size) as client:
+        catalog = StarCatalog()
+        if identifiers:
+            client.query_ids(source, identifiers, catalog)
+        if args.cones_file:
+            client.query_cones(source, _read_cones(args.cones_file), args.radius, catalog)
+        stats = client.stats()
+    elapsed = time.perf_counter() - started
+
+    export_catalog(catalog, args.output_dir, provenance=f"{source} via VizieR TAP")
+    print(f"✓ {len(catalog)} stars in {stats['requests']} requests ({elapsed:.2f} s) saved to {args.output_dir}")
+    print("=" * 60)
+    return 0 if len(catalog) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
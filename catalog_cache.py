@@ -0,0 +1,385 @@
+"""
+Polaris Catalog Cache
+Persistent on-disk cache of remote catalog responses (SQLite)
+
+Responses from SIMBAD and VizieR are stored under (source, catalog,
+identifier). Bodies are content-addressed: each distinct body is stored
+once under its SHA-256 digest, so records that did not change between
+refreshes share storage. Every entry has:
+
+- a time-to-live; fresh entries are served without touching the network
+- the server's ETag / Last-Modified; expired entries are revalidated with
+  If-None-Match / If-Modified-Since and a 304 only extends the expiry
+- an access time; once the stored bodies exceed the byte budget, least
+  recently used entries are evicted
+
+If a refresh fails and an expired entry exists, the stale body is served.
+The cache file defaults to .cache/catalog_cache.sqlite3 (CATALOG_CACHE_PATH
+overrides it), so CI jobs can persist it between runs.
+
+Run:
+    python catalog_cache.py --stats
+    python catalog_cache.py --purge-expired --max-mb 32
+"""
+
+import argparse
+from collections import namedtuple
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+import requests
+
+DEFAULT_CACHE_PATH = os.environ.get("CATALOG_CACHE_PATH", os.path.join(".cache", "catalog_cache.sqlite3"))
+
+# Stored body bytes before least recently used entries are evicted
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Catalog records change rarely; revalidation after a week is cheap (304)
+DEFAULT_TTL = 7 * 24 * 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    digest TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    source TEXT NOT NULL,
+    catalog TEXT NOT NULL,
+    identifier TEXT NOT NULL,
+    query TEXT NOT NULL,
+    digest TEXT NOT NULL REFERENCES blobs (digest),
+    etag TEXT,
+    last_modified TEXT,
+    content_type TEXT,
+    fetched_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (source, catalog, identifier)
+);
+CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+CREATE INDEX IF NOT EXISTS entries_digest ON entries (digest);
+CREATE INDEX IF NOT EXISTS blobs_size ON blobs (size);
+"""
+
+CacheEntry = namedtuple("CacheEntry", [
+    "source", "catalog", "identifier", "body", "digest", "etag", "last_modified",
+    "content_type", "fetched_at", "expires_at"
+])
+
+
+def request_fingerprint(url, params=None):
+    """
+    Digest of a request (URL and sorted parameters)
+
+    Entries fetched with a different query (other columns, radius, ...)
+    are treated as misses.
+    """
+    params = sorted((str(key), str(value)) for key, value in (params or {}).items())
+    return hashlib.sha256(json.dumps([url, params]).encode("utf-8")).hexdigest()
+
+
+def is_fresh(entry, now=None):
+    """Whether an entry can be served without revalidation"""
+    return entry.expires_at > (time.time() if now is None else now)
+
+
+def conditional_headers(entry):
+    """If-None-Match / If-Modified-Since headers revalidating an entry"""
+    headers = {}
+    if entry is not None:
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+    return headers
+
+
+class CatalogCache:
+    """
+    Thread-safe SQLite cache of catalog responses
+
+    Args:
+        path: SQLite file (parent directories are created)
+        max_bytes: Evict least recently used entries beyond this many body bytes
+        default_ttl: Seconds an entry stays fresh unless put() is given a ttl
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES, default_ttl=DEFAULT_TTL):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA foreign_keys=ON")
+        self._db.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            self._db.close()
+
+    def get(self, source, catalog, identifier, query=""):
+        """
+        Look up an entry, fresh or expired
+
+        Args:
+            source, catalog, identifier: Entry key
+            query: Request fingerprint the entry must match
+
+        Returns:
+            CacheEntry, or None if missing or fetched with another query
+        """
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT e.digest, e.etag, e.last_modified, e.content_type, e.fetched_at, e.expires_at, "
+                "b.body, e.query FROM entries e JOIN blobs b ON b.digest = e.digest "
+                "WHERE e.source = ? AND e.catalog = ? AND e.identifier = ?",
+                (source, catalog, identifier)
+            ).fetchone()
+            if row is None or row[7] != query:
+                self.misses += 1
+                return None
+            self._db.execute(
+                "UPDATE entries SET accessed_at = ? WHERE source = ? AND catalog = ? AND identifier = ?",
+                (time.time(), source, catalog, identifier)
+            )
+            self.hits += 1
+        digest, etag, last_modified, content_type, fetched_at, expires_at, body, _ = row
+        return CacheEntry(source, catalog, identifier, bytes(body), digest, etag, last_modified,
+                          content_type, fetched_at, expires_at)
+
+    def put(self, source, catalog, identifier, body, query="", etag=None, last_modified=None,
+            content_type=None, ttl=None):
+        """
+        Store a response body, then evict to fit the byte budget
+
+        The entry being written is never evicted, so a body larger than
+        max_bytes on its own is kept (alone) until the next put().
+
+        Args:
+            source, catalog, identifier: Entry key
+            body: Response body (bytes or str)
+            query: Request fingerprint (see request_fingerprint)
+            etag, last_modified: Validators from the response headers
+            content_type: Response content type
+            ttl: Seconds the entry stays fresh (default: default_ttl)
+
+        Returns:
+            The stored CacheEntry
+        """
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()
+        now = time.time()
+        expires_at = now + (self.default_ttl if ttl is None else ttl)
+        with self._lock, self._db:
+            previous = self._db.execute(
+                "SELECT digest FROM entries WHERE source = ? AND catalog = ? AND identifier = ?",
+                (source, catalog, identifier)
+            ).fetchone()
+            self._db.execute("INSERT OR IGNORE INTO blobs (digest, body, size) VALUES (?, ?, ?)",
+                             (digest, body, len(body)))
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (source, catalog, identifier, query, digest, etag, "
+                "last_modified, content_type, fetched_at, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (source, catalog, identifier, query, digest, etag, last_modified, content_type,
+                 now, expires_at, now)
+            )
+            if previous is not None and previous[0] != digest:
+                self._db.execute(
+                    "DELETE FROM blobs WHERE digest = ? AND NOT EXISTS "
+                    "(SELECT 1 FROM entries WHERE digest = ?)", (previous[0], previous[0])
+                )
+            self._evict(self.max_bytes, keep=(source, catalog, identifier))
+        return CacheEntry(source, catalog, identifier, body, digest, etag, last_modified,
+                          content_type, now, expires_at)
+
+    def revalidated(self, entry, etag=None, last_modified=None, ttl=None):
+        """
+        Mark an entry as confirmed unchanged (HTTP 304) and extend its expiry
+
+        Args:
+            entry: CacheEntry that was revalidated
+            etag, last_modified: Updated validators, if the server sent any
+            ttl: Seconds the entry stays fresh (default: default_ttl)
+
+        Returns:
+            The updated CacheEntry
+        """
+        now = time.time()
+        expires_at = now + (self.default_ttl if ttl is None else ttl)
+        etag = etag or entry.etag
+        last_modified = last_modified or entry.last_modified
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE entries SET etag = ?, last_modified = ?, expires_at = ?, accessed_at = ? "
+                "WHERE source = ? AND catalog = ? AND identifier = ?",
+                (etag, last_modified, expires_at, now, entry.source, entry.catalog, entry.identifier)
+            )
+            self.revalidations += 1
+        return entry._replace(etag=etag, last_modified=last_modified, expires_at=expires_at)
+
+    def delete(self, source, catalog, identifier):
+        """Remove one entry"""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM entries WHERE source = ? AND catalog = ? AND identifier = ?",
+                             (source, catalog, identifier))
+            self._remove_orphans()
+
+    def purge_expired(self, now=None):
+        """Remove expired entries; returns the number removed"""
+        now = time.time() if now is None else now
+        with self._lock, self._db:
+            removed = self._db.execute("DELETE FROM entries WHERE expires_at <= ?", (now,)).rowcount
+            self._remove_orphans()
+        return removed
+
+    def evict(self, max_bytes=None):
+        """Evict least recently used entries until bodies fit max_bytes; returns the number removed"""
+        with self._lock, self._db:
+            return self._evict(self.max_bytes if max_bytes is None else max_bytes)
+
+    def _evict(self, max_bytes, keep=None):
+        """Delete entries in accessed_at order, except keep, until the stored bodies fit max_bytes"""
+        total = self._total_bytes()
+        if total <= max_bytes:
+            return 0
+        removed = 0
+        candidates = self._db.execute(
+            "SELECT source, catalog, identifier, digest FROM entries ORDER BY accessed_at"
+        ).fetchall()
+        for source, catalog, identifier, digest in candidates:
+            if total <= max_bytes:
+                break
+            if (source, catalog, identifier) == keep:
+                continue
+            self._db.execute("DELETE FROM entries WHERE source = ? AND catalog = ? AND identifier = ?",
+                             (source, catalog, identifier))
+            removed += 1
+            # Bodies are shared: only the last entry using one frees its bytes
+            size = self._db.execute(
+                "SELECT size FROM blobs WHERE digest = ? AND NOT EXISTS "
+                "(SELECT 1 FROM entries WHERE digest = ?)", (digest, digest)
+            ).fetchone()
+            if size is not None:
+                self._db.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+                total -= size[0]
+        self.evictions += removed
+        return removed
+
+    def _total_bytes(self):
+        return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+
+    def _remove_orphans(self):
+        self._db.execute("DELETE FROM blobs WHERE NOT EXISTS (SELECT 1 FROM entries WHERE entries.digest = blobs.digest)")
+
+    def clear(self):
+        """Drop all entries and bodies"""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM entries")
+            self._db.execute("DELETE FROM blobs")
+
+    def stats(self):
+        """Cache counters and sizes"""
+        now = time.time()
+        with self._lock:
+            entries, fresh = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(expires_at > ?), 0) FROM entries", (now,)
+            ).fetchone()
+            blobs = self._db.execute("SELECT COUNT(*) FROM blobs").fetchone()[0]
+            return {
+                "path": self.path,
+                "entries": entries,
+                "fresh_entries": fresh,
+                "bodies": blobs,
+                "bytes": self._total_bytes(),
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidations": self.revalidations,
+                "evictions": self.evictions
+            }
+
+
+def cached_get(session, cache, source, catalog, identifier, url, params=None, timeout=10, ttl=None):
+    """
+    GET through the cache with conditional revalidation (requests.Session)
+
+    Args:
+        session: requests.Session
+        cache: CatalogCache
+        source, catalog, identifier: Entry key
+        url, params: Request
+        timeout: Request timeout in seconds
+        ttl: Freshness of a newly stored or revalidated entry
+
+    Returns:
+        Response body as bytes
+
+    Raises:
+        requests.RequestException: Network or HTTP error with no cached body to fall back on
+    """
+    query = request_fingerprint(url, params)
+    entry = cache.get(source, catalog, identifier, query)
+    if entry is not None and is_fresh(entry):
+        return entry.body
+    try:
+        response = session.get(url, params=params, headers=conditional_headers(entry), timeout=timeout)
+        if response.status_code == 304 and entry is not None:
+            return cache.revalidated(entry, response.headers.get("ETag"),
+                                     response.headers.get("Last-Modified"), ttl).body
+        response.raise_for_status()
+    except requests.RequestException as e:
+        if entry is None:
+            raise
+        print(f"Serving stale {source} data for {identifier}: {e}")
+        return entry.body
+    return cache.put(source, catalog, identifier, response.content, query,
+                     response.headers.get("ETag"), response.headers.get("Last-Modified"),
+                     response.headers.get("Content-Type"), ttl).body
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect and maintain the catalog response cache")
+    parser.add_argument("--path", default=DEFAULT_CACHE_PATH, help="SQLite cache file")
+    parser.add_argument("--stats", action="store_true", help="Print cache statistics")
+    parser.add_argument("--purge-expired", action="store_true", help="Remove expired entries")
+    parser.add_argument("--max-mb", type=float, default=None, help="Evict down to this many megabytes")
+    parser.add_argument("--clear", action="store_true", help="Remove every entry")
+    args = parser.parse_args(argv)
+
+    with CatalogCache(args.path) as cache:
+        if args.clear:
+            cache.clear()
+            print("✓ Cache cleared")
+        if args.purge_expired:
+            print(f"✓ {cache.purge_expired()} expired entries removed")
+        if args.max_mb is not None:
+            print(f"✓ {cache.evict(int(args.max_mb * 1024 * 1024))} entries evicted")
+        if args.stats or not (args.clear or args.purge_expired or args.max_mb is not None):
+            print(json.dumps(cache.stats(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,399 @@
+"""
+Polaris Streaming Catalog Reader
+Incremental VOTable / CSV parsing straight into the columnar star store
+
+_parse_simbad_data works on a fully loaded JSON document. Large catalog
+pulls (VizieR, TAP, local dumps) are read here one row at a time instead:
+
+- CSV / TSV: csv.reader over lines (VizieR asu-tsv comment, units and
+  dashes lines are skipped)
+- VOTable (TABLEDATA): ElementTree.iterparse, each <TR> is dropped from
+  the tree as soon as it has been read
+
+Rows are collected into blocks of chunk_size, converted with NumPy
+(parallax → distance as in parallax_to_distance_light_years, parsec →
+light years via PARSEC_LY, RA degrees → hours), validated and appended to
+a StarCatalog with append_columns. Memory use is bounded by one block,
+whatever the size of the input.
+
+Run:
+    python catalog_stream.py gaia_dump.vot.gz --output-dir gaia_catalog
+    python catalog_stream.py hip_main.tsv --name-prefix HIP --check
+"""
+
+import argparse
+import csv
+import gzip
+from itertools import islice
+import sys
+import xml.etree.ElementTree as ElementTree
+
+import numpy as np
+
+from polaris import PARSEC_LY, parallax_to_distance_light_years
+from star_catalog import StarCatalog
+from timeline_export import export_catalog
+
+PARSEC_LY_FLOAT = float(PARSEC_LY)
+
+# Rows converted and appended at once
+DEFAULT_CHUNK_SIZE = 4096
+
+# Input column name (case-insensitive) -> quantity
+COLUMN_ALIASES = {
+    "name": "name", "main_id": "name", "star_name": "name",
+    "catalog_id": "catalog_id",
+    "source_id": "source_id", "source": "source_id", "hip": "source_id",
+    "ra": "ra_deg", "ra_deg": "ra_deg", "ra_icrs": "ra_deg", "raicrs": "ra_deg", "raj2000": "ra_deg",
+    "_raj2000": "ra_deg",
+    "ra_hours": "ra_hours",
+    "dec": "dec_deg", "dec_deg": "dec_deg", "dec_degrees": "dec_deg", "de_icrs": "dec_deg",
+    "deicrs": "dec_deg", "dej2000": "dec_deg", "_dej2000": "dec_deg",
+    "plx": "parallax_mas", "parallax": "parallax_mas", "parallax_mas": "parallax_mas", "plx_value": "parallax_mas",
+    "e_plx": "parallax_error_mas", "parallax_error": "parallax_error_mas",
+    "parallax_error_mas": "parallax_error_mas", "plx_err": "parallax_error_mas",
+    "dist": "distance_pc", "distance_pc": "distance_pc", "distance_parsec": "distance_pc",
+    "e_dist": "distance_error_pc", "distance_error_pc": "distance_error_pc",
+    "distance_ly": "distance_ly",
+    "distance_ly_uncertainty": "distance_error_ly", "distance_uncertainty_ly": "distance_error_ly",
+    "rv": "radial_velocity_km_s", "rvdr2": "radial_velocity_km_s", "hrv": "radial_velocity_km_s",
+    "radial_velocity": "radial_velocity_km_s", "radial_velocity_km_s": "radial_velocity_km_s",
+    "rvz_radvel": "radial_velocity_km_s",
+    "e_rv": "radial_velocity_error_km_s", "e_rvdr2": "radial_velocity_error_km_s", "e_hrv": "radial_velocity_error_km_s",
+    "radial_velocity_error": "radial_velocity_error_km_s", "radial_velocity_error_km_s": "radial_velocity_error_km_s",
+    "radial_velocity_uncertainty_km_s": "radial_velocity_error_km_s", "rvz_err": "radial_velocity_error_km_s",
+    "pmra": "pmra_mas_yr", "pmra_mas_yr": "pmra_mas_yr", "proper_motion_ra_mas_yr": "pmra_mas_yr",
+    "pmde": "pmdec_mas_yr", "pmdec": "pmdec_mas_yr", "pmdec_mas_yr": "pmdec_mas_yr",
+    "proper_motion_dec_mas_yr": "pmdec_mas_yr",
+    "magnitude": "magnitude", "gmag": "magnitude", "vmag": "magnitude", "phot_g_mean_mag": "magnitude",
+    "sptype": "spectral_type", "sp_type": "spectral_type", "spectral_type": "spectral_type",
+}
+
+# VOTable unit -> factor to the quantity's unit (mas, pc, ly, deg)
+UNIT_SCALES = {
+    "parallax_mas": {"mas": 1.0, "arcsec": 1000.0, "arcs": 1000.0},
+    "parallax_error_mas": {"mas": 1.0, "arcsec": 1000.0, "arcs": 1000.0},
+    "distance_pc": {"pc": 1.0, "kpc": 1000.0},
+    "distance_error_pc": {"pc": 1.0, "kpc": 1000.0},
+    "ra_deg": {"deg": 1.0, "h": 15.0},
+}
+
+# Unit strings that mark a leading CSV row as units even without a dashes line
+KNOWN_UNITS = {
+    "deg", "h", "h:m:s", "d:m:s", "arcmin", "arcsec", "arcs", "mas", "mas/yr", "arcsec/yr",
+    "km/s", "m/s", "pc", "kpc", "ly", "au", "mag", "yr",
+}
+
+
+class CatalogTable:
+    """
+    Header and lazily read rows of a catalog table
+
+    Attributes:
+        fields: Column names
+        units: Column units ('' where unknown)
+        rows: Iterator of rows (lists of strings)
+    """
+
+    def __init__(self, fields, units, rows):
+        self.fields = fields
+        self.units = units
+        self.rows = rows
+
+
+def _is_separator(row):
+    """VizieR dashes line (or an all-blank row)"""
+    return row is not None and all(not field.strip() or set(field.strip()) == {"-"} for field in row)
+
+
+def _is_units(row):
+    fields = [field.strip().strip('"').lower() for field in row if field.strip()]
+    return bool(fields) and all(field in KNOWN_UNITS for field in fields)
+
+
+def read_csv(lines, delimiter=","):
+    """
+    Read CSV/TSV lines incrementally
+
+    Comment lines (#) and VizieR dashes lines before the first data row are
+    skipped. The row after the header is taken as units only if a dashes
+    line follows it (asu-tsv) or all of its fields are known unit strings;
+    otherwise it is an ordinary data row.
+
+    Args:
+        lines: Iterable of text lines (a file, response.iter_lines(), ...)
+        delimiter: "," or "\\t"
+
+    Returns:
+        CatalogTable (empty if there is no header)
+    """
+    reader = csv.reader((line for line in lines if line.strip() and not line.startswith("#")),
+                        delimiter=delimiter)
+    header = next(reader, None)
+    if header is None:
+        return CatalogTable([], [], iter(()))
+    header = [name.strip() for name in header]
+    units = [""] * len(header)
+
+    def rows():
+        row, following = next(reader, None), next(reader, None)
+        if row is not None and not _is_separator(row) and (_is_separator(following) or _is_units(row)):
+            units[:len(row)] = [field.strip() for field in row[:len(units)]]
+            row, following = following, next(reader, None)
+        while _is_separator(row):
+            row, following = following, next(reader, None)
+        for leading in (row, following):
+            if leading is not None:
+                yield leading
+        yield from reader
+
+    return CatalogTable(header, units, rows())
+
+
+def _local_name(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def read_votable(stream):
+    """
+    Read the first TABLE of a VOTable incrementally (TABLEDATA serialization)
+
+    Args:
+        stream: Binary file-like object (file, gzip file, response.raw)
+
+    Returns:
+        CatalogTable
+
+    Raises:
+        ValueError: The table uses BINARY/FITS serialization or has no DATA
+    """
+    events = ElementTree.iterparse(stream, events=("start", "end"))
+    fields, units = [], []
+    tabledata = None
+    for event, element in events:
+        tag = _local_name(element.tag)
+        if event == "end" and tag == "FIELD":
+            fields.append(element.get("name") or element.get("ID") or f"col{len(fields)}")
+            units.append(element.get("unit") or "")
+        elif event == "start" and tag == "TABLEDATA":
+            tabledata = element
+            break
+        elif event == "start" and tag in ("BINARY", "BINARY2", "FITS"):
+            raise ValueError(f"VOTable {tag} serialization is not supported (request TABLEDATA)")
+    if tabledata is None:
+        raise ValueError("VOTable has no TABLEDATA")
+
+    def rows():
+        for event, element in events:
+            tag = _local_name(element.tag)
+            if event == "end" and tag == "TR":
+                yield [(cell.text or "").strip() for cell in element]
+                # Drop the row so the tree never grows beyond one row
+                tabledata.clear()
+            elif event == "end" and tag == "TABLEDATA":
+                return
+
+    return CatalogTable(fields, units, rows())
+
+
+def _float_column(rows, index):
+    """Column of rows as float64 (NaN for blanks and non-numbers)"""
+    values = np.full(len(rows), np.nan)
+    if index is None:
+        return values
+    for i, row in enumerate(rows):
+        try:
+            values[i] = float(row[index])
+        except (IndexError, ValueError):
+            pass
+    return values
+
+
+def _string_column(rows, index):
+    if index is None:
+        return [None] * len(rows)
+    return [(row[index].strip() or None) if index < len(row) else None for row in rows]
+
+
+def column_map(fields):
+    """Quantity -> column index for the recognized fields (first match wins)"""
+    mapping = {}
+    for index, name in enumerate(fields):
+        quantity = COLUMN_ALIASES.get(name.strip().lower())
+        if quantity is not None and quantity not in mapping:
+            mapping[quantity] = index
+    return mapping
+
+
+def convert_chunk(table, mapping, rows, name_prefix=None):
+    """
+    Validate and convert a block of rows to StarCatalog columns (vectorized)
+
+    Distance comes from a positive parallax (d = 1000 / p(mas) · PARSEC_LY),
+    else from a distance in light years, else from a distance in parsecs.
+    Rows without a usable distance or with RA/Dec out of range are rejected.
+
+    Args:
+        table: CatalogTable the rows come from (for units)
+        mapping: Result of column_map(table.fields)
+        rows: List of rows
+        name_prefix: Prefix for names built from source_id (e.g. "HIP")
+
+    Returns:
+        Tuple (columns, kept, parallax_mas): StarCatalog.append_columns
+        keyword arguments, indices of the kept rows, and the parallax of the
+        kept rows (NaN where the distance did not come from parallax)
+    """
+    def floats(quantity):
+        index = mapping.get(quantity)
+        values = _float_column(rows, index)
+        if index is not None and quantity in UNIT_SCALES:
+            unit = table.units[index].strip().lower() if index < len(table.units) else ""
+            values *= UNIT_SCALES[quantity].get(unit, 1.0)
+        return values
+
+    parallax = floats("parallax_mas")
+    parallax_error = floats("parallax_error_mas")
+    from_parallax = parallax > 0
+    safe_parallax = np.where(from_parallax, parallax, np.nan)
+
+    distance_pc_ly = floats("distance_pc") * PARSEC_LY_FLOAT
+    distance_ly = np.where(from_parallax, 1000.0 / safe_parallax * PARSEC_LY_FLOAT,
+                           np.where(np.isnan(floats("distance_ly")), distance_pc_ly, floats("distance_ly")))
+    error_ly = floats("distance_error_ly")
+    error_ly = np.where(np.isnan(error_ly), floats("distance_error_pc") * PARSEC_LY_FLOAT, error_ly)
+    # First-order propagation: sigma_d = d · sigma_p / p
+    distance_error = np.where(from_parallax, distance_ly * np.abs(parallax_error) / safe_parallax, error_ly)
+
+    ra_hours = floats("ra_hours")
+    ra_hours = np.where(np.isnan(ra_hours), floats("ra_deg") / 15.0, ra_hours)
+    dec = floats("dec_deg")
+
+    valid = np.isfinite(distance_ly) & (distance_ly > 0)
+    valid &= np.isnan(ra_hours) | ((ra_hours >= 0) & (ra_hours < 24))
+    valid &= np.isnan(dec) | (np.abs(dec) <= 90)
+    kept = np.flatnonzero(valid)
+
+    names = _string_column(rows, mapping.get("name"))
+    catalog_ids = _string_column(rows, mapping.get("catalog_id"))
+    source_ids = _string_column(rows, mapping.get("source_id"))
+    spectral_types = _string_column(rows, mapping.get("spectral_type"))
+    for i in kept:
+        if source_ids[i] is not None and name_prefix:
+            source_ids[i] = f"{name_prefix} {source_ids[i]}"
+        catalog_ids[i] = catalog_ids[i] or source_ids[i]
+        names[i] = names[i] or catalog_ids[i]
+
+    columns = {
+        "name": [names[i] for i in kept],
+        "catalog_id": [catalog_ids[i] for i in kept],
+        "spectral_type": [spectral_types[i] for i in kept],
+        "distance_ly": distance_ly[kept],
+        "distance_ly_uncertainty": distance_error[kept],
+        "radial_velocity_km_s": floats("radial_velocity_km_s")[kept],
+        "radial_velocity_uncertainty_km_s": floats("radial_velocity_error_km_s")[kept],
+        "ra_hours": ra_hours[kept],
+        "dec_degrees": dec[kept],
+        "proper_motion_ra_mas_yr": floats("pmra_mas_yr")[kept],
+        "proper_motion_dec_mas_yr": floats("pmdec_mas_yr")[kept],
+        "magnitude": floats("magnitude")[kept],
+    }
+    return columns, kept, safe_parallax[kept]
+
+
+def stream_into_catalog(table, catalog=None, chunk_size=DEFAULT_CHUNK_SIZE, name_prefix=None,
+                        passthrough=None, check_decimal=False):
+    """
+    Append the rows of a CatalogTable to a StarCatalog, one block at a time
+
+    Args:
+        table: CatalogTable (see read_csv / read_votable)
+        catalog: StarCatalog to append to (a new one by default)
+        chunk_size: Rows converted per block
+        name_prefix: Prefix for names built from source_id
+        passthrough: Optional dict of column name -> list; the values of
+            that column for every appended row are appended to the list
+        check_decimal: Recompute parallax distances with
+            parallax_to_distance_light_years and report the largest deviation
+
+    Returns:
+        Dict with "catalog", "rows", "appended", "rejected" and, with
+        check_decimal=True, "max_abs_error_ly"
+    """
+    catalog = StarCatalog() if catalog is None else catalog
+    mapping = column_map(table.fields)
+    passthrough_index = {name: table.fields.index(name) for name in (passthrough or {}) if name in table.fields}
+    result = {"catalog": catalog, "rows": 0, "appended": 0, "rejected": 0}
+    if check_decimal:
+        result["max_abs_error_ly"] = 0.0
+    while True:
+        rows = list(islice(table.rows, chunk_size))
+        if not rows:
+            return result
+        columns, kept, parallax = convert_chunk(table, mapping, rows, name_prefix)
+        catalog.append_columns(**columns)
+        result["rows"] += len(rows)
+        result["appended"] += len(kept)
+        result["rejected"] += len(rows) - len(kept)
+        for name, index in passthrough_index.items():
+            passthrough[name].extend(rows[i][index] for i in kept)
+        if check_decimal:
+            for distance, p in zip(columns["distance_ly"], parallax):
+                if not np.isnan(p):
+                    error = abs(distance - parallax_to_distance_light_years(float(p)))
+                    result["max_abs_error_ly"] = max(result["max_abs_error_ly"], float(error))
+
+
+def open_table(path):
+    """
+    Open a local catalog file as a CatalogTable
+
+    The format follows the extension: .vot/.xml (VOTable), .tsv/.tab
+    (tab-separated) or .csv; a trailing .gz is decompressed on the fly.
+    The file stays open until the rows have been read.
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    base = path[:-3] if path.endswith(".gz") else path
+    if base.endswith((".vot", ".xml", ".votable")):
+        return read_votable(opener(path, "rb"))
+    delimiter = "\t" if base.endswith((".tsv", ".tab")) else ","
+    return read_csv(opener(path, "rt", encoding="utf-8", newline=""), delimiter)
+
+
+def response_table(response):
+    """
+    CatalogTable over a streaming HTTP response (requests, stream=True)
+
+    VOTable responses are parsed from the raw body, CSV/TSV ones line by line.
+    """
+    content_type = response.headers.get("Content-Type", "").lower()
+    if "xml" in content_type or "votable" in content_type:
+        response.raw.decode_content = True
+        return read_votable(response.raw)
+    delimiter = "\t" if "tab-separated" in content_type else ","
+    return read_csv(response.iter_lines(decode_unicode=True), delimiter)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream a VOTable/CSV catalog file into a columnar star catalog")
+    parser.add_argument("path", help="Catalog file (.vot, .xml, .csv, .tsv, optionally .gz)")
+    parser.add_argument("--output-dir", default="streamed_catalog", help="Catalog export directory (timeline_export)")
+    parser.add_argument("--name-prefix", default=None, help="Prefix for names built from IDs (e.g. HIP)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--check", action="store_true", help="Cross-check parallax distances with Decimal")
+    args = parser.parse_args(argv)
+
+    table = open_table(args.path)
+    result = stream_into_catalog(table, chunk_size=args.chunk_size, name_prefix=args.name_prefix,
+                                 check_decimal=args.check)
+    catalog = result["catalog"]
+    export_catalog(catalog, args.output_dir, provenance=args.path)
+    print(f"✓ {result['appended']}/{result['rows']} rows appended ({result['rejected']} rejected), "
+          f"saved to {args.output_dir}")
+    if args.check:
+        print(f"  Max deviation from Decimal parallax distance: {result['max_abs_error_ly']:.3e} ly")
+    return 0 if result["appended"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
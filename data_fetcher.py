@@ -8,6 +8,8 @@ import json
 from decimal import Decimal
 from datetime import datetime, timezone
 
+from catalog_cache import cached_get
+
 # SIMBAD API base URL
 SIMBAD_BASE_URL = "http://simbad.u-strasbg.fr/simbad/sim-id"
 VIZIER_BASE_URL = "http://vizier.u-strasbg.fr/viz-bin"
@@ -15,9 +17,17 @@ VIZIER_BASE_URL = "http://vizier.u-strasbg.fr/viz-bin"
 class AstronomicalDataFetcher:
     """Fetch real astronomical data from various sources"""
     
-    def __init__(self):
+    def __init__(self, catalog_cache=None):
+        """
+        Args:
+            catalog_cache: Optional CatalogCache; SIMBAD responses are then
+                reused across runs and revalidated once expired
+        """
+        self.catalog_cache = catalog_cache
         self.polaris_hip = "HIP 11767"  # Polaris Hipparcos ID
         self.polaris_gaia = "Gaia DR3 131081166581443968"  # GAIA EDR3 ID
+        # Reuse connections across requests (see async_fetcher.py for bulk queries)
+        self.session = requests.Session()
         
     def fetch_simbad_data(self, identifier="HIP 11767"):
         """
@@ -26,14 +36,18 @@ class AstronomicalDataFetcher:
         """
         try:
             # SIMBAD query
-            url = f"http://simbad.u-strasbg.fr/simbad/sim-id"
+            url = SIMBAD_BASE_URL
             params = {
                 "Ident": identifier,
                 "output.format": "JSON",
                 "output.params": "all"
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            if self.catalog_cache is not None:
+                body = cached_get(self.session, self.catalog_cache, "SIMBAD", "sim-id", identifier, url, params)
+                return self._parse_simbad_data(json.loads(body))
+
+            response = self.session.get(url, params=params, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -0,0 +1,180 @@
+"""
+Polaris Fixed-Point Distance Engine
+Exact kinematic extrapolation with scaled integers
+
+calculate_distance_high_precision works in 50-digit Decimal and then
+returns a float, so the "up to 18 decimals" it reports are cut back to
+the ~13 decimals a float64 can hold for a star at a few hundred light
+years. This module evaluates the same model
+
+    d(t) = d₀ + v_r · t · SECONDS_PER_YEAR / KM_PER_LIGHT_YEAR,   t = -years_ago
+
+exactly. Every input (d₀, v_r, t and the constants) is a finite decimal,
+so d(t) is a ratio of two Python ints. It is rounded (half-even) once,
+to the precision the timeline reports, and kept as a FixedDistance: an
+integer count of 10^-decimals light years. Decimal strings are produced
+only at serialization, with exactly `decimals` digits, all of them
+correct.
+
+Evenly spaced epochs (iter_fixed_distances) advance the numerator by one
+integer addition per point. That makes them cheaper than the Decimal
+accumulation in iter_arithmetic_distances. The values are still exact.
+
+Run:
+    python fixed_point.py --years 0 100 -500 1e6
+"""
+
+import argparse
+from dataclasses import dataclass
+from decimal import Decimal
+from functools import lru_cache
+import sys
+
+from polaris import KM_PER_LIGHT_YEAR, POLARIS, SECONDS_PER_YEAR
+
+# Precision of distance_ly_precision when Δd is 0 or larger than 10^-3 ly
+MIN_PRECISION = 6
+# Extra digits beyond the order of magnitude of Δd (same rule as _precision_for_delta)
+GUARD_DIGITS = 3
+
+KM_PER_LIGHT_YEAR_RATIO = KM_PER_LIGHT_YEAR.as_integer_ratio()
+SECONDS_PER_YEAR_INT = int(SECONDS_PER_YEAR)
+
+
+@dataclass(frozen=True)
+class FixedDistance:
+    """
+    Distance stored as an integer number of 10^-decimals light years
+
+    str() gives the exact decimal string (always `decimals` digits after
+    the point); float() the nearest float64.
+    """
+    scaled: int
+    decimals: int
+
+    def __str__(self):
+        sign = "-" if self.scaled < 0 else ""
+        digits = str(abs(self.scaled)).rjust(self.decimals + 1, "0")
+        if not self.decimals:
+            return sign + digits
+        return f"{sign}{digits[:-self.decimals]}.{digits[-self.decimals:]}"
+
+    def __float__(self):
+        # Correctly rounded: int / int true division rounds once
+        return self.scaled / 10 ** self.decimals
+
+    def to_decimal(self):
+        """Exact Decimal value"""
+        return Decimal(self.scaled).scaleb(-self.decimals)
+
+
+def _ratio(value):
+    """Exact (numerator, denominator) of a number written as a decimal string"""
+    return Decimal(str(value)).as_integer_ratio()
+
+
+def _round_half_even(numerator, denominator):
+    """numerator / denominator rounded to the nearest int, ties to even (denominator > 0)"""
+    quotient, remainder = divmod(numerator, denominator)
+    twice = 2 * remainder
+    if twice > denominator or (twice == denominator and quotient % 2):
+        quotient += 1
+    return quotient
+
+
+@lru_cache(maxsize=4096)
+def _star_terms(distance_ly, radial_velocity_km_s):
+    """
+    Integer terms of d = (base + rate · years_ago) / denominator
+
+    rate carries the sign of -v_r: a receding star was closer in the past.
+
+    Returns:
+        Tuple (base, rate, denominator)
+    """
+    d_num, d_den = _ratio(distance_ly)
+    v_num, v_den = _ratio(radial_velocity_km_s)
+    km_num, km_den = KM_PER_LIGHT_YEAR_RATIO
+    # d₀ - v·years_ago·S·km_den/km_num over the common denominator d_den·v_den·km_num
+    denominator = d_den * v_den * km_num
+    return d_num * v_den * km_num, -v_num * SECONDS_PER_YEAR_INT * km_den * d_den, denominator
+
+
+def _precision(delta_numerator, denominator, max_precision):
+    """
+    distance_ly_precision for Δd = delta_numerator / denominator, exactly
+
+    Same rule as polaris._precision_for_delta: trunc(-log10|Δd|) + 3,
+    clamped to [6, max_precision]. Only |Δd| < 10^-3 can exceed 6 digits.
+    """
+    delta = abs(delta_numerator)
+    if delta == 0 or delta * 1000 > denominator:
+        return MIN_PRECISION
+    # Largest n with |Δd| · 10^n <= 1, starting from a digit-count estimate
+    n = len(str(denominator)) - len(str(delta))
+    while delta * 10 ** n > denominator:
+        n -= 1
+    while delta * 10 ** (n + 1) <= denominator:
+        n += 1
+    return max(MIN_PRECISION, min(max_precision, n + GUARD_DIGITS))
+
+
+def calculate_distance_fixed(star, years_ago, max_precision=18):
+    """
+    Exact counterpart of calculate_distance_high_precision
+
+    Args:
+        star: Star object with distance_ly and radial_velocity_km_s
+        years_ago: Negative for future, positive for past (0 = current)
+        max_precision: Maximum decimal precision
+
+    Returns:
+        Tuple of (FixedDistance rounded to precision decimals, precision)
+    """
+    base, rate, denominator = _star_terms(star.distance_ly, star.radial_velocity_km_s)
+    t_num, t_den = _ratio(years_ago)
+    delta = rate * t_num
+    denominator *= t_den
+    precision = _precision(delta, denominator, max_precision)
+    scaled = _round_half_even((base * t_den + delta) * 10 ** precision, denominator)
+    return FixedDistance(scaled, precision), precision
+
+
+def iter_fixed_distances(star, first_years_ago, step_years, count, max_precision=18):
+    """
+    Exact distances for years_ago(i) = first_years_ago + i · step_years
+
+    Yields:
+        Tuples of (FixedDistance, precision_decimals)
+    """
+    base, rate, denominator = _star_terms(star.distance_ly, star.radial_velocity_km_s)
+    first_num, first_den = _ratio(first_years_ago)
+    step_num, step_den = _ratio(step_years)
+    t_den = first_den * step_den
+    denominator *= t_den
+    base *= t_den
+    delta = rate * first_num * step_den
+    step_delta = rate * step_num * first_den
+    powers = [10 ** p for p in range(max(max_precision, MIN_PRECISION) + 1)]
+    for i in range(count):
+        if i:
+            delta += step_delta
+        precision = _precision(delta, denominator, max_precision)
+        yield FixedDistance(_round_half_even((base + delta) * powers[precision], denominator), precision), precision
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exact fixed-point Polaris distances")
+    parser.add_argument("--years", nargs="+", default=["0", "1", "100", "-500"],
+                        help="Epochs in years ago (negative for future)")
+    parser.add_argument("--max-precision", type=int, default=18)
+    args = parser.parse_args(argv)
+
+    for years in args.years:
+        distance, precision = calculate_distance_fixed(POLARIS, Decimal(years), args.max_precision)
+        print(f"{years:>12} years ago: {distance} ly ({precision} decimals)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
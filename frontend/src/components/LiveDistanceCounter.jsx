@@ -7,6 +7,28 @@ export default function LiveDistanceCounter() {
   const [northPoleDeviation, setNorthPoleDeviation] = useState(null)
 
   useEffect(() => {
+    // Pole separation of date from the server's precession engine,
+    // extrapolated locally with its rate of change
+    let pole = null
+    const currentPoleDeviation = (now) => {
+      if (!pole) return null
+      const yearsElapsed = (now - pole.timestamp) / (365.25 * 24 * 3600 * 1000)
+      return pole.separation + pole.ratePerYear * yearsElapsed
+    }
+
+    fetch('http://localhost:5000/api/current-distance')
+      .then(res => res.json())
+      .then(data => {
+        if (data.north_pole_separation_deg == null) return
+        pole = {
+          separation: data.north_pole_separation_deg,
+          ratePerYear: data.north_pole_separation_change_per_year_deg,
+          timestamp: new Date(data.timestamp)
+        }
+        setNorthPoleDeviation(currentPoleDeviation(new Date()))
+      })
+      .catch(() => {})
+
     // Calculate current distance based on reference date
     const calculateCurrentDistance = () => {
       const baseDistance = 446.5 // Reference distance at 2025-01-01
@@ -23,22 +45,11 @@ export default function LiveDistanceCounter() {
       const currentDistance = baseDistance + distanceChange
       const changePerSecond = radialVelocity / kmPerLy
       
-      // Calculate angular deviation from North Pole
-      // Polaris declination: 89.264109444° (J2000.0)
-      // North Pole: 90°
-      // Deviation = 90° - declination
-      // Precession causes slow change: ~0.0000139° per year (26,000 year cycle)
-      const baseDeclination = 89.264109444 // J2000.0
-      const precessionRate = 0.0000139 // degrees per year
-      const yearsSinceJ2000 = (now - new Date('2000-01-01T12:00:00Z')) / (365.25 * 24 * 3600 * 1000)
-      const currentDeclination = baseDeclination + (precessionRate * yearsSinceJ2000)
-      const deviation = 90.0 - currentDeclination
-      
       return {
         distance_ly: currentDistance,
         distance_change_per_second_ly: changePerSecond,
         distance_change_per_day_ly: changePerSecond * 86400,
-        north_pole_deviation: deviation
+        north_pole_deviation: currentPoleDeviation(now)
       }
     }
 
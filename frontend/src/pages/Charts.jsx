@@ -4,6 +4,7 @@ import StarBackground from '../components/StarBackground'
 import StatsCard from '../components/StatsCard'
 import LiveDistanceCounter from '../components/LiveDistanceCounter'
 import FuturePathChart from '../components/FuturePathChart'
+import { loadTimeline } from '../utils/timelineData'
 
 export default function Charts() {
   const [data100, setData100] = useState(null)
@@ -13,8 +14,8 @@ export default function Charts() {
 
   useEffect(() => {
     Promise.all([
-      fetch('/polaris_100years.json').then(res => res.json()),
-      fetch('/polaris_10years.json').then(res => res.json())
+      loadTimeline('polaris_100years'),
+      loadTimeline('polaris_10years')
     ])
       .then(([data100, data10]) => {
         setData100(data100)
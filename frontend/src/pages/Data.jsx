@@ -15,6 +15,7 @@ import StatsCard from '../components/StatsCard'
 import LiveDistanceCounter from '../components/LiveDistanceCounter'
 import FuturePathChart from '../components/FuturePathChart'
 import SolarSystemStats from '../components/SolarSystemStats'
+import { loadTimeline } from '../utils/timelineData'
 
 export default function Data() {
   const [stars, setStars] = useState([])
@@ -54,8 +55,8 @@ export default function Data() {
     if (activeTab === 'polaris' && !polarisData100) {
       setPolarisLoading(true)
       Promise.all([
-        fetch('/polaris_100years.json').then(res => res.json()),
-        fetch('/polaris_10years.json').then(res => res.json())
+        loadTimeline('polaris_100years'),
+        loadTimeline('polaris_10years')
       ])
         .then(([data100, data10]) => {
           setPolarisData100(data100)
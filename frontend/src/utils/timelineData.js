@@ -0,0 +1,111 @@
+// Timeline Data Loading - compact columnar timeline files
+
+const COMPACT_FORMAT = 'polaris-timeline-compact/1'
+// Columns present only in some timelines (evaluator="fixed" / pole_separation=True)
+const OPTIONAL_COLUMNS = ['distance_ly_exact', 'pole_separation_deg']
+// Microseconds per Julian year (365.25 days)
+const JULIAN_YEAR_US = 31557600000000n
+const MS_PER_US = 1000n
+
+const periodName = (year) => (year >= 0 ? `${year} AD` : `${Math.abs(year)} BC`)
+
+const pad = (value, width = 2) => String(value).padStart(width, '0')
+
+// calculation_date (Python isoformat) → wall-clock microseconds (BigInt, Date's
+// epoch) and UTC offset suffix. Date.parse would drop the microseconds.
+const parseReferenceTime = (isoString) => {
+  const match = /^(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})(?:\.(\d{1,6}))?(Z|[+-]\d{2}:\d{2}(?::\d{2}(?:\.\d{1,6})?)?)?$/
+    .exec(isoString)
+  if (!match) {
+    throw new Error(`Unsupported calculation_date: ${isoString}`)
+  }
+  const [, year, month, day, hour, minute, second, fraction = '', offset = ''] = match
+  const date = new Date(0)
+  date.setUTCFullYear(Number(year), Number(month) - 1, Number(day))
+  date.setUTCHours(Number(hour), Number(minute), Number(second), 0)
+  return {
+    micros: BigInt(date.getTime()) * MS_PER_US + BigInt(fraction.padEnd(6, '0')),
+    offset: offset === 'Z' ? '+00:00' : offset
+  }
+}
+
+// Same string as datetime.isoformat(): microseconds only when non-zero
+const formatWallClock = (micros, offset) => {
+  let ms = micros / MS_PER_US
+  let us = micros % MS_PER_US
+  if (us < 0n) {
+    ms -= 1n
+    us += MS_PER_US
+  }
+  const date = new Date(Number(ms))
+  const year = date.getUTCFullYear()
+  if (year < 1 || year > 9999) return null
+  const fraction = date.getUTCMilliseconds() * 1000 + Number(us)
+  return `${pad(year, 4)}-${pad(date.getUTCMonth() + 1)}-${pad(date.getUTCDate())}` +
+    `T${pad(date.getUTCHours())}:${pad(date.getUTCMinutes())}:${pad(date.getUTCSeconds())}` +
+    `${fraction ? `.${pad(fraction, 6)}` : ''}${offset}`
+}
+
+// Same rules as _timeline_date / _historical_note in polaris.py, to the microsecond
+const periodDate = (reference, year, yearsAgo) => {
+  if (Math.abs(yearsAgo) <= 36525 && Number.isInteger(yearsAgo)) {
+    // Python datetimes only cover years 1-9999
+    const date = formatWallClock(reference.micros - BigInt(yearsAgo) * JULIAN_YEAR_US, reference.offset)
+    if (date) return date
+  }
+  return `Approx. ${year} (calculated)`
+}
+
+const historicalNote = (year, yearsAgo) =>
+  yearsAgo > 0 && year <= -3200 ? 'Invention of writing (cuneiform) by Sumerians' : null
+
+// Rebuild the full report ({ metadata, star, ..., intervals }) from the compact format
+export const expandCompactTimeline = (compact) => {
+  if (compact.format !== COMPACT_FORMAT) {
+    throw new Error(`Unsupported timeline format: ${compact.format}`)
+  }
+  const startYear = compact.time_span.start_year
+  const referenceTime = parseReferenceTime(compact.metadata.calculation_date)
+  const { year, distance_ly, distance_ly_precision, distance_ly_uncertainty } = compact.columns
+
+  const intervals = year.map((periodYear, index) => {
+    const yearsAgo = startYear - periodYear
+    const period = {
+      year: periodYear,
+      period: periodName(periodYear),
+      years_ago: yearsAgo,
+      distance_ly: distance_ly[index],
+      distance_ly_precision: distance_ly_precision[index],
+      distance_ly_uncertainty: distance_ly_uncertainty[index],
+      date: periodDate(referenceTime, periodYear, yearsAgo),
+      historical_note: historicalNote(periodYear, yearsAgo),
+      ...compact.period_defaults,
+      ...compact.period_overrides[index]
+    }
+    if (!period.historical_note) delete period.historical_note
+    for (const name of OPTIONAL_COLUMNS) {
+      if (name in compact.columns) period[name] = compact.columns[name][index]
+    }
+    return period
+  })
+
+  return {
+    metadata: compact.metadata,
+    star: compact.star,
+    time_span: compact.time_span,
+    physical_constants: compact.physical_constants,
+    intervals,
+    statistics: compact.statistics,
+    validation: compact.validation
+  }
+}
+
+// Load a timeline by base name (e.g. 'polaris_100years'), preferring the compact file
+export const loadTimeline = async (name) => {
+  const compact = await fetch(`/${name}.compact.json`)
+  if (compact.ok) {
+    return expandCompactTimeline(await compact.json())
+  }
+  const full = await fetch(`/${name}.json`)
+  return full.json()
+}
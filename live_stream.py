@@ -0,0 +1,178 @@
+"""
+Polaris Live Distance Stream
+Server-Sent Events broadcast of live distances from a single shared ticker
+
+Instead of N clients polling M stars every few seconds, clients open one
+event stream and subscribe to any set of stars at their own cadence. One
+background ticker looks up each subscribed star's kinematics at most once
+per tick and fans the results out to every subscriber that is due.
+
+Like /api/current-distance, a stream treats the catalog distance d₀ as the
+distance at the time of the request: the initial snapshot reports d₀ and
+later events extrapolate from the subscription's reference time.
+"""
+
+from datetime import datetime, timezone
+import json
+import queue
+import threading
+import time
+
+from polaris import get_star_kinematics, required_decimals
+
+# Events buffered per subscriber before the oldest ones are dropped
+SUBSCRIBER_QUEUE_SIZE = 16
+
+
+class Subscription:
+    """
+    One client's subscription: a set of stars, a cadence and an event queue
+
+    now (Unix timestamp) is also the reference time at which the stars are
+    at their catalog distances.
+    """
+
+    def __init__(self, stars, interval_seconds, now):
+        self.stars = list(stars)
+        self.interval_seconds = interval_seconds
+        self.reference_timestamp = now
+        self.reference_time = datetime.fromtimestamp(now, tz=timezone.utc)
+        self.next_due = now + interval_seconds
+        self.events = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+    def deliver(self, event):
+        """Queue an event, dropping the oldest one if the client is not keeping up"""
+        while True:
+            try:
+                self.events.put_nowait(event)
+                return
+            except queue.Full:
+                try:
+                    self.events.get_nowait()
+                except queue.Empty:
+                    pass
+
+
+class DistanceTicker:
+    """
+    Shared ticker that computes live distances for all subscribed stars
+
+    Distances are extrapolated from each subscription's reference time with
+    the star's radial velocity: d(t) = d₀ + v_r · (t - t_ref). Each star's
+    kinematics and precision are looked up at most once per tick regardless
+    of how many clients subscribe to it.
+
+    Args:
+        tick_seconds: Ticker resolution; client cadences are rounded up to it
+    """
+
+    def __init__(self, tick_seconds=1.0):
+        self.tick_seconds = tick_seconds
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def subscribe(self, stars, interval_seconds):
+        """Register a subscription and start the ticker if needed"""
+        interval_seconds = max(interval_seconds, self.tick_seconds)
+        subscription = Subscription(stars, interval_seconds, time.time())
+        with self._lock:
+            self._subscriptions.add(subscription)
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="distance-ticker", daemon=True)
+                self._thread.start()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """Remove a subscription; the ticker idles when nobody is subscribed"""
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscriptions)
+
+    def stop(self):
+        """Stop the background ticker thread"""
+        self._stop.set()
+
+    def event(self, subscription, now, computed=None):
+        """
+        Live distance event for a subscription at time now (Unix timestamp)
+
+        Args:
+            computed: Optional dict shared across the subscriptions of one
+                tick, caching each star's (kinematics, precision) by name
+        """
+        computed = {} if computed is None else computed
+        elapsed = now - subscription.reference_timestamp
+        states = []
+        for star in subscription.stars:
+            key = (star.name, subscription.interval_seconds)
+            if key not in computed:
+                computed[key] = (get_star_kinematics(star), required_decimals(star, subscription.interval_seconds))
+            kinematics, precision = computed[key]
+            delta_ly = kinematics.rv_ly_per_second * elapsed
+            states.append({
+                "name": star.name,
+                "distance_ly": star.distance_ly + delta_ly,
+                "distance_km": kinematics.distance_km + star.radial_velocity_km_s * elapsed,
+                "delta_ly": delta_ly,
+                "precision": precision,
+                "radial_velocity_km_s": star.radial_velocity_km_s
+            })
+        return {
+            "timestamp": datetime.fromtimestamp(now, tz=timezone.utc).isoformat(),
+            "reference_time": subscription.reference_time.isoformat(),
+            "interval_seconds": subscription.interval_seconds,
+            "stars": states
+        }
+
+    def tick(self, now=None):
+        """Compute distances once and deliver events to every due subscriber"""
+        now = time.time() if now is None else now
+        with self._lock:
+            due = [s for s in self._subscriptions if s.next_due <= now]
+        if not due:
+            return 0
+
+        computed = {}
+        for subscription in due:
+            subscription.deliver(self.event(subscription, now, computed))
+            subscription.next_due = max(subscription.next_due + subscription.interval_seconds, now)
+        return len(due)
+
+    def _run(self):
+        while not self._stop.is_set():
+            if not self.subscriber_count():
+                # Idle until the next subscription arrives
+                self._stop.wait(self.tick_seconds)
+                continue
+            self.tick()
+            # Align to tick boundaries so all clients see the same instants
+            self._stop.wait(self.tick_seconds - (time.time() % self.tick_seconds))
+
+
+def iter_sse_events(ticker, subscription, heartbeat_seconds=15.0):
+    """
+    Yield Server-Sent Events text for a subscription until the client disconnects
+
+    Sends an initial snapshot immediately, then one "distances" event per
+    due tick and a comment line as keep-alive when nothing is due.
+    """
+    try:
+        # At the reference time: the catalog distances, as /api/current-distance reports them
+        initial = ticker.event(subscription, subscription.reference_timestamp)
+        yield f"retry: {int(subscription.interval_seconds * 1000)}\n"
+        yield f"event: distances\ndata: {json.dumps(initial, ensure_ascii=False)}\n\n"
+        while True:
+            try:
+                event = subscription.events.get(timeout=heartbeat_seconds)
+            except queue.Empty:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"event: distances\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+    finally:
+        ticker.unsubscribe(subscription)
@@ -0,0 +1,366 @@
+"""
+Polaris Monte Carlo Uncertainty Engine
+Sampled distance uncertainty bands for whole catalogs and timelines
+
+calculate_distance_uncertainty adds the base distance and radial velocity
+errors in quadrature, σ(t) = sqrt(σ_d0² + (σ_vr · t)²). That is linear
+error propagation: it ignores the 1/p non-linearity of parallax distances
+(a symmetric parallax error gives an asymmetric, biased distance error),
+the transverse motion and any correlation between the measured quantities.
+
+This module draws N samples per star of (parallax, radial velocity,
+proper motion in RA, proper motion in Dec), optionally correlated, and
+evaluates every sample at every epoch with the straight-line motion model
+
+    d(t) = sqrt((d₀ + v_r · t)² + (v_t · t)²),   d₀ = 1000 / p(mas) pc
+
+with t = -years_ago, which reduces to d₀ + v_r · t (the model of
+calculate_distance_high_precision) when the proper motion is unknown. The results are percentile bands per
+star and epoch.
+
+Evaluation is blocked over stars and epochs, and within a block the
+samples are drawn and evaluated in chunks, so that the distances kept for
+the percentiles plus the temporaries of drawing and reducing stay within
+memory_budget bytes. Each star has its own random stream (spawned from the
+seed) which is replayed for every epoch block, so the samples do not depend
+on the block sizes.
+
+Run:
+    python monte_carlo.py Polaris --samples 100000 --years 0 1000 5000
+"""
+
+import argparse
+import json
+import sys
+
+import numpy as np
+
+from batch_kinematics import LY_PER_KM_S_YEAR
+from polaris import PARSEC_LY
+from popular_stars import STAR_INDEX
+
+PARSEC_LY_FLOAT = float(PARSEC_LY)
+LY_PER_KM_S_YEAR_FLOAT = float(LY_PER_KM_S_YEAR)
+
+# km/s of transverse velocity per (mas/yr of proper motion) · pc of distance
+KM_S_PER_MAS_YR_PC = 4.740470463533348e-3
+
+# Sampled quantities, in the order of the correlation matrix
+PARAMETERS = ("parallax_mas", "radial_velocity_km_s", "pmra_mas_yr", "pmdec_mas_yr")
+
+DEFAULT_SAMPLES = 10000
+DEFAULT_PERCENTILES = (2.5, 16.0, 50.0, 84.0, 97.5)
+
+# Working memory of monte_carlo_uncertainty (bytes)
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+
+# Bytes per (star, sample, epoch) distance kept for the reductions
+DISTANCE_BYTES = 8
+# Bytes per (star, sample) of a chunk being drawn: the parameter samples, the
+# normal deviates and their correlated and scaled copies (4 float64 each)
+SAMPLE_BYTES = 4 * 4 * 8
+# Bytes per (star, sample, epoch) of a chunk: the transverse and unpacked
+# distance temporaries of sampled_distances and the deviations of the std
+CHUNK_CELL_BYTES = 3 * 8
+
+
+def star_parameters(stars):
+    """
+    Means and standard deviations of the sampled quantities
+
+    Parallax is recovered from the catalog distance (p = 1000 / d(pc)) and
+    its error from the distance error (σ_p = p · σ_d / d). Missing errors
+    are 0 (not sampled), missing proper motions are 0.
+
+    Args:
+        stars: Sequence of Star objects or a StarCatalog
+
+    Returns:
+        Tuple (means, sigmas) of arrays shaped (n_stars, 4), in PARAMETERS order
+    """
+    if hasattr(stars, "column"):
+        def column(field):
+            return np.array(stars.column(field), dtype=np.float64)
+    else:
+        stars = list(stars)
+
+        def column(field):
+            return np.array([getattr(star, field) for star in stars], dtype=np.float64)
+
+    distance = column("distance_ly")
+    parallax = 1000.0 / (distance / PARSEC_LY_FLOAT)
+    means = np.stack([
+        parallax,
+        column("radial_velocity_km_s"),
+        column("proper_motion_ra_mas_yr"),
+        column("proper_motion_dec_mas_yr"),
+    ], axis=1)
+    sigmas = np.zeros_like(means)
+    sigmas[:, 0] = parallax * column("distance_ly_uncertainty") / distance
+    sigmas[:, 1] = column("radial_velocity_uncertainty_km_s")
+    # NumPy turns None into NaN: missing values and errors are 0
+    return np.nan_to_num(means), np.nan_to_num(sigmas)
+
+
+def _cholesky_factors(correlation, n_stars):
+    """Cholesky factors (n_stars, 4, 4) of the correlation matrices (None for independent errors)"""
+    if correlation is None:
+        return None
+    correlation = np.asarray(correlation, dtype=np.float64)
+    if correlation.shape == (len(PARAMETERS), len(PARAMETERS)):
+        correlation = np.broadcast_to(correlation, (n_stars, *correlation.shape))
+    if correlation.shape != (n_stars, len(PARAMETERS), len(PARAMETERS)):
+        raise ValueError(f"correlation must be shaped (4, 4) or ({n_stars}, 4, 4)")
+    try:
+        return np.linalg.cholesky(correlation)
+    except np.linalg.LinAlgError as e:
+        raise ValueError("correlation matrices must be positive definite") from e
+
+
+def draw_samples(means, sigmas, n_samples, rngs, cholesky=None, pm_sigmas=None):
+    """
+    Draw parameter samples for a block of stars
+
+    Args:
+        means, sigmas: Arrays (n_stars, 4) from star_parameters
+        n_samples: Samples per star
+        rngs: One np.random.Generator per star
+        cholesky: Optional Cholesky factors (n_stars, 4, 4) of the correlations
+        pm_sigmas: Optional (n_stars, 2) proper motion errors (mas/yr)
+
+    Returns:
+        Array (n_stars, n_samples, 4)
+    """
+    sigmas = sigmas.copy()
+    if pm_sigmas is not None:
+        sigmas[:, 2:] = pm_sigmas
+    normal = np.stack([rng.standard_normal((n_samples, len(PARAMETERS))) for rng in rngs])
+    if cholesky is not None:
+        normal = normal @ np.swapaxes(cholesky, 1, 2)
+    return means[:, np.newaxis, :] + normal * sigmas[:, np.newaxis, :]
+
+
+def sampled_distances(samples, epochs, out=None):
+    """
+    Distances (ly) of every sample at every epoch
+
+    Samples with a non-positive parallax have no distance (NaN).
+
+    Args:
+        samples: Array (n_stars, n_samples, 4) from draw_samples
+        epochs: 1-D array of years (same convention as years_ago)
+        out: Optional array (n_stars, n_samples, n_epochs) to write into
+
+    Returns:
+        Array (n_stars, n_samples, n_epochs)
+    """
+    parallax = samples[..., 0]
+    distance_pc = np.where(parallax > 0, 1000.0 / np.where(parallax > 0, parallax, 1.0), np.nan)
+    distance_ly = distance_pc * PARSEC_LY_FLOAT
+    # v_t = 4.74 · μ(arcsec/yr) · d(pc), converted like v_r to ly per year
+    proper_motion = np.hypot(samples[..., 2], samples[..., 3])
+    transverse_ly_yr = KM_S_PER_MAS_YR_PC * proper_motion * distance_pc * LY_PER_KM_S_YEAR_FLOAT
+    radial_ly_yr = samples[..., 1] * LY_PER_KM_S_YEAR_FLOAT
+    # Elapsed time: the past (years_ago > 0) is t < 0
+    t = -epochs[np.newaxis, np.newaxis, :]
+    radial = np.multiply(radial_ly_yr[..., np.newaxis], t, out=out)
+    radial += distance_ly[..., np.newaxis]
+    transverse = transverse_ly_yr[..., np.newaxis] * t
+    return np.hypot(radial, transverse, out=radial)
+
+
+def _block_sizes(n_stars, n_epochs, n_samples, memory_budget):
+    """
+    Stars and epochs per block and samples per chunk within memory_budget
+
+    A block keeps DISTANCE_BYTES per distance of its stars, epochs and
+    samples; the samples are drawn and evaluated in chunks costing
+    SAMPLE_BYTES per (star, sample) plus CHUNK_CELL_BYTES per
+    (star, sample, epoch). When a whole star fits, blocks take as many
+    epochs and stars as fit with a chunk of all samples; otherwise one star
+    and as many epochs as fit in half the budget, the other half going to
+    the chunks.
+
+    Returns:
+        Tuple (star_block, epoch_block, sample_chunk)
+
+    Raises:
+        ValueError: The n_samples distances of one star and epoch do not fit
+            in half of memory_budget (the percentiles need all of them)
+    """
+    def star_bytes(epochs):
+        return n_samples * (DISTANCE_BYTES * epochs + SAMPLE_BYTES + CHUNK_CELL_BYTES * epochs)
+
+    if star_bytes(1) <= memory_budget:
+        epoch_block = min(n_epochs, (memory_budget // n_samples - SAMPLE_BYTES)
+                          // (DISTANCE_BYTES + CHUNK_CELL_BYTES))
+        star_block = min(n_stars, memory_budget // star_bytes(epoch_block))
+        return star_block, epoch_block, n_samples
+
+    if DISTANCE_BYTES * n_samples > memory_budget // 2:
+        raise ValueError(f"memory_budget must be at least {2 * DISTANCE_BYTES * n_samples} bytes "
+                         f"for {n_samples} samples")
+    epoch_block = min(n_epochs, memory_budget // 2 // (DISTANCE_BYTES * n_samples))
+    free = memory_budget - DISTANCE_BYTES * n_samples * epoch_block
+    sample_chunk = max(free // (SAMPLE_BYTES + CHUNK_CELL_BYTES * epoch_block), 1)
+    return 1, epoch_block, sample_chunk
+
+
+def monte_carlo_uncertainty(stars, years_ago, n_samples=DEFAULT_SAMPLES, percentiles=DEFAULT_PERCENTILES,
+                            seed=None, correlation=None, proper_motion_uncertainty_mas_yr=None,
+                            memory_budget=DEFAULT_MEMORY_BUDGET):
+    """
+    Monte Carlo distance percentile bands for many stars and epochs
+
+    Args:
+        stars: Sequence of Star objects or a StarCatalog
+        years_ago: Scalar or 1-D array of epochs (negative for future, positive for past)
+        n_samples: Samples per star
+        percentiles: Percentiles (0-100) of each band
+        seed: Seed of the random streams (None for fresh entropy)
+        correlation: Optional (4, 4) or (n_stars, 4, 4) correlation matrix of
+            (parallax, radial velocity, pmRA, pmDec)
+        proper_motion_uncertainty_mas_yr: Optional error of both proper motion
+            components, scalar or (n_stars,) / (n_stars, 2) array (Star has no
+            proper motion errors; without this the proper motion is not sampled)
+        memory_budget: Upper bound in bytes of the working memory (sampled
+            distances and the temporaries of drawing and reducing them)
+
+    Returns:
+        Dict of arrays:
+            "epochs" (n_epochs,), "percentiles" (n_percentiles,),
+            "bands" (n_stars, n_percentiles, n_epochs),
+            "mean_ly" and "std_ly" (n_stars, n_epochs),
+            "invalid_fraction" (n_stars,): share of samples with p <= 0
+
+    Raises:
+        ValueError: memory_budget cannot hold the samples of one star and epoch
+    """
+    epochs = np.atleast_1d(np.asarray(years_ago, dtype=np.float64))
+    if epochs.ndim != 1:
+        raise ValueError("years_ago must be a scalar or a 1-D array")
+    if n_samples < 1:
+        raise ValueError("n_samples must be positive")
+    percentiles = np.asarray(percentiles, dtype=np.float64)
+    means, sigmas = star_parameters(stars)
+    n_stars = len(means)
+    cholesky = _cholesky_factors(correlation, n_stars)
+    pm_sigmas = None
+    if proper_motion_uncertainty_mas_yr is not None:
+        pm_sigmas = np.asarray(proper_motion_uncertainty_mas_yr, dtype=np.float64)
+        if pm_sigmas.ndim == 1:
+            pm_sigmas = pm_sigmas[:, np.newaxis]
+        pm_sigmas = np.broadcast_to(pm_sigmas, (n_stars, 2))
+
+    star_block, epoch_block, sample_chunk = _block_sizes(n_stars, len(epochs), n_samples, memory_budget)
+    streams = np.random.SeedSequence(seed).spawn(n_stars)
+
+    bands = np.empty((n_stars, len(percentiles), len(epochs)))
+    mean = np.empty((n_stars, len(epochs)))
+    std = np.empty((n_stars, len(epochs)))
+    valid = np.empty(n_stars, dtype=np.int64)
+    for start in range(0, n_stars, star_block):
+        stop = min(start + star_block, n_stars)
+        for first in range(0, len(epochs), epoch_block):
+            last = min(first + epoch_block, len(epochs))
+            # Replay the star streams: every epoch block sees the same samples
+            rngs = [np.random.default_rng(stream) for stream in streams[start:stop]]
+            # Valid distances of each star, packed at the front of its rows
+            distances = np.empty((stop - start, last - first, n_samples))
+            counts = np.zeros(stop - start, dtype=np.int64)
+            for low in range(0, n_samples, sample_chunk):
+                high = min(low + sample_chunk, n_samples)
+                samples = draw_samples(means[start:stop], sigmas[start:stop], high - low, rngs,
+                                       None if cholesky is None else cholesky[start:stop],
+                                       None if pm_sigmas is None else pm_sigmas[start:stop])
+                positive = samples[..., 0] > 0
+                if positive.all() and (counts == low).all():
+                    sampled_distances(samples, epochs[first:last],
+                                      out=distances[:, :, low:high].transpose(0, 2, 1))
+                    counts += high - low
+                    continue
+                chunk = sampled_distances(samples, epochs[first:last])
+                for i in range(stop - start):
+                    kept = chunk[i, positive[i]]
+                    distances[i, :, counts[i]:counts[i] + len(kept)] = kept.T
+                    counts[i] += len(kept)
+                del chunk
+            valid[start:stop] = counts
+            for i in np.flatnonzero(counts < n_samples):
+                distances[i, :, counts[i]:] = 0.0
+
+            with np.errstate(invalid="ignore", divide="ignore"):
+                block_mean = np.sum(distances, axis=2) / counts[:, np.newaxis]
+                squares = np.zeros_like(block_mean)
+                for low in range(0, n_samples, sample_chunk):
+                    high = min(low + sample_chunk, n_samples)
+                    deviation = distances[:, :, low:high] - block_mean[..., np.newaxis]
+                    if (counts < high).any():
+                        deviation *= (np.arange(low, high) < counts[:, np.newaxis])[:, np.newaxis, :]
+                    np.square(deviation, out=deviation)
+                    squares += np.sum(deviation, axis=2)
+                    del deviation
+                mean[start:stop, first:last] = block_mean
+                std[start:stop, first:last] = np.sqrt(squares / counts[:, np.newaxis])
+
+            # Percentiles last: they reorder the distances in place
+            if (counts == n_samples).all():
+                block_bands = np.percentile(distances, percentiles, axis=2, overwrite_input=True)
+                bands[start:stop, :, first:last] = np.moveaxis(block_bands, 0, 1)
+            else:
+                for i, count in enumerate(counts):
+                    bands[start + i, :, first:last] = (
+                        np.percentile(distances[i, :, :count], percentiles, axis=1, overwrite_input=True)
+                        if count else np.nan)
+            del distances
+
+    return {
+        "epochs": epochs,
+        "percentiles": percentiles,
+        "bands": bands,
+        "mean_ly": mean,
+        "std_ly": std,
+        "invalid_fraction": 1.0 - valid / n_samples,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo distance uncertainty bands")
+    parser.add_argument("stars", nargs="+", help="Star names (e.g. Polaris, Sirius)")
+    parser.add_argument("--years", type=float, nargs="+", default=[0, 100, 1000, 5000],
+                        help="Epochs in years ago (negative for future)")
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--pm-uncertainty", type=float, default=None, help="Proper motion error (mas/yr)")
+    parser.add_argument("--memory-mb", type=float, default=DEFAULT_MEMORY_BUDGET / 1024 / 1024)
+    args = parser.parse_args(argv)
+
+    stars = []
+    for name in args.stars:
+        star = STAR_INDEX.get(name)
+        if star is None:
+            parser.error(f"unknown star: {name}")
+        stars.append(star)
+
+    result = monte_carlo_uncertainty(stars, args.years, args.samples, seed=args.seed,
+                                     proper_motion_uncertainty_mas_yr=args.pm_uncertainty,
+                                     memory_budget=int(args.memory_mb * 1024 * 1024))
+    report = {
+        star.name: [
+            {
+                "years_ago": float(epoch),
+                "mean_ly": float(result["mean_ly"][i, j]),
+                "std_ly": float(result["std_ly"][i, j]),
+                "percentiles": {f"{p:g}": float(result["bands"][i, k, j])
+                                for k, p in enumerate(result["percentiles"])}
+            }
+            for j, epoch in enumerate(result["epochs"])
+        ]
+        for i, star in enumerate(stars)
+    }
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,15 +16,62 @@ NASA Standards Compliance:
 # pip install openai
 
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime, timezone, timedelta
 import math
 import time
 import json
-from decimal import Decimal, getcontext
+import gzip
+from contextlib import contextmanager
+from contextvars import ContextVar
+from decimal import Context, Decimal, DivisionByZero, InvalidOperation, Overflow, ROUND_HALF_EVEN, localcontext
+
+# Optional brotli support for pre-compressed timeline files
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
 
 # STEP 2 — NASA-Standard Physical Constants (CODATA 2018/NIST)
-# Set maximum precision context for Decimal calculations
-getcontext().prec = 50  # 50 decimal places for intermediate calculations
+# Significant digits for intermediate Decimal calculations
+DECIMAL_PRECISION = 50
+
+# Precision of the current thread / asyncio task (see decimal_precision).
+# decimal's own getcontext() is per thread, so setting it at import time
+# would leave worker threads and executors at the 28-digit default.
+_decimal_precision = ContextVar("polaris_decimal_precision", default=DECIMAL_PRECISION)
+
+def _decimal_context(digits):
+    """Fresh Decimal context with every setting explicit (nothing inherited from DefaultContext)"""
+    return Context(prec=digits, rounding=ROUND_HALF_EVEN, Emin=-999999, Emax=999999,
+                   capitals=1, clamp=0, flags=[], traps=[InvalidOperation, DivisionByZero, Overflow])
+
+def decimal_context():
+    """
+    Decimal context for Polaris calculations in the current thread / task
+
+    Every Decimal function in this module evaluates in this context, never
+    in decimal.getcontext(), so results do not depend on which thread,
+    thread pool or executor runs them.
+    """
+    return _decimal_context(_decimal_precision.get())
+
+@contextmanager
+def decimal_precision(digits):
+    """
+    Use `digits` significant digits for Polaris Decimal calculations in this block
+
+    Local to the current thread and asyncio task (contextvars); threads and
+    executor jobs not started inside the block keep DECIMAL_PRECISION.
+    """
+    if digits < 1:
+        raise ValueError("Decimal precision must be at least 1 digit")
+    token = _decimal_precision.set(digits)
+    try:
+        yield
+    finally:
+        _decimal_precision.reset(token)
 
 # Light year in kilometers (IAU standard, CODATA 2018)
 # Source: IAU 2012 Resolution B2, CODATA 2018
@@ -46,6 +93,9 @@ AU_METERS = Decimal('149597870700')
 # Parsec in light years (IAU standard)
 PARSEC_LY = Decimal('3.261563777167433')
 
+# Astronomical Units per light year
+AU_PER_LIGHT_YEAR = Decimal('63241.077')
+
 # NASA Metadata Standards
 NASA_DATA_VERSION = "1.0.0"
 NASA_REFERENCE_FRAME = "ICRS (International Celestial Reference System)"
@@ -85,7 +135,9 @@ class Star:
 # For time-based distance changes, we use KINEMATIC EXTRAPOLATION:
 #   d(t) = d₀ + v_r · t
 # 
-# where d₀ is the base distance from parallax, and v_r is radial velocity.
+# where d₀ is the base distance from parallax, v_r is radial velocity and
+# t the time elapsed since the catalog epoch (t = -years_ago: a receding
+# star was closer in the past).
 # This is valid for SHORT-TERM predictions; uncertainty grows with time.
 #
 # Note: Run update_with_real_data.py to fetch latest data
@@ -109,7 +161,7 @@ def km_to_light_year(km, use_decimal=False):
     """Convert kilometers to light years with high precision"""
     if use_decimal:
         km_decimal = Decimal(str(km))
-        return float(km_decimal / KM_PER_LIGHT_YEAR)
+        return float(decimal_context().divide(km_decimal, KM_PER_LIGHT_YEAR))
     return float(km) / KM_PER_LIGHT_YEAR_FLOAT
 
 def parallax_to_distance_parsec(parallax_mas):
@@ -134,8 +186,9 @@ def parallax_to_distance_parsec(parallax_mas):
     if parallax_mas <= 0:
         raise ValueError("Parallax must be positive")
     # Convert mas to arcsec and apply formula: d = 1/p
-    parallax_arcsec = Decimal(str(parallax_mas)) / Decimal('1000')
-    distance_parsec = Decimal('1') / parallax_arcsec
+    with localcontext(decimal_context()):
+        parallax_arcsec = Decimal(str(parallax_mas)) / Decimal('1000')
+        distance_parsec = Decimal('1') / parallax_arcsec
     return float(distance_parsec)
 
 def parallax_to_distance_light_years(parallax_mas):
@@ -152,7 +205,92 @@ def parallax_to_distance_light_years(parallax_mas):
         Distance in light years
     """
     distance_parsec = parallax_to_distance_parsec(parallax_mas)
-    return float(Decimal(str(distance_parsec)) * PARSEC_LY)
+    return float(decimal_context().multiply(Decimal(str(distance_parsec)), PARSEC_LY))
+
+# Per-star kinematic constants (memoized)
+# Size of the StarKinematics LRU cache (one entry per distinct star)
+STAR_KINEMATICS_CACHE_SIZE = 4096
+
+@dataclass(frozen=True)
+class StarKinematics:
+    """
+    Precomputed, immutable Decimal constants for one star
+
+    Everything here depends only on the star's catalog values, so it is
+    built once per star (see get_star_kinematics) instead of on every
+    distance, uncertainty or precision call.
+    """
+    distance_decimal: Decimal  # d₀ (ly)
+    rv_decimal: Decimal  # v_r (km/s)
+    rv_uncertainty_decimal: Decimal  # σ_vr (km/s), None if unknown
+    rate_ly_per_year: Decimal  # v_r converted to ly per Julian year
+    rv_ly_per_second: float  # v_r converted to ly per second
+    distance_uncertainty_ly: float  # σ_d0 (ly), 0.0 if unknown
+    distance_km: float  # d₀ in kilometers
+    distance_au: float  # d₀ in astronomical units
+    distance_parsec: float  # d₀ in parsecs
+
+@lru_cache(maxsize=STAR_KINEMATICS_CACHE_SIZE)
+def _build_star_kinematics(distance_ly, radial_velocity_km_s, distance_ly_uncertainty, radial_velocity_uncertainty_km_s, digits=DECIMAL_PRECISION):
+    """Build StarKinematics from catalog values and Decimal precision (cached on those values)"""
+    distance_decimal = Decimal(str(distance_ly))
+    rv_decimal = Decimal(str(radial_velocity_km_s))
+    with localcontext(_decimal_context(digits)):
+        return StarKinematics(
+            distance_decimal=distance_decimal,
+            rv_decimal=rv_decimal,
+            rv_uncertainty_decimal=Decimal(str(radial_velocity_uncertainty_km_s)) if radial_velocity_uncertainty_km_s else None,
+            rate_ly_per_year=rv_decimal * SECONDS_PER_YEAR / KM_PER_LIGHT_YEAR,
+            rv_ly_per_second=float(radial_velocity_km_s) / KM_PER_LIGHT_YEAR_FLOAT,
+            distance_uncertainty_ly=distance_ly_uncertainty or 0.0,
+            distance_km=float(distance_decimal * KM_PER_LIGHT_YEAR),
+            distance_au=float(distance_decimal * AU_PER_LIGHT_YEAR),
+            distance_parsec=float(distance_decimal / PARSEC_LY)
+        )
+
+def get_star_kinematics(star):
+    """
+    Return the memoized StarKinematics for a star
+
+    The cache is keyed on the star's catalog values rather than on the
+    object, so a star whose distance, velocity or uncertainties change
+    (e.g. after update_with_real_data.py) automatically gets a fresh entry.
+    It is also keyed on the current decimal_precision, so a thread running
+    at another precision never sees constants rounded for a different one.
+    Least recently used entries are evicted beyond STAR_KINEMATICS_CACHE_SIZE.
+    """
+    return _build_star_kinematics(
+        star.distance_ly,
+        star.radial_velocity_km_s,
+        star.distance_ly_uncertainty,
+        star.radial_velocity_uncertainty_km_s,
+        _decimal_precision.get()
+    )
+
+def clear_star_kinematics_cache():
+    """Drop all memoized StarKinematics (call after reloading catalog data)"""
+    _build_star_kinematics.cache_clear()
+
+def _precision_for_delta(delta_ly_decimal, max_precision=18):
+    """
+    Precision rule of calculate_distance_high_precision without log10
+
+    int(-log10|Δd|) only depends on the decimal exponent of Δd (and on
+    whether Δd is an exact power of ten), so it can be read from
+    Decimal.adjusted() instead of evaluating a 50-digit logarithm.
+    Uses only exact operations, so it does not depend on any context.
+    """
+    magnitude = delta_ly_decimal.copy_abs()
+    if magnitude == 0:
+        return 6
+    exponent = magnitude.adjusted()
+    # Exact power of ten: coefficient 1 followed by zeros (no context rounding involved)
+    leading, *rest = magnitude.as_tuple().digits
+    if (leading == 1 and not any(rest)) or exponent >= 0:
+        digits = -exponent
+    else:
+        digits = -exponent - 1
+    return max(6, min(max_precision, digits + 3))
 
 def calculate_distance_high_precision(star, years_ago, max_precision=18):
     """
@@ -168,7 +306,7 @@ def calculate_distance_high_precision(star, years_ago, max_precision=18):
     where:
         d₀ = base distance (from parallax: d = 1/p)
         v_r = radial velocity (km/s, positive = away, negative = toward)
-        t = time elapsed (years)
+        t = time elapsed (years), t = -years_ago
     
     IMPORTANT NOTES:
     - This is KINEMATIC EXTRAPOLATION, not a direct measurement
@@ -179,7 +317,9 @@ def calculate_distance_high_precision(star, years_ago, max_precision=18):
       * Unaccounted gravitational effects
     - For long-term predictions (centuries+), uncertainty becomes very large
     
-    Uses Decimal for high-precision arithmetic (up to 10^18 decimals)
+    Uses Decimal for high-precision arithmetic (up to 10^18 decimals).
+    The result is returned as a float, which keeps ~16 significant digits;
+    fixed_point.calculate_distance_fixed returns all precision_decimals exactly.
     
     Args:
         star: Star object with distance_ly and radial_velocity_km_s
@@ -189,30 +329,24 @@ def calculate_distance_high_precision(star, years_ago, max_precision=18):
     Returns:
         Tuple of (distance_ly, precision_decimals)
     """
-    years_decimal = Decimal(str(years_ago))
-    days_decimal = years_decimal * DAYS_PER_YEAR
-    seconds_decimal = days_decimal * Decimal(SECONDS_PER_DAY)
-    
-    # Radial velocity in km/s
-    rv_decimal = Decimal(str(star.radial_velocity_km_s))
-    
-    # Distance change in km: Δd = v_r · t
-    delta_km_decimal = rv_decimal * seconds_decimal
-    
-    # Convert to light years
-    delta_ly_decimal = delta_km_decimal / KM_PER_LIGHT_YEAR
-    
-    # Add to initial distance: d(t) = d₀ + Δd
-    initial_distance_decimal = Decimal(str(star.distance_ly))
-    final_distance_decimal = initial_distance_decimal + delta_ly_decimal
+    kinematics = get_star_kinematics(star)
+    with localcontext(decimal_context()):
+        # Elapsed time: the past (years_ago > 0) is t < 0
+        years_decimal = -Decimal(str(years_ago))
+        days_decimal = years_decimal * DAYS_PER_YEAR
+        seconds_decimal = days_decimal * Decimal(SECONDS_PER_DAY)
+
+        # Distance change in km: Δd = v_r · t
+        delta_km_decimal = kinematics.rv_decimal * seconds_decimal
+
+        # Convert to light years
+        delta_ly_decimal = delta_km_decimal / KM_PER_LIGHT_YEAR
+
+        # Add to initial distance: d(t) = d₀ + Δd
+        final_distance_decimal = kinematics.distance_decimal + delta_ly_decimal
     
-    # Determine precision needed
-    if delta_ly_decimal == 0:
-        precision = 6
-    else:
-        # Calculate required precision based on smallest significant change
-        log_value = abs(delta_ly_decimal).log10()
-        precision = max(6, min(max_precision, int(-log_value) + 3))
+    # Determine precision needed from the smallest significant change
+    precision = _precision_for_delta(delta_ly_decimal, max_precision)
     
     # Return with appropriate precision
     return float(final_distance_decimal), precision
@@ -269,20 +403,21 @@ def calculate_distance_uncertainty(star, years_ago):
     Returns:
         Uncertainty in light years
     """
-    if not star.radial_velocity_uncertainty_km_s:
-        return star.distance_ly_uncertainty or 0.0
-    
-    years_decimal = Decimal(str(abs(years_ago)))
-    days_decimal = years_decimal * DAYS_PER_YEAR
-    seconds_decimal = days_decimal * Decimal(SECONDS_PER_DAY)
-    
-    # Uncertainty from radial velocity: σ_d = σ_vr · t
-    rv_uncertainty_decimal = Decimal(str(star.radial_velocity_uncertainty_km_s))
-    delta_km_uncertainty = rv_uncertainty_decimal * seconds_decimal
-    distance_uncertainty_from_rv = float(delta_km_uncertainty / KM_PER_LIGHT_YEAR)
+    kinematics = get_star_kinematics(star)
+    if kinematics.rv_uncertainty_decimal is None:
+        return kinematics.distance_uncertainty_ly
+    
+    with localcontext(decimal_context()):
+        years_decimal = Decimal(str(abs(years_ago)))
+        days_decimal = years_decimal * DAYS_PER_YEAR
+        seconds_decimal = days_decimal * Decimal(SECONDS_PER_DAY)
+
+        # Uncertainty from radial velocity: σ_d = σ_vr · t
+        delta_km_uncertainty = kinematics.rv_uncertainty_decimal * seconds_decimal
+        distance_uncertainty_from_rv = float(delta_km_uncertainty / KM_PER_LIGHT_YEAR)
     
     # Base distance uncertainty (from parallax)
-    base_uncertainty = star.distance_ly_uncertainty or 0.0
+    base_uncertainty = kinematics.distance_uncertainty_ly
     
     # Total uncertainty (quadrature sum for independent errors)
     total_uncertainty = math.sqrt(base_uncertainty**2 + distance_uncertainty_from_rv**2)
@@ -295,8 +430,7 @@ def required_decimals(star, seconds, max_precision=18):
     Calculate required decimal precision based on measurement sensitivity
     NASA standard: up to 10^18 decimal places for extreme precision
     """
-    delta_km = abs(star.radial_velocity_km_s) * seconds
-    delta_ly = km_to_light_year(delta_km)
+    delta_ly = abs(get_star_kinematics(star).rv_ly_per_second) * seconds
     if delta_ly == 0:
         return 6
     # Calculate precision: log10 gives order of magnitude
@@ -393,6 +527,9 @@ def generate_polaris_json_report(star, years_ago=100):
     t_past = t_now - timedelta(days=years_ago * 365.25)
     distance_past = distance_at_time(star, t_now, t_past)
     distance_now = star.distance_ly
+    # Angular distance from the pole of date (precession + nutation)
+    from precession import current_pole_separation
+    pole_separation, pole_separation_rate = current_pole_separation(star, t_now)
     
     report = {
         "Zaman Ölçeği": {
@@ -408,10 +545,12 @@ def generate_polaris_json_report(star, years_ago=100):
             "aciklama": "Polaris, Kuzey Kutbu'na en yakın parlak yıldızdır ve navigasyon için kullanılır."
         },
         "Kuzey Kutbuna Yakınlık": {
-            "açısal_uzaklik_derece": 0.7,
-            "açısal_uzaklik_dakika": 42,
+            "açısal_uzaklik_derece": round(pole_separation, 4),
+            "açısal_uzaklik_dakika": round(pole_separation * 60, 2),
+            "degisim_derece_yil": round(pole_separation_rate, 6),
             "birim": "derece",
-            "aciklama": "Polaris şu anda Kuzey Gök Kutbu'ndan yaklaşık 0.7 derece uzaklıktadır. Bu mesafe zamanla değişmektedir."
+            "hesaplama_yontemi": "IAU 2006 presesyon + IAU 2000B nütasyon (ana terimler), öz hareket dahil",
+            "aciklama": f"{star.name} şu anda Kuzey Gök Kutbu'ndan yaklaşık {pole_separation:.2f} derece uzaklıktadır. Bu mesafe presesyon nedeniyle yılda {abs(pole_separation_rate) * 3600:.1f} açı saniyesi {'azalmaktadır' if pole_separation_rate < 0 else 'artmaktadır'}."
         },
         "Dünya'ya Uzaklık": {
             "guncel_mesafe_ly": round(distance_now, 12),
@@ -436,216 +575,416 @@ def generate_polaris_json_report(star, years_ago=100):
     return report
 
 # STEP 14 — Historical timeline generator (NASA-standard, high precision)
-def generate_historical_polaris_timeline(star, start_year=2025, end_year=-3200, future_year=None, interval_years=100, max_precision=18):
+def iter_arithmetic_distances(star, first_years_ago, step_years, count, max_precision=18, mode="decimal"):
     """
-    Generate Polaris distance report with NASA-standard precision
-    
-    Uses KINEMATIC EXTRAPOLATION for historical/future distances:
-        d(t) = d₀ + v_r · t
-    
-    where:
-        d₀ = base distance from trigonometric parallax (most reliable)
-        v_r = radial velocity (for time-based estimates)
-        t = time difference
-    
-    IMPORTANT NOTES:
-    - Base distance (d₀) comes from trigonometric parallax: d = 1/p
-    - Future/past distances use kinematic extrapolation (radial velocity)
-    - This is valid for SHORT-TERM predictions
-    - Uncertainty grows rapidly with time (see calculate_distance_uncertainty)
-    - For long time periods (centuries+), uncertainty becomes very large
-    
-    Uses high-precision Decimal arithmetic for accuracy up to 10^18 decimals
-    
+    Evaluate evenly spaced epochs incrementally instead of point by point
+
+    For years_ago(i) = first_years_ago + i · step_years the model is linear:
+        d(i) = d(i-1) + Δ,   Δ = -v_r · step_years (in light years)
+        σ(i) = sqrt(σ_d0² + (σ_vr · |years_ago(i)|)²)
+    so Δ is computed once and accumulated, and the uncertainty follows its
+    closed-form curve. No per-point Decimal string round-trips or log10.
+
     Args:
         star: Star object
-        start_year: Reference year (typically current year, e.g., 2025)
-        end_year: End year for historical data (negative for BC, e.g., -3200)
-        future_year: Optional end year for future data (positive, e.g., 2500)
-        interval_years: Interval between data points
+        first_years_ago: Epoch of the first point (negative for future)
+        step_years: Spacing between consecutive epochs (signed)
+        count: Number of points to evaluate
         max_precision: Maximum decimal precision
+        mode: "decimal" (exact Decimal accumulation), "compensated"
+              (float64 with Kahan-compensated accumulation) or "fixed"
+              (exact scaled integers, see fixed_point.py)
+
+    Yields:
+        Tuples of (distance_ly, precision_decimals, uncertainty_ly);
+        distance_ly is a fixed_point.FixedDistance in "fixed" mode
     """
-    
-    t_now = datetime.now(timezone.utc)
-    periods = []
-    
-    # Generate future periods (forward from start_year to future_year)
+    if mode not in ("decimal", "compensated", "fixed"):
+        raise ValueError(f"Unknown evaluation mode: {mode}")
+
+    kinematics = get_star_kinematics(star)
+    first_decimal = Decimal(str(first_years_ago))
+    step_decimal = Decimal(str(step_years))
+    # Bound to this generator: a localcontext() would leak into the consumer at every yield
+    context = decimal_context()
+
+    with localcontext(context):
+        # Same expression as calculate_distance_high_precision for the first point
+        delta = kinematics.rv_decimal * (-first_decimal * DAYS_PER_YEAR * Decimal(SECONDS_PER_DAY)) / KM_PER_LIGHT_YEAR
+        step_delta = kinematics.rate_ly_per_year * -step_decimal
+
+        # Uncertainty: σ_vr converted to light years per year, then σ(t) in closed form
+        base_uncertainty = kinematics.distance_uncertainty_ly
+        if kinematics.rv_uncertainty_decimal is not None:
+            rv_sigma_rate = float(kinematics.rv_uncertainty_decimal * SECONDS_PER_YEAR / KM_PER_LIGHT_YEAR)
+        else:
+            rv_sigma_rate = None
+
+    def uncertainty(i):
+        if rv_sigma_rate is None:
+            return base_uncertainty
+        years = abs(float(context.add(first_decimal, context.multiply(i, step_decimal))))
+        return math.sqrt(base_uncertainty**2 + (rv_sigma_rate * years)**2)
+
+    if mode == "fixed":
+        from fixed_point import iter_fixed_distances
+
+        distances = iter_fixed_distances(star, first_years_ago, step_years, count, max_precision)
+        for i, (distance, precision) in enumerate(distances):
+            yield distance, precision, uncertainty(i)
+        return
+
+    if mode == "decimal":
+        initial_distance_decimal = kinematics.distance_decimal
+        for i in range(count):
+            if i:
+                delta = context.add(delta, step_delta)
+            yield (float(context.add(initial_distance_decimal, delta)),
+                   _precision_for_delta(delta, max_precision),
+                   uncertainty(i))
+        return
+
+    # Compensated float accumulation (Kahan summation of Δ)
+    initial_distance = float(star.distance_ly)
+    delta_float = float(delta)
+    step_float = float(step_delta)
+    compensation = 0.0
+    for i in range(count):
+        if i:
+            y = step_float - compensation
+            t = delta_float + y
+            compensation = (t - delta_float) - y
+            delta_float = t
+        if delta_float == 0:
+            precision = 6
+        else:
+            precision = max(6, min(max_precision, int(-math.log10(abs(delta_float))) + 3))
+        yield initial_distance + delta_float, precision, uncertainty(i)
+
+TIMELINE_CALCULATION_METHOD = "Kinematic extrapolation (d = d₀ + v_r · t)"
+TIMELINE_BASE_DISTANCE_METHOD = "Trigonometric parallax (d = 1/p) from Gaia/Hubble"
+TIMELINE_EXTRAPOLATION_NOTE = "Uncertainty grows with time. Valid for short-term predictions."
+TIMELINE_REFERENCE_NOTE = "Current reference distance from parallax measurement."
+# Grid evaluation strategies of iter_historical_polaris_timeline
+TIMELINE_EVALUATORS = ("decimal", "compensated", "fixed", "direct")
+# Optional period field: exact distance string (evaluator="fixed")
+TIMELINE_EXACT_DISTANCE_FIELD = "distance_ly_exact"
+# Optional period field: angular distance from the north celestial pole of date
+TIMELINE_POLE_SEPARATION_FIELD = "pole_separation_deg"
+POLE_SEPARATION_DECIMALS = 6  # ~0.004 arcsec, below the precession model error
+
+class TimelineStatistics:
+    """
+    Running statistics over a stream of timeline periods
+
+    Keeps only the count and the distance extremes, so statistics for
+    timelines with millions of periods are computed in constant memory.
+    """
+
+    def __init__(self):
+        self.total_periods = 0
+        self.min_distance_ly = None
+        self.max_distance_ly = None
+
+    def add(self, period):
+        """Fold one period dict into the running statistics"""
+        distance = period["distance_ly"]
+        self.total_periods += 1
+        if self.min_distance_ly is None or distance < self.min_distance_ly:
+            self.min_distance_ly = distance
+        if self.max_distance_ly is None or distance > self.max_distance_ly:
+            self.max_distance_ly = distance
+
+    def merge(self, other):
+        """Fold the statistics of another stream (e.g. a shard) into these"""
+        self.total_periods += other.total_periods
+        for distance in (other.min_distance_ly, other.max_distance_ly):
+            if distance is not None:
+                if self.min_distance_ly is None or distance < self.min_distance_ly:
+                    self.min_distance_ly = distance
+                if self.max_distance_ly is None or distance > self.max_distance_ly:
+                    self.max_distance_ly = distance
+
+    def as_dict(self):
+        """Return the statistics block used in timeline reports"""
+        return {
+            "total_periods": self.total_periods,
+            "min_distance_ly": self.min_distance_ly,
+            "max_distance_ly": self.max_distance_ly,
+            "distance_range_ly": self.max_distance_ly - self.min_distance_ly
+        }
+
+def _count_steps(start_year, limit_year, interval_years, direction):
+    """
+    Count grid points start_year + direction·k·interval_years (k ≥ 1) inside the limit
+
+    Historical points (direction = -1) must stay strictly after limit_year,
+    future points (direction = +1) may reach it exactly.
+    """
+    def inside(k):
+        year = start_year + direction * k * interval_years
+        return year > limit_year if direction < 0 else year <= limit_year
+
+    if not inside(1):
+        return 0
+    k = max(0, math.ceil(abs(limit_year - start_year) / interval_years) + 1)
+    while k > 0 and not inside(k):
+        k -= 1
+    while inside(k + 1):
+        k += 1
+    return k
+
+def timeline_period_count(start_year=2025, end_year=-3200, future_year=None, interval_years=100):
+    """
+    Number of periods generate_historical_polaris_timeline will produce
+
+    Computed arithmetically, without generating the periods.
+    """
+    if interval_years <= 0:
+        raise ValueError("interval_years must be positive")
+    count = 1  # Reference year
     if future_year and future_year > start_year:
-        current_year = start_year + interval_years
-        while current_year <= future_year:
-            years_ago = start_year - current_year  # Negative for future
-            
-            # Calculate distance with high precision using Decimal
-            distance, precision = calculate_distance_high_precision(star, years_ago, max_precision)
-            distance_uncertainty = calculate_distance_uncertainty(star, years_ago)
-            
-            period_name = f"{current_year} AD"
-            
-            # Try to create date string for future dates
-            try:
-                if abs(years_ago) <= 36525:  # ~100 years, safe for datetime
-                    t_future = t_now - timedelta(days=years_ago * 365.25)
-                    date_str = t_future.isoformat()
-                else:
-                    date_str = f"Approx. {current_year} (calculated)"
-            except:
-                date_str = f"Approx. {current_year} (calculated)"
-            
-            distance_formatted = float(f"{distance:.{precision}f}")
-            
-            period_data = {
-                "year": current_year,
-                "period": period_name,
-                "years_ago": years_ago,
-                "distance_ly": distance_formatted,
-                "distance_ly_precision": precision,
-                "distance_ly_uncertainty": round(distance_uncertainty, precision) if distance_uncertainty else None,
-                "date": date_str,
-                "calculation_method": "Kinematic extrapolation (d = d₀ + v_r · t)",
-                "base_distance_method": "Trigonometric parallax (d = 1/p) from Gaia/Hubble",
-                "note": "Uncertainty grows with time. Valid for short-term predictions."
-            }
-            
-            periods.append(period_data)
-            current_year += interval_years
-        
-        # Add final future year if not exactly reached
-        if periods and periods[-1]['year'] < future_year:
-            years_ago = start_year - future_year
-            distance, precision = calculate_distance_high_precision(star, years_ago, max_precision)
-            distance_uncertainty = calculate_distance_uncertainty(star, years_ago)
-            distance_formatted = float(f"{distance:.{precision}f}")
-            
-            period_data = {
-                "year": future_year,
-                "period": f"{future_year} AD",
-                "years_ago": years_ago,
-                "distance_ly": distance_formatted,
-                "distance_ly_precision": precision,
-                "distance_ly_uncertainty": round(distance_uncertainty, precision) if distance_uncertainty else None,
-                "date": f"Approx. {future_year} (calculated)",
-                "calculation_method": "Kinematic extrapolation (d = d₀ + v_r · t)",
-                "base_distance_method": "Trigonometric parallax (d = 1/p) from Gaia/Hubble",
-                "note": "Uncertainty grows with time. Valid for short-term predictions."
-            }
-            periods.append(period_data)
-    
-    # Add current/reference year period
-    years_ago = 0
-    distance, precision = calculate_distance_high_precision(star, years_ago, max_precision)
-    distance_uncertainty = calculate_distance_uncertainty(star, years_ago)
-    distance_formatted = float(f"{distance:.{precision}f}")
-    
+        future_steps = _count_steps(start_year, future_year, interval_years, 1)
+        count += future_steps
+        if future_steps and start_year + future_steps * interval_years < future_year:
+            count += 1
+    count += _count_steps(start_year, end_year, interval_years, -1)
+    if start_year > end_year:
+        count += 1
+    return count
+
+def timeline_year_ranges(start_year=2025, end_year=-3200, future_year=None, interval_years=100):
+    """
+    Years of every timeline period, as ranges in timeline order (oldest first)
+
+    Concatenated, the ranges give exactly the "year" values of the periods
+    iter_historical_polaris_timeline yields, so vectorized engines can
+    evaluate a whole timeline grid without generating the periods.
+    """
+    if interval_years <= 0:
+        raise ValueError("interval_years must be positive")
+    ranges = []
+    if start_year > end_year:
+        ranges.append(range(end_year, end_year + 1))
+    historical_steps = _count_steps(start_year, end_year, interval_years, -1)
+    ranges.append(range(start_year - historical_steps * interval_years, start_year, interval_years))
+    ranges.append(range(start_year, start_year + 1))
+    if future_year and future_year > start_year:
+        future_steps = _count_steps(start_year, future_year, interval_years, 1)
+        last_year = start_year + future_steps * interval_years
+        ranges.append(range(start_year + interval_years, last_year + 1, interval_years))
+        if future_steps and last_year < future_year:
+            ranges.append(range(future_year, future_year + 1))
+    return ranges
+
+def _timeline_period(star, year, years_ago, period_name, date_str, max_precision,
+                     note=TIMELINE_EXTRAPOLATION_NOTE, historical_note=None, values=None, evaluator="decimal"):
+    """
+    Build one timeline period dict for the given year
+
+    values: Optional precomputed (distance, precision, uncertainty) tuple;
+    when omitted the point is evaluated directly, with the fixed-point
+    engine for evaluator "fixed" and certified_distance for "direct".
+    A FixedDistance adds "distance_ly_exact".
+    """
+    if values is None and evaluator == "fixed":
+        from fixed_point import calculate_distance_fixed
+
+        distance, precision = calculate_distance_fixed(star, years_ago, max_precision)
+        distance_uncertainty = calculate_distance_uncertainty(star, years_ago)
+    elif values is None and evaluator == "direct":
+        from adaptive_precision import certified_distance
+
+        # Cheapest backend whose rounding to precision decimals is certified
+        result = certified_distance(star, years_ago, max_precision)
+        distance, precision = result.distance_ly, result.precision
+        distance_uncertainty = calculate_distance_uncertainty(star, years_ago)
+    elif values is None:
+        # Calculate distance with high precision using Decimal
+        # This uses kinematic extrapolation: d(t) = d₀ + v_r · t, t = -years_ago
+        distance, precision = calculate_distance_high_precision(star, years_ago, max_precision)
+
+        # Uncertainty grows with time due to radial velocity uncertainty
+        distance_uncertainty = calculate_distance_uncertainty(star, years_ago)
+    else:
+        distance, precision, distance_uncertainty = values
+
+    # Format distance with appropriate precision (up to max_precision)
+    exact_distance = None
+    if isinstance(distance, (int, float)):
+        distance_formatted = float(f"{distance:.{precision}f}")
+    else:
+        # FixedDistance, already rounded to precision decimals
+        exact_distance = str(distance)
+        distance_formatted = float(distance)
+
     period_data = {
-        "year": start_year,
-        "period": f"{start_year} AD",
+        "year": year,
+        "period": period_name,
         "years_ago": years_ago,
         "distance_ly": distance_formatted,
         "distance_ly_precision": precision,
         "distance_ly_uncertainty": round(distance_uncertainty, precision) if distance_uncertainty else None,
-        "date": t_now.isoformat(),
-        "calculation_method": "Kinematic extrapolation (d = d₀ + v_r · t)",
-        "base_distance_method": "Trigonometric parallax (d = 1/p) from Gaia/Hubble",
-        "note": "Current reference distance from parallax measurement."
+        "date": date_str
     }
-    periods.append(period_data)
-    
-    # Generate historical periods (backward from start_year to end_year)
-    current_year = start_year - interval_years
-    while current_year > end_year:
+    if historical_note:
+        period_data["historical_note"] = historical_note
+    period_data["calculation_method"] = TIMELINE_CALCULATION_METHOD
+    period_data["base_distance_method"] = TIMELINE_BASE_DISTANCE_METHOD
+    period_data["note"] = note
+    if exact_distance is not None:
+        period_data[TIMELINE_EXACT_DISTANCE_FIELD] = exact_distance
+    return period_data
+
+def _timeline_date(t_now, year, years_ago):
+    """Date string for a period; exact only within ~100 years of the reference time"""
+    try:
+        if abs(years_ago) <= 36525:  # ~100 years, safe for datetime
+            return (t_now - timedelta(days=years_ago * 365.25)).isoformat()
+    except (OverflowError, ValueError):
+        pass
+    return f"Approx. {year} (calculated)"
+
+def _historical_note(year):
+    """Historical milestone attached to BC periods"""
+    if year <= -3200:
+        return "Invention of writing (cuneiform) by Sumerians"
+    elif year <= -10000:
+        return "Neolithic Revolution - Agriculture begins"
+    elif year <= -300000:
+        return "Homo sapiens appears in Africa"
+    elif year <= -400000:
+        return "Controlled use of fire by early humans"
+    return None
+
+def _grid_values(star, first_years_ago, step_years, count, max_precision, evaluator):
+    """Distance values for evenly spaced grid points (None placeholders when evaluator is direct)"""
+    if evaluator == "direct":
+        return (None for _ in range(count))
+    return iter_arithmetic_distances(star, first_years_ago, step_years, count, max_precision, mode=evaluator)
+
+def iter_historical_polaris_timeline(star, start_year=2025, end_year=-3200, future_year=None, interval_years=100, max_precision=18, reference_time=None, evaluator="decimal", offset=0, limit=None, pole_separation=False):
+    """
+    Yield timeline periods one at a time, already sorted by year (oldest first)
+
+    Produces exactly the periods of generate_historical_polaris_timeline
+    without building or sorting a list, so memory use does not depend on
+    the number of periods. Arguments are the same as for
+    generate_historical_polaris_timeline.
+
+    Args:
+        reference_time: Reference datetime for the "date" fields (default: now)
+        evaluator: How evenly spaced grid points are evaluated:
+            "decimal" - incremental exact Decimal accumulation (default)
+            "compensated" - incremental float64 with Kahan summation
+            "fixed" - incremental exact scaled integers; periods also get
+                "distance_ly_exact", the distance as a decimal string with
+                all distance_ly_precision digits
+            "direct" - adaptive_precision.certified_distance per point
+        offset: Index of the first period to yield (for sharded generation)
+        limit: Maximum number of periods to yield (None for all)
+        pole_separation: Add "pole_separation_deg", the angular distance of
+            the star from the north celestial pole of the period year
+            (precession.py, evaluated in vectorized chunks). The star moves
+            from its catalog position at start_year along the same straight
+            line whose line-of-sight component gives distance_ly
+    """
+    if interval_years <= 0:
+        raise ValueError("interval_years must be positive")
+    if evaluator not in TIMELINE_EVALUATORS:
+        raise ValueError(f"Unknown evaluator: {evaluator}")
+    if pole_separation:
+        from precession import iter_timeline_pole_separations
+
+        periods = iter_historical_polaris_timeline(star, start_year, end_year, future_year, interval_years, max_precision, reference_time, evaluator, offset, limit)
+        separations = iter_timeline_pole_separations(star, start_year, end_year, future_year, interval_years, offset, limit)
+        for period, separation in zip(periods, separations):
+            period[TIMELINE_POLE_SEPARATION_FIELD] = None if separation is None else round(separation, POLE_SEPARATION_DECIMALS)
+            yield period
+        return
+    t_now = reference_time or datetime.now(timezone.utc)
+
+    has_future = bool(future_year and future_year > start_year)
+    historical_steps = _count_steps(start_year, end_year, interval_years, -1)
+    future_steps = _count_steps(start_year, future_year, interval_years, 1) if has_future else 0
+    stop = timeline_period_count(start_year, end_year, future_year, interval_years)
+    if limit is not None:
+        stop = min(stop, offset + limit)
+    position = 0
+
+    def window(size):
+        # Local [lo, hi) range of the next segment that falls inside [offset, stop)
+        nonlocal position
+        lo = min(max(offset - position, 0), size)
+        hi = max(min(stop - position, size), lo)
+        position += size
+        return lo, hi
+
+    # Endpoint at end_year (only when the historical range is not empty)
+    lo, hi = window(1 if start_year > end_year else 0)
+    if lo < hi:
+        yield _timeline_period(
+            star, end_year, start_year - end_year, f"{abs(end_year)} BC",
+            f"Approx. {end_year} (calculated)", max_precision,
+            historical_note="Invention of writing (cuneiform) by Sumerians", evaluator=evaluator
+        )
+
+    # Historical periods, oldest first (years_ago runs k_max·interval → interval)
+    lo, hi = window(historical_steps)
+    first_k = historical_steps - lo
+    values = _grid_values(star, first_k * interval_years, -interval_years, hi - lo, max_precision, evaluator)
+    for k in range(first_k, historical_steps - hi, -1):
+        current_year = start_year - k * interval_years
         years_ago = start_year - current_year
-        
-        # Calculate distance with high precision using Decimal
-        # This uses kinematic extrapolation: d(t) = d₀ + v_r · t
-        distance, precision = calculate_distance_high_precision(star, years_ago, max_precision)
-        
-        # Calculate uncertainty propagation using dedicated function
-        # Uncertainty grows with time due to radial velocity uncertainty
-        distance_uncertainty = calculate_distance_uncertainty(star, years_ago)
-        
-        # Format period name
-        if current_year >= 0:
-            period_name = f"{current_year} AD"
-        else:
-            period_name = f"{abs(current_year)} BC"
-        
-        # Try to create date string, but handle overflow gracefully
-        try:
-            if years_ago <= 36525:  # ~100 years, safe for datetime
-                t_past = t_now - timedelta(days=years_ago * 365.25)
-                date_str = t_past.isoformat()
-            else:
-                date_str = f"Approx. {current_year} (calculated)"
-        except:
-            date_str = f"Approx. {current_year} (calculated)"
-        
-        # Format distance with appropriate precision (up to max_precision)
-        distance_formatted = float(f"{distance:.{precision}f}")
-        
-        period_data = {
-            "year": current_year,
-            "period": period_name,
-            "years_ago": years_ago,
-            "distance_ly": distance_formatted,
-            "distance_ly_precision": precision,
-            "distance_ly_uncertainty": round(distance_uncertainty, precision) if distance_uncertainty else None,
-            "date": date_str,
-            "calculation_method": "Kinematic extrapolation (d = d₀ + v_r · t)",
-            "base_distance_method": "Trigonometric parallax (d = 1/p) from Gaia/Hubble",
-            "note": "Uncertainty grows with time. Valid for short-term predictions."
-        }
-        
+        period_name = f"{current_year} AD" if current_year >= 0 else f"{abs(current_year)} BC"
+        period_data = _timeline_period(
+            star, current_year, years_ago, period_name,
+            _timeline_date(t_now, current_year, years_ago), max_precision,
+            values=next(values), evaluator=evaluator
+        )
         # Add historical milestones
-        if current_year <= -3200:
-            period_data["historical_note"] = "Invention of writing (cuneiform) by Sumerians"
-        elif current_year <= -10000:
-            period_data["historical_note"] = "Neolithic Revolution - Agriculture begins"
-        elif current_year <= -300000:
-            period_data["historical_note"] = "Homo sapiens appears in Africa"
-        elif current_year <= -400000:
-            period_data["historical_note"] = "Controlled use of fire by early humans"
-        
-        periods.append(period_data)
-        current_year -= interval_years
-    
-    # Add the final period at end_year if we haven't reached it exactly
-    if periods and periods[-1]['year'] > end_year:
-        years_ago = start_year - end_year
-        
-        # Calculate distance with high precision (kinematic extrapolation)
-        distance, precision = calculate_distance_high_precision(star, years_ago, max_precision)
-        
-        # Calculate uncertainty using dedicated function
-        distance_uncertainty = calculate_distance_uncertainty(star, years_ago)
-        
-        distance_formatted = float(f"{distance:.{precision}f}")
-        
-        period_data = {
-            "year": end_year,
-            "period": f"{abs(end_year)} BC",
-            "years_ago": years_ago,
-            "distance_ly": distance_formatted,
-            "distance_ly_precision": precision,
-            "distance_ly_uncertainty": round(distance_uncertainty, precision) if distance_uncertainty else None,
-            "date": f"Approx. {end_year} (calculated)",
-            "historical_note": "Invention of writing (cuneiform) by Sumerians",
-            "calculation_method": "Kinematic extrapolation (d = d₀ + v_r · t)",
-            "base_distance_method": "Trigonometric parallax (d = 1/p) from Gaia/Hubble",
-            "note": "Uncertainty grows with time. Valid for short-term predictions."
-        }
-        periods.append(period_data)
-    
-    # Sort periods by year (oldest to newest)
-    periods.sort(key=lambda x: x['year'])
-    
+        historical_note = _historical_note(current_year)
+        if historical_note:
+            period_data["historical_note"] = historical_note
+        yield period_data
+
+    # Current/reference year period
+    lo, hi = window(1)
+    if lo < hi:
+        yield _timeline_period(
+            star, start_year, 0, f"{start_year} AD", t_now.isoformat(), max_precision,
+            note=TIMELINE_REFERENCE_NOTE, evaluator=evaluator
+        )
+
+    # Future periods (forward from start_year to future_year)
+    lo, hi = window(future_steps)
+    values = _grid_values(star, -(lo + 1) * interval_years, -interval_years, hi - lo, max_precision, evaluator)
+    for k in range(lo + 1, hi + 1):
+        current_year = start_year + k * interval_years
+        years_ago = start_year - current_year  # Negative for future
+        yield _timeline_period(
+            star, current_year, years_ago, f"{current_year} AD",
+            _timeline_date(t_now, current_year, years_ago), max_precision,
+            values=next(values), evaluator=evaluator
+        )
+
+    # Final future year if not exactly reached
+    lo, hi = window(1 if future_steps and start_year + future_steps * interval_years < future_year else 0)
+    if lo < hi:
+        yield _timeline_period(
+            star, future_year, start_year - future_year, f"{future_year} AD",
+            f"Approx. {future_year} (calculated)", max_precision, evaluator=evaluator
+        )
+
+def _timeline_report_sections(star, start_year, end_year, future_year, interval_years, max_precision, t_now):
+    """Report blocks that precede and follow the intervals list, in output order"""
     # Determine description based on whether future data is included
     if future_year and future_year > start_year:
         description = f"Distance to Polaris calculated in {interval_years:,}-year intervals from {abs(end_year)} BC to {future_year} AD"
     else:
         description = f"Distance to Polaris calculated in {interval_years:,}-year intervals from {start_year} AD to {abs(end_year)} BC"
-    
-    # NASA-standard metadata
-    report = {
+
+    head = {
         "metadata": {
             "title": "Polaris Distance: Historical Timeline (NASA-Standard)",
             "description": description,
@@ -689,14 +1028,10 @@ def generate_historical_polaris_timeline(star, start_year=2025, end_year=-3200,
             "seconds_per_day": SECONDS_PER_DAY,
             "days_per_julian_year": str(DAYS_PER_YEAR),
             "constants_source": "CODATA 2018 / IAU 2012"
-        },
-        "intervals": periods,
-        "statistics": {
-            "total_periods": len(periods),
-            "min_distance_ly": min(p["distance_ly"] for p in periods),
-            "max_distance_ly": max(p["distance_ly"] for p in periods),
-            "distance_range_ly": max(p["distance_ly"] for p in periods) - min(p["distance_ly"] for p in periods)
-        },
+        }
+    }
+
+    tail = {
         "validation": {
             "acceptance_criteria": {
                 "precision_requirement": f"Minimum {max_precision} decimal places",
@@ -712,9 +1047,368 @@ def generate_historical_polaris_timeline(star, start_year=2025, end_year=-3200,
             }
         }
     }
-    
+    return head, tail
+
+def generate_historical_polaris_timeline(star, start_year=2025, end_year=-3200, future_year=None, interval_years=100, max_precision=18, reference_time=None, evaluator="decimal", compact=False, pole_separation=False):
+    """
+    Generate Polaris distance report with NASA-standard precision
+
+    Uses KINEMATIC EXTRAPOLATION for historical/future distances:
+        d(t) = d₀ + v_r · t
+
+    where:
+        d₀ = base distance from trigonometric parallax (most reliable)
+        v_r = radial velocity (for time-based estimates)
+        t = time elapsed since start_year (negative for past periods)
+
+    IMPORTANT NOTES:
+    - Base distance (d₀) comes from trigonometric parallax: d = 1/p
+    - Future/past distances use kinematic extrapolation (radial velocity)
+    - This is valid for SHORT-TERM predictions
+    - Uncertainty grows rapidly with time (see calculate_distance_uncertainty)
+    - For long time periods (centuries+), uncertainty becomes very large
+
+    Uses high-precision Decimal arithmetic for accuracy up to 10^18 decimals
+
+    The whole report is built in memory. For very long or very fine
+    timelines use iter_historical_polaris_timeline or
+    write_historical_polaris_timeline, which stream the periods instead.
+
+    Args:
+        star: Star object
+        start_year: Reference year (typically current year, e.g., 2025)
+        end_year: End year for historical data (negative for BC, e.g., -3200)
+        future_year: Optional end year for future data (positive, e.g., 2500)
+        interval_years: Interval between data points
+        max_precision: Maximum decimal precision
+        reference_time: Reference datetime for dates (default: now)
+        evaluator: Grid evaluation strategy ("decimal", "compensated",
+            "fixed" or "direct"); see iter_historical_polaris_timeline
+        compact: Return the compact columnar format instead (see
+            compact_timeline_report)
+        pole_separation: Add the angular distance from the north celestial
+            pole to every period; see iter_historical_polaris_timeline
+    """
+
+    t_now = reference_time or datetime.now(timezone.utc)
+    if compact:
+        periods = iter_historical_polaris_timeline(star, start_year, end_year, future_year, interval_years, max_precision, t_now, evaluator, pole_separation=pole_separation)
+        columns, overrides, statistics = compact_timeline_columns(periods, start_year, t_now)
+        return assemble_compact_timeline(star, start_year, end_year, future_year, interval_years, max_precision, t_now, columns, overrides, statistics)
+
+    statistics = TimelineStatistics()
+    periods = []
+    for period in iter_historical_polaris_timeline(star, start_year, end_year, future_year, interval_years, max_precision, t_now, evaluator, pole_separation=pole_separation):
+        statistics.add(period)
+        periods.append(period)
+
+    # NASA-standard metadata
+    head, tail = _timeline_report_sections(star, start_year, end_year, future_year, interval_years, max_precision, t_now)
+    report = dict(head)
+    report["intervals"] = periods
+    report["statistics"] = statistics.as_dict()
+    report.update(tail)
+
     return report
 
+def _json_layout(indent):
+    """Separator, newline and padding helpers shared by the streaming JSON writers"""
+    newline = "\n" if indent is not None else ""
+    item_separator = "," if indent is not None else ", "
+
+    def pad(level):
+        return " " * (indent * level) if indent else ""
+
+    def dump(value, level):
+        text = json.dumps(value, ensure_ascii=False, indent=indent)
+        return text.replace("\n", "\n" + pad(level)) if indent is not None else text
+
+    return newline, item_separator, pad, dump
+
+def iter_timeline_period_json(periods, indent=None, statistics=None, first=True):
+    """
+    Yield the JSON text of timeline periods as elements of the "intervals" array
+
+    Each chunk carries its leading separator, so chunks produced for
+    consecutive slices of a timeline (first=True only for the slice holding
+    period 0) concatenate into the same text as a single run.
+
+    Args:
+        periods: Iterable of period dicts
+        indent: JSON indentation (None for a single line)
+        statistics: Optional TimelineStatistics to fill while serializing
+        first: Whether these periods start the array
+    """
+    newline, item_separator, pad, dump = _json_layout(indent)
+    for period in periods:
+        if statistics is not None:
+            statistics.add(period)
+        yield ("" if first else item_separator) + newline + pad(2) + dump(period, 2)
+        first = False
+
+def iter_historical_polaris_timeline_json(star, start_year=2025, end_year=-3200, future_year=None, interval_years=100, max_precision=18, reference_time=None, indent=None, statistics=None, evaluator="decimal", period_chunks=None, pole_separation=False):
+    """
+    Yield the timeline report as JSON text chunks, one period at a time
+
+    The output is identical to json.dumps(generate_historical_polaris_timeline(...),
+    ensure_ascii=False, indent=indent), but periods are serialized as they
+    are generated and the statistics block is filled from running totals.
+    Suitable as a file writer source or as a streamed HTTP response body.
+
+    Args:
+        indent: JSON indentation (None for a single line)
+        statistics: Optional TimelineStatistics to fill while streaming
+        period_chunks: Optional iterable of already serialized periods from
+            iter_timeline_period_json (e.g. read back from shard files) used
+            instead of generating them; statistics must then already cover them
+        pole_separation: See iter_historical_polaris_timeline
+    """
+    t_now = reference_time or datetime.now(timezone.utc)
+    if period_chunks is not None and statistics is None:
+        raise ValueError("statistics are required with period_chunks")
+    statistics = statistics if statistics is not None else TimelineStatistics()
+    head, tail = _timeline_report_sections(star, start_year, end_year, future_year, interval_years, max_precision, t_now)
+
+    newline, item_separator, pad, dump = _json_layout(indent)
+
+    def key(name, first=False):
+        return ("" if first else item_separator) + newline + pad(1) + json.dumps(name, ensure_ascii=False) + ": "
+
+    yield "{"
+    for i, (name, value) in enumerate(head.items()):
+        yield key(name, first=(i == 0)) + dump(value, 1)
+
+    yield key("intervals") + "["
+    if period_chunks is None:
+        periods = iter_historical_polaris_timeline(star, start_year, end_year, future_year, interval_years, max_precision, t_now, evaluator, pole_separation=pole_separation)
+        period_chunks = iter_timeline_period_json(periods, indent, statistics)
+    yield from period_chunks
+    yield (newline + pad(1) if statistics.total_periods else "") + "]"
+
+    yield key("statistics") + dump(statistics.as_dict(), 1)
+    for name, value in tail.items():
+        yield key(name) + dump(value, 1)
+    yield newline + "}"
+
+def write_historical_polaris_timeline(star, output_file, start_year=2025, end_year=-3200, future_year=None, interval_years=100, max_precision=18, reference_time=None, indent=None, evaluator="decimal", period_chunks=None, statistics=None, pole_separation=False):
+    """
+    Stream a timeline report straight to a JSON file in constant memory
+
+    Args:
+        output_file: Path or writable text file object
+        period_chunks, statistics: Already serialized periods and their
+            statistics (see iter_historical_polaris_timeline_json)
+        (other arguments as for generate_historical_polaris_timeline)
+
+    Returns:
+        TimelineStatistics for the written timeline
+    """
+    if statistics is None and period_chunks is None:
+        statistics = TimelineStatistics()
+    chunks = iter_historical_polaris_timeline_json(
+        star, start_year, end_year, future_year, interval_years, max_precision,
+        reference_time, indent=indent, statistics=statistics, evaluator=evaluator,
+        period_chunks=period_chunks, pole_separation=pole_separation
+    )
+    if hasattr(output_file, "write"):
+        output_file.writelines(chunks)
+    else:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.writelines(chunks)
+    return statistics
+
+# Compact timeline format: shared period fields hoisted once, columnar values
+TIMELINE_COMPACT_FORMAT = "polaris-timeline-compact/1"
+TIMELINE_COMPACT_COLUMNS = ("year", "distance_ly", "distance_ly_precision", "distance_ly_uncertainty")
+# Optional columns, present when the timeline was generated with evaluator="fixed" / pole_separation=True
+TIMELINE_COMPACT_OPTIONAL_COLUMNS = (TIMELINE_EXACT_DISTANCE_FIELD, TIMELINE_POLE_SEPARATION_FIELD)
+TIMELINE_PERIOD_DEFAULTS = {
+    "calculation_method": TIMELINE_CALCULATION_METHOD,
+    "base_distance_method": TIMELINE_BASE_DISTANCE_METHOD,
+    "note": TIMELINE_EXTRAPOLATION_NOTE
+}
+
+def _period_name(year):
+    """Display name of a period year, e.g. 3200 BC or 2025 AD"""
+    return f"{year} AD" if year >= 0 else f"{abs(year)} BC"
+
+def _derived_period_fields(year, years_ago, t_now):
+    """Period fields a compact timeline does not store, as derived from the year"""
+    return {
+        "period": _period_name(year),
+        "date": _timeline_date(t_now, year, years_ago),
+        "historical_note": _historical_note(year) if years_ago > 0 else None
+    }
+
+def compact_timeline_columns(periods, start_year, reference_time, first_index=0):
+    """
+    Collect the columnar values and per-period exceptions of a compact timeline
+
+    Works on any consecutive slice of a timeline, so shards generated in
+    separate processes can be compacted independently and concatenated.
+
+    Args:
+        periods: Iterable of period dicts
+        start_year: Reference year of the timeline
+        reference_time: Reference datetime of the timeline
+        first_index: Index of the first period within the whole timeline
+
+    Returns:
+        Tuple of (columns dict of lists, overrides dict keyed by period
+        index, TimelineStatistics)
+    """
+    statistics = TimelineStatistics()
+    columns = {name: [] for name in TIMELINE_COMPACT_COLUMNS}
+    overrides = {}
+
+    for index, period in enumerate(periods, first_index):
+        statistics.add(period)
+        if index == first_index:
+            columns.update((name, []) for name in TIMELINE_COMPACT_OPTIONAL_COLUMNS if name in period)
+        for name, values in columns.items():
+            values.append(period[name])
+
+        # Record only what differs from the derived and shared values
+        expected = _derived_period_fields(period["year"], start_year - period["year"], reference_time)
+        expected.update(TIMELINE_PERIOD_DEFAULTS)
+        override = {
+            name: period.get(name)
+            for name, value in expected.items()
+            if period.get(name) != value
+        }
+        if period["years_ago"] != start_year - period["year"]:
+            override["years_ago"] = period["years_ago"]
+        if override:
+            overrides[str(index)] = override
+
+    return columns, overrides, statistics
+
+def _assemble_compact_timeline(head, tail, columns, overrides, statistics):
+    """Put report sections and compact period data together in output order"""
+    compact = {"format": TIMELINE_COMPACT_FORMAT}
+    compact.update(head)
+    compact["period_defaults"] = dict(TIMELINE_PERIOD_DEFAULTS)
+    compact["columns"] = columns
+    compact["period_overrides"] = overrides
+    compact["statistics"] = statistics.as_dict()
+    compact.update(tail)
+    return compact
+
+def assemble_compact_timeline(star, start_year, end_year, future_year, interval_years, max_precision, reference_time, columns, overrides, statistics):
+    """
+    Build a compact timeline from period data collected with compact_timeline_columns
+
+    Args:
+        columns, overrides, statistics: Compact period data of the whole timeline
+        (other arguments as for generate_historical_polaris_timeline)
+    """
+    head, tail = _timeline_report_sections(star, start_year, end_year, future_year, interval_years, max_precision, reference_time)
+    return _assemble_compact_timeline(head, tail, columns, overrides, statistics)
+
+def compact_timeline_report(report):
+    """
+    Convert a full timeline report into the compact columnar format
+
+    The compact format stores each section of the report once, the shared
+    per-period strings once in "period_defaults", the numeric values as
+    parallel arrays in "columns" and only the exceptions (reference year
+    note, extrapolated dates, ...) in "period_overrides", keyed by period
+    index. Period names, years_ago, dates and historical notes are derived
+    from the year. expand_compact_timeline restores the full report.
+
+    Args:
+        report: Dict returned by generate_historical_polaris_timeline
+
+    Returns:
+        Compact timeline dict
+    """
+    head = {name: report[name] for name in ("metadata", "star", "time_span", "physical_constants")}
+    columns, overrides, statistics = compact_timeline_columns(
+        report["intervals"], report["time_span"]["start_year"],
+        datetime.fromisoformat(report["metadata"]["calculation_date"])
+    )
+    return _assemble_compact_timeline(head, {"validation": report["validation"]}, columns, overrides, statistics)
+
+def expand_compact_timeline(compact):
+    """
+    Restore the full timeline report from the compact format
+
+    Args:
+        compact: Dict produced by compact_timeline_report
+
+    Returns:
+        Dict identical to the report generate_historical_polaris_timeline returns
+    """
+    if compact.get("format") != TIMELINE_COMPACT_FORMAT:
+        raise ValueError(f"Unsupported timeline format: {compact.get('format')}")
+    start_year = compact["time_span"]["start_year"]
+    t_now = datetime.fromisoformat(compact["metadata"]["calculation_date"])
+    defaults = compact["period_defaults"]
+    overrides = compact["period_overrides"]
+    columns = compact["columns"]
+
+    periods = []
+    for index, values in enumerate(zip(*(columns[name] for name in TIMELINE_COMPACT_COLUMNS))):
+        fields = _derived_period_fields(values[0], start_year - values[0], t_now)
+        fields.update(defaults)
+        fields["years_ago"] = start_year - values[0]
+        fields.update(overrides.get(str(index), {}))
+        period = {
+            "year": values[0],
+            "period": fields["period"],
+            "years_ago": fields["years_ago"],
+            "distance_ly": values[1],
+            "distance_ly_precision": values[2],
+            "distance_ly_uncertainty": values[3],
+            "date": fields["date"]
+        }
+        if fields["historical_note"]:
+            period["historical_note"] = fields["historical_note"]
+        period["calculation_method"] = fields["calculation_method"]
+        period["base_distance_method"] = fields["base_distance_method"]
+        period["note"] = fields["note"]
+        for name in TIMELINE_COMPACT_OPTIONAL_COLUMNS:
+            if name in columns:
+                period[name] = columns[name][index]
+        periods.append(period)
+
+    report = {name: compact[name] for name in ("metadata", "star", "time_span", "physical_constants")}
+    report["intervals"] = periods
+    report["statistics"] = compact["statistics"]
+    report["validation"] = compact["validation"]
+    return report
+
+def write_compact_timeline(compact, output_file, compression=("gzip", "br")):
+    """
+    Write a compact timeline as minified JSON plus pre-compressed siblings
+
+    Siblings are written next to output_file as output_file + ".gz" and
+    + ".br", ready for static file servers that serve pre-compressed
+    assets. Brotli is skipped when the brotli package is not installed.
+    Gzip output is reproducible (no timestamp in the header).
+
+    Args:
+        compact: Compact timeline dict (see compact_timeline_report)
+        output_file: Path of the JSON file
+        compression: Encodings to write ("gzip" and/or "br")
+
+    Returns:
+        List of written file paths
+    """
+    body = json.dumps(compact, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    written = [output_file]
+    with open(output_file, 'wb') as f:
+        f.write(body)
+    if "gzip" in compression:
+        with open(output_file + ".gz", 'wb') as f:
+            f.write(gzip.compress(body, compresslevel=9, mtime=0))
+        written.append(output_file + ".gz")
+    if "br" in compression and BROTLI_AVAILABLE:
+        with open(output_file + ".br", 'wb') as f:
+            f.write(brotli.compress(body, mode=brotli.MODE_TEXT, quality=11))
+        written.append(output_file + ".br")
+    return written
+
 # STEP 15 — Run
 if __name__ == "__main__":
     # Generate and save JSON report
@@ -756,13 +1450,15 @@ if __name__ == "__main__":
     print(f"Reference frame: {NASA_REFERENCE_FRAME}")
     print(f"Epoch: {NASA_EPOCH}")
     
-    timeline_100 = generate_historical_polaris_timeline(POLARIS, start_year=2025, end_year=-3200, future_year=2500, interval_years=100, max_precision=18)
+    timeline_100 = generate_historical_polaris_timeline(POLARIS, start_year=2025, end_year=-3200, future_year=2500, interval_years=100, max_precision=18, pole_separation=True)
     
     timeline_file_100 = "polaris_100years.json"
     with open(timeline_file_100, 'w', encoding='utf-8') as f:
         json.dump(timeline_100, f, ensure_ascii=False, indent=2)
+    compact_files_100 = write_compact_timeline(compact_timeline_report(timeline_100), "polaris_100years.compact.json")
     
     print(f"\n100-year timeline saved to '{timeline_file_100}'")
+    print(f"Compact format: {', '.join(compact_files_100)}")
     print(f"Total periods: {timeline_100['statistics']['total_periods']}")
     print(f"Time span: {timeline_100['time_span']['total_years']:,} years")
     if timeline_100['time_span'].get('future_year'):
@@ -788,13 +1484,15 @@ if __name__ == "__main__":
     print(f"Reference frame: {NASA_REFERENCE_FRAME}")
     print(f"Epoch: {NASA_EPOCH}")
     
-    timeline_10 = generate_historical_polaris_timeline(POLARIS, start_year=2025, end_year=-3200, future_year=2500, interval_years=10, max_precision=18)
+    timeline_10 = generate_historical_polaris_timeline(POLARIS, start_year=2025, end_year=-3200, future_year=2500, interval_years=10, max_precision=18, pole_separation=True)
     
     timeline_file_10 = "polaris_10years.json"
     with open(timeline_file_10, 'w', encoding='utf-8') as f:
         json.dump(timeline_10, f, ensure_ascii=False, indent=2)
+    compact_files_10 = write_compact_timeline(compact_timeline_report(timeline_10), "polaris_10years.compact.json")
     
     print(f"\n10-year timeline saved to '{timeline_file_10}'")
+    print(f"Compact format: {', '.join(compact_files_10)}")
     print(f"Total periods: {timeline_10['statistics']['total_periods']}")
     print(f"Time span: {timeline_10['time_span']['total_years']:,} years")
     if timeline_10['time_span'].get('future_year'):
@@ -0,0 +1,238 @@
+"""
+Polaris Pole Star Scan
+Which catalog star is closest to the north celestial pole, epoch by epoch
+
+Precession carries the pole around a 23.4° circle in ~25,800 years, so
+"the pole star" changes: Thuban when the pyramids were built, Polaris
+today, then Gamma Cephei, Alderamin, Deneb and Vega around AD 14,000.
+
+pole_star_scan answers this for a whole catalog over tens of thousands of
+years. Epochs are processed in blocks: for every block the stars are
+moved (space_motion) to the middle of the block and put in a SkyIndex,
+the pole of date is computed for all epochs of the block at once
+(precession), and only the stars near the pole's path are evaluated
+exactly. The search radius is widened until it provably contains the
+nearest star at every epoch, so the result equals a brute-force
+stars × epochs scan.
+
+Run:
+    python pole_stars.py --start-year -20000 --end-year 20000 --step 10
+"""
+
+import argparse
+import sys
+
+import numpy as np
+
+from catalog_stream import open_table, stream_into_catalog
+from polaris import POLARIS, Star
+from popular_stars import POPULAR_STARS
+from precession import CATALOG_EPOCH, MODELS, celestial_pole
+from sky_index import SkyIndex
+from space_motion import state_vectors
+from star_catalog import StarCatalog
+
+# Bright stars near the precession circle that are not among the popular stars (Hipparcos, J2000)
+POLE_STAR_CANDIDATES = StarCatalog.from_stars([
+    Star(name="Gamma Cephei", catalog_id="HIP 116727", distance_ly=46.0, radial_velocity_km_s=-42.4,
+         distance_ly_uncertainty=0.1, ra_hours=23.655792, dec_degrees=77.632278,
+         proper_motion_ra_mas_yr=-64.09, proper_motion_dec_mas_yr=149.84,
+         spectral_type="K1III-IV", magnitude=3.21),
+    Star(name="Thuban", catalog_id="HIP 68756", distance_ly=309.0, radial_velocity_km_s=-13.0,
+         distance_ly_uncertainty=6.0, ra_hours=14.073153, dec_degrees=64.375850,
+         proper_motion_ra_mas_yr=-56.52, proper_motion_dec_mas_yr=17.19,
+         spectral_type="A0III", magnitude=3.65),
+    Star(name="Alderamin", catalog_id="HIP 105199", distance_ly=49.05, radial_velocity_km_s=-10.0,
+         distance_ly_uncertainty=0.1, ra_hours=21.309658, dec_degrees=62.585575,
+         proper_motion_ra_mas_yr=150.55, proper_motion_dec_mas_yr=49.09,
+         spectral_type="A8Vn", magnitude=2.45),
+    Star(name="Kochab", catalog_id="HIP 72607", distance_ly=130.9, radial_velocity_km_s=16.96,
+         distance_ly_uncertainty=0.6, ra_hours=14.845092, dec_degrees=74.155503,
+         proper_motion_ra_mas_yr=-32.61, proper_motion_dec_mas_yr=11.42,
+         spectral_type="K4III", magnitude=2.08),
+    Star(name="Delta Cygni", catalog_id="HIP 97165", distance_ly=165.0, radial_velocity_km_s=-20.0,
+         distance_ly_uncertainty=1.5, ra_hours=19.749578, dec_degrees=45.130806,
+         proper_motion_ra_mas_yr=43.22, proper_motion_dec_mas_yr=48.44,
+         spectral_type="B9.5III", magnitude=2.87),
+    Star(name="Iota Herculis", catalog_id="HIP 86414", distance_ly=455.0, radial_velocity_km_s=-20.0,
+         distance_ly_uncertainty=15.0, ra_hours=17.657747, dec_degrees=46.006333,
+         proper_motion_ra_mas_yr=-7.48, proper_motion_dec_mas_yr=3.88,
+         spectral_type="B3IV", magnitude=3.80)
+])
+
+DEFAULT_BLOCK_YEARS = 500
+# Stars moving more than this (radians) within a block bypass the index
+FAST_DRIFT = np.radians(0.1)
+
+
+def default_catalog():
+    """Polaris, the popular stars and POLE_STAR_CANDIDATES in one catalog"""
+    catalog = StarCatalog.from_stars([POLARIS])
+    catalog.extend(POPULAR_STARS.to_stars())
+    catalog.extend(POLE_STAR_CANDIDATES.to_stars())
+    return catalog
+
+
+def _directions(catalog):
+    """
+    Positions, velocities and an eligibility mask for the scan
+
+    Stars with RA/Dec but no distance keep their catalog direction (no
+    proper motion can be applied without a distance).
+    """
+    position, velocity, has_direction = state_vectors(catalog)
+    no_distance = has_direction & ~np.isfinite(position).all(axis=1)
+    if no_distance.any():
+        ra = np.radians(catalog.column("ra_hours")[no_distance] * 15.0)
+        dec = np.radians(catalog.column("dec_degrees")[no_distance])
+        position[no_distance] = np.stack([np.cos(dec) * np.cos(ra), np.cos(dec) * np.sin(ra), np.sin(dec)], axis=1)
+        velocity[no_distance] = 0.0
+    return position, velocity, has_direction
+
+
+def _unit(vectors):
+    return vectors / np.linalg.norm(vectors, axis=-1, keepdims=True)
+
+
+def _separations(position, velocity, years, poles, catalog_epoch):
+    """Exact separations (radians) of some stars from the poles of some epochs, shape (n_stars, n_epochs)"""
+    t = (years - catalog_epoch)[np.newaxis, :, np.newaxis]
+    r = position[:, np.newaxis, :] + velocity[:, np.newaxis, :] * t
+    dot = np.einsum("sek,ek->se", r, poles)
+    cross = np.linalg.norm(np.cross(r, poles[np.newaxis, :, :]), axis=-1)
+    return np.arctan2(cross, dot)
+
+
+def pole_star_scan(stars=None, start_year=-20000, end_year=20000, step_years=10, block_years=DEFAULT_BLOCK_YEARS,
+                   max_magnitude=None, catalog_epoch=CATALOG_EPOCH, model="auto"):
+    """
+    Closest star to the north celestial pole at every epoch
+
+    Args:
+        stars: Sequence of Star objects or a StarCatalog (default: default_catalog())
+        start_year, end_year: First and last epoch (Julian years, negative for BC)
+        step_years: Spacing of the epochs
+        block_years: Epoch span sharing one SkyIndex
+        max_magnitude: Only consider stars at least this bright (None for all)
+        catalog_epoch: Epoch of the catalog RA/Dec
+        model: Pole of date model (see precession.celestial_pole)
+
+    Returns:
+        Dict with arrays over epochs: "year", "star_index" (row in the
+        catalog, -1 when no star is eligible), "name" (list) and
+        "separation_deg"
+    """
+    if step_years <= 0 or block_years <= 0:
+        raise ValueError("step_years and block_years must be positive")
+    catalog = default_catalog() if stars is None else stars
+    if not hasattr(catalog, "column"):
+        catalog = StarCatalog.from_stars(catalog)
+    years = np.arange(start_year, end_year + step_years / 2, step_years, dtype=np.float64)
+
+    position, velocity, eligible = _directions(catalog)
+    if max_magnitude is not None:
+        eligible &= catalog.column("magnitude") <= max_magnitude
+    rows = np.flatnonzero(eligible)
+    position, velocity = position[rows], velocity[rows]
+
+    best = np.full(len(years), -1, dtype=np.int64)
+    separation = np.full(len(years), np.nan)
+    block_size = max(int(block_years // step_years), 1)
+    blocks = range(0, len(years), block_size) if len(rows) else ()
+    for first in blocks:
+        block = years[first:first + block_size]
+        poles = celestial_pole(block, model)
+
+        # Stars at the middle of the block, and how far each of them moves within it
+        middle = _unit(position + velocity * ((block[0] + block[-1]) / 2 - catalog_epoch))
+        drift = np.zeros(len(rows))
+        for edge in (block[0], block[-1]):
+            moved = _unit(position + velocity * (edge - catalog_epoch))
+            drift = np.maximum(drift, np.arccos(np.clip(np.einsum("sk,sk->s", middle, moved), -1.0, 1.0)))
+
+        # Fast movers (nearby stars, long blocks) would blow up the search
+        # radius for everyone: they are always evaluated instead of indexed
+        fast = drift > FAST_DRIFT
+        slow = np.flatnonzero(~fast)
+        index = SkyIndex(middle[slow, 0], middle[slow, 1], middle[slow, 2])
+        slow_drift = float(drift[slow].max()) if len(slow) else 0.0
+
+        # Cap around the pole's path within the block
+        center = _unit(poles.mean(axis=0))
+        path = float(np.arccos(np.clip(poles @ center, -1.0, 1.0)).max())
+
+        # A star within radius of a pole of the block lies within radius + path + drift of center
+        radius = np.sqrt(4 * np.pi / (index.n_zones * index.n_phi))
+        while True:
+            candidates = np.concatenate([slow[index.query_cap(center, radius + path + slow_drift)],
+                                         np.flatnonzero(fast)])
+            if len(candidates):
+                angles = _separations(position[candidates], velocity[candidates], block, poles, catalog_epoch)
+                nearest = angles.argmin(axis=0)
+                closest = angles[nearest, np.arange(len(block))]
+                if closest.max() <= radius or len(candidates) == len(rows):
+                    break
+            radius *= 2
+        best[first:first + len(block)] = rows[candidates[nearest]]
+        separation[first:first + len(block)] = np.degrees(closest)
+
+    names, codes = catalog.strings("name"), catalog.column("name")
+    return {
+        "year": years,
+        "star_index": best,
+        "name": [names.lookup(codes[i]) if i >= 0 else None for i in best.tolist()],
+        "separation_deg": separation,
+    }
+
+
+def pole_star_succession(scan):
+    """
+    Collapse a scan into consecutive pole star reigns
+
+    Args:
+        scan: Dict returned by pole_star_scan
+
+    Returns:
+        List of dicts: "name", "from_year", "to_year", "closest_year",
+        "closest_separation_deg" (in time order)
+    """
+    star_index = scan["star_index"]
+    if not len(star_index):
+        return []
+    changes = np.flatnonzero(np.diff(star_index)) + 1
+    reigns = []
+    for lo, hi in zip(np.concatenate([[0], changes]), np.concatenate([changes, [len(star_index)]])):
+        closest = lo + int(np.argmin(scan["separation_deg"][lo:hi]))
+        reigns.append({
+            "name": scan["name"][lo],
+            "from_year": float(scan["year"][lo]),
+            "to_year": float(scan["year"][hi - 1]),
+            "closest_year": float(scan["year"][closest]),
+            "closest_separation_deg": float(scan["separation_deg"][closest]),
+        })
+    return reigns
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Closest star to the north celestial pole over time")
+    parser.add_argument("--catalog", default=None, help="Catalog file (.vot, .xml, .csv, .tsv; default: built-in stars)")
+    parser.add_argument("--start-year", type=int, default=-20000)
+    parser.add_argument("--end-year", type=int, default=20000)
+    parser.add_argument("--step", type=int, default=10, help="Years between epochs")
+    parser.add_argument("--block", type=int, default=DEFAULT_BLOCK_YEARS, help="Years per index rebuild")
+    parser.add_argument("--max-magnitude", type=float, default=None, help="Faintest magnitude considered")
+    parser.add_argument("--model", choices=MODELS, default="auto")
+    args = parser.parse_args(argv)
+
+    stars = stream_into_catalog(open_table(args.catalog))["catalog"] if args.catalog else None
+    scan = pole_star_scan(stars, args.start_year, args.end_year, args.step, args.block,
+                          args.max_magnitude, model=args.model)
+    print(f"{'Pole star':<20}{'From':>10}{'To':>10}{'Closest':>10}{'Separation':>12}")
+    for reign in pole_star_succession(scan):
+        print(f"{reign['name'] or '-':<20}{reign['from_year']:>10g}{reign['to_year']:>10g}"
+              f"{reign['closest_year']:>10g}{reign['closest_separation_deg']:>11.3f}°")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
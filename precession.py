@@ -0,0 +1,294 @@
+"""
+Polaris Precession Engine
+Vectorized position of the north celestial pole and its distance to stars
+
+Polaris is the pole star only for now: precession moves the celestial
+pole around the ecliptic pole once every ~25,800 years. This module
+computes the pole of date as a unit vector in ICRS for arrays of epochs,
+and the angular separation of any star from it, vectorized over both the
+epochs and the catalog.
+
+- Within POLYNOMIAL_VALID_YEARS of J2000 the IAU 2006 precession
+  (Fukushima-Williams angles, Capitaine et al. 2003 polynomials) is used,
+  plus the four largest terms of the IAU 2000B nutation series.
+- Further out the polynomials diverge, so the pole moves uniformly on a
+  circle of radius ε₀ around the J2000 ecliptic pole at the IAU 2006
+  general precession rate. Ignoring the motion of the ecliptic limits
+  this to ~1° at ±10,000 years; it is meant for "which star is the pole
+  star" questions, not astrometry.
+- Between POLYNOMIAL_VALID_YEARS and BLEND_YEARS the two are blended, so
+  the pole moves continuously.
+
+Star positions at each epoch come from space_motion (proper motion and
+radial velocity), with the catalog values taken at J2000.0.
+
+Run:
+    python precession.py Polaris Vega Deneb --years -3000 2025 14000
+"""
+
+import argparse
+from datetime import datetime, timezone
+import sys
+
+import numpy as np
+
+from popular_stars import STAR_INDEX
+from space_motion import positions
+
+ARCSEC = np.pi / (180.0 * 3600.0)
+
+# Epoch of the catalog positions (Julian years)
+CATALOG_EPOCH = 2000.0
+
+# IAU 2006 polynomials are used up to this many years from J2000 ...
+POLYNOMIAL_VALID_YEARS = 1000.0
+# ... and fully replaced by the long-term model beyond this many
+BLEND_YEARS = 2000.0
+
+# IAU 2006 obliquity at J2000 and general precession in longitude (arcsec, arcsec/century)
+OBLIQUITY_J2000 = 84381.406
+GENERAL_PRECESSION = 5028.796195
+
+# Pole of date models
+MODELS = ("auto", "iau2006", "long_term")
+
+
+def fukushima_williams_angles(t):
+    """
+    IAU 2006 Fukushima-Williams precession angles (radians)
+
+    Args:
+        t: Julian centuries since J2000 (array)
+
+    Returns:
+        Tuple (gamma_bar, phi_bar, psi_bar, epsilon_A)
+    """
+    gamb = (-0.052928 + (10.556378 + (0.4932044 + (-0.00031238 + (-0.000002788 + 0.0000000260 * t)
+                                                   * t) * t) * t) * t) * ARCSEC
+    phib = (84381.412819 + (-46.811016 + (0.0511268 + (0.00053289 + (-0.000000440 - 0.0000000176 * t)
+                                                      * t) * t) * t) * t) * ARCSEC
+    psib = (-0.041775 + (5038.481484 + (1.5584175 + (-0.00018522 + (-0.000026452 - 0.0000000148 * t)
+                                                     * t) * t) * t) * t) * ARCSEC
+    epsa = (OBLIQUITY_J2000 + (-46.836769 + (-0.0001831 + (0.00200340 + (-0.000000576 - 0.0000000434 * t)
+                                                           * t) * t) * t) * t) * ARCSEC
+    return gamb, phib, psib, epsa
+
+
+def nutation(t):
+    """
+    Nutation in longitude and obliquity (radians), four largest IAU 2000B terms
+
+    Accurate to ~0.5 arcsec, which is plenty for pole separations.
+
+    Args:
+        t: Julian centuries since J2000 (array)
+
+    Returns:
+        Tuple (delta_psi, delta_epsilon)
+    """
+    # Mean elongation of the Moon, Moon's argument of latitude, longitude of its ascending node
+    d = np.radians(297.85036306 + 445267.1114800 * t)
+    f = np.radians(93.27209062 + 483202.0175273 * t)
+    omega = np.radians(125.04455501 - 1934.1362891 * t)
+    a1, a2, a3 = omega, 2 * (f - d + omega), 2 * (f + omega)
+    a4 = 2 * omega
+    dpsi = -17.2064161 * np.sin(a1) - 1.3170907 * np.sin(a2) - 0.2276413 * np.sin(a3) + 0.2074554 * np.sin(a4)
+    deps = 9.2052331 * np.cos(a1) + 0.5730336 * np.cos(a2) + 0.0978459 * np.cos(a3) - 0.0897492 * np.cos(a4)
+    return dpsi * ARCSEC, deps * ARCSEC
+
+
+def _rotation_x(angle):
+    c, s = np.cos(angle), np.sin(angle)
+    one, zero = np.ones_like(angle), np.zeros_like(angle)
+    return np.stack([np.stack([one, zero, zero], -1),
+                     np.stack([zero, c, s], -1),
+                     np.stack([zero, -s, c], -1)], -2)
+
+
+def _rotation_z(angle):
+    c, s = np.cos(angle), np.sin(angle)
+    one, zero = np.ones_like(angle), np.zeros_like(angle)
+    return np.stack([np.stack([c, s, zero], -1),
+                     np.stack([-s, c, zero], -1),
+                     np.stack([zero, zero, one], -1)], -2)
+
+
+def iau2006_pole(t, with_nutation=True):
+    """
+    Pole of date in ICRS from the IAU 2006 precession (and nutation)
+
+    The pole is the third row of the bias-precession(-nutation) matrix
+    R1(-ε) · R3(-ψ) · R1(φ̄) · R3(γ̄).
+
+    Args:
+        t: Julian centuries since J2000 (1-D array)
+        with_nutation: Add the truncated nutation (true pole instead of mean pole)
+
+    Returns:
+        Array (n_epochs, 3) of unit vectors
+    """
+    gamb, phib, psib, epsa = fukushima_williams_angles(t)
+    if with_nutation:
+        dpsi, deps = nutation(t)
+        psib, epsa = psib + dpsi, epsa + deps
+    matrix = _rotation_x(-epsa) @ _rotation_z(-psib) @ _rotation_x(phib) @ _rotation_z(gamb)
+    return matrix[:, 2, :]
+
+
+def long_term_pole(t):
+    """
+    Pole of date in ICRS from uniform precession around the J2000 ecliptic pole
+
+    Args:
+        t: Julian centuries since J2000 (1-D array)
+
+    Returns:
+        Array (n_epochs, 3) of unit vectors
+    """
+    obliquity = OBLIQUITY_J2000 * ARCSEC
+    angle = -GENERAL_PRECESSION * ARCSEC * t
+    # Rodrigues rotation of the J2000 pole (0, 0, 1) about the ecliptic pole k
+    k = np.array([0.0, -np.sin(obliquity), np.cos(obliquity)])
+    pole = np.array([0.0, 0.0, 1.0])
+    cos_a, sin_a = np.cos(angle)[:, np.newaxis], np.sin(angle)[:, np.newaxis]
+    return pole * cos_a + np.cross(k, pole) * sin_a + k * k[2] * (1.0 - cos_a)
+
+
+def celestial_pole(years, model="auto", with_nutation=True):
+    """
+    North celestial pole of date as ICRS unit vectors
+
+    Args:
+        years: Scalar or 1-D array of epochs (Julian years, e.g. 2025.0, -3000.0)
+        model: "auto" (IAU 2006 near J2000, long-term model far from it),
+            "iau2006" or "long_term"
+        with_nutation: Include nutation in the IAU 2006 model
+
+    Returns:
+        Array (n_epochs, 3)
+    """
+    if model not in MODELS:
+        raise ValueError(f"Unknown precession model: {model}")
+    years = np.atleast_1d(np.asarray(years, dtype=np.float64))
+    if years.ndim != 1:
+        raise ValueError("years must be a scalar or a 1-D array")
+    t = (years - 2000.0) / 100.0
+    if model == "iau2006":
+        return iau2006_pole(t, with_nutation)
+    if model == "long_term":
+        return long_term_pole(t)
+
+    weight = np.clip((np.abs(years - 2000.0) - POLYNOMIAL_VALID_YEARS) / (BLEND_YEARS - POLYNOMIAL_VALID_YEARS),
+                     0.0, 1.0)
+    pole = long_term_pole(t)
+    near = weight < 1.0
+    if near.any():
+        blended = (1.0 - weight[near, np.newaxis]) * iau2006_pole(t[near], with_nutation) \
+            + weight[near, np.newaxis] * pole[near]
+        pole[near] = blended / np.linalg.norm(blended, axis=1)[:, np.newaxis]
+    return pole
+
+
+def pole_separation(stars, years, catalog_epoch=CATALOG_EPOCH, model="auto", with_nutation=True):
+    """
+    Angular distance (degrees) of every star from the north celestial pole of date
+
+    Star positions are propagated from catalog_epoch with space_motion, so
+    proper motion is included.
+
+    Args:
+        stars: Sequence of Star objects or a StarCatalog
+        years: Scalar or 1-D array of epochs (Julian years)
+        catalog_epoch: Epoch of the catalog RA/Dec
+        model, with_nutation: See celestial_pole
+
+    Returns:
+        Array (n_stars, n_epochs); NaN for stars without RA/Dec
+    """
+    years = np.atleast_1d(np.asarray(years, dtype=np.float64))
+    x, y, z, has_direction = positions(stars, catalog_epoch - years)
+    pole = celestial_pole(years, model, with_nutation)
+    px, py, pz = pole[:, 0], pole[:, 1], pole[:, 2]
+    dot = x * px + y * py + z * pz
+    cross = np.sqrt((y * pz - z * py) ** 2 + (z * px - x * pz) ** 2 + (x * py - y * px) ** 2)
+    # atan2 stays accurate for stars within arcseconds of the pole
+    separation = np.degrees(np.arctan2(cross, dot))
+    separation[~has_direction] = np.nan
+    return separation
+
+
+def iter_timeline_pole_separations(star, start_year=2025, end_year=-3200, future_year=None, interval_years=100,
+                                   offset=0, limit=None, chunk_periods=65536):
+    """
+    Pole separation of one star for every period of a timeline, in period order
+
+    Evaluated in vectorized chunks of chunk_periods, so memory does not
+    depend on the length of the timeline. The catalog position is taken as
+    the position at start_year, the epoch the timeline distances are
+    extrapolated from.
+
+    Args:
+        star: Star object
+        offset, limit: Period window (as for iter_historical_polaris_timeline)
+        chunk_periods: Periods evaluated per NumPy pass
+        (other arguments as for generate_historical_polaris_timeline)
+
+    Yields:
+        Separations in degrees (None when the star has no RA/Dec)
+    """
+    from polaris import timeline_year_ranges
+
+    position = 0
+    for years in timeline_year_ranges(start_year, end_year, future_year, interval_years):
+        lo = min(max(offset - position, 0), len(years))
+        hi = len(years) if limit is None else min(max(offset + limit - position, lo), len(years))
+        position += len(years)
+        for first in range(lo, hi, chunk_periods):
+            chunk = np.arange(years[first], years[min(first + chunk_periods, hi) - 1] + years.step, years.step)
+            for value in pole_separation([star], chunk, catalog_epoch=start_year)[0].tolist():
+                yield None if value != value else value
+
+
+def current_pole_separation(star, when=None):
+    """
+    Pole separation of a star now and its rate of change
+
+    Args:
+        star: Star object
+        when: datetime (default: now)
+
+    Returns:
+        Tuple (separation_deg, rate_deg_per_year), None values without RA/Dec
+    """
+    when = when or datetime.now(timezone.utc)
+    year = 2000.0 + (when - datetime(2000, 1, 1, 12, tzinfo=timezone.utc)).total_seconds() / (365.25 * 86400)
+    before, now, after = pole_separation([star], [year - 0.5, year, year + 0.5])[0].tolist()
+    if now != now:
+        return None, None
+    return now, after - before
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Angular distance of stars from the north celestial pole")
+    parser.add_argument("stars", nargs="+", help="Star names (e.g. Polaris, Vega)")
+    parser.add_argument("--years", type=float, nargs="+", default=[-3000, 0, 2025, 4000, 14000],
+                        help="Epochs (Julian years, negative for BC)")
+    parser.add_argument("--model", choices=MODELS, default="auto")
+    args = parser.parse_args(argv)
+
+    stars = []
+    for name in args.stars:
+        star = STAR_INDEX.get(name)
+        if star is None:
+            parser.error(f"unknown star: {name}")
+        stars.append(star)
+
+    separation = pole_separation(stars, args.years, model=args.model)
+    print(f"{'Star':<14}" + "".join(f"{year:>12g}" for year in args.years))
+    for star, row in zip(stars, separation):
+        print(f"{star.name:<14}" + "".join(f"{value:>11.4f}°" for value in row))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,301 @@
+"""
+Polaris Timeline Precomputation
+Multi-process generation of historical distance timelines for many stars
+
+The __main__ block of polaris.py writes polaris_100years.json and
+polaris_10years.json one after the other in a single process. This tool
+does the same for any list of stars and any set of intervals:
+
+- every (star, interval) timeline is cut into shards of consecutive periods
+- shards are generated in parallel by a process pool, each worker writing
+  the final JSON text of its periods to a shard file
+- shards are concatenated in index order into the streaming JSON writer,
+  so merging is a plain copy and the result is byte-identical to a
+  single-process run with the same reference time
+- with --compact, workers also collect the compact columnar data of their
+  shard and a polaris_<N>years.compact.json file (plus pre-compressed
+  .gz/.br siblings) is written next to each timeline
+
+Run:
+    python precompute_timelines.py --stars Polaris,Sirius --intervals 100,10 \\
+        --future-year 2500 --output-dir timelines --processes 8
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+import os
+import re
+import sys
+import time
+
+from polaris import (
+    POLARIS,
+    TIMELINE_EVALUATORS,
+    TimelineStatistics,
+    assemble_compact_timeline,
+    compact_timeline_columns,
+    iter_historical_polaris_timeline,
+    iter_timeline_period_json,
+    timeline_period_count,
+    write_compact_timeline,
+    write_historical_polaris_timeline,
+)
+from popular_stars import POPULAR_STARS, STAR_INDEX
+
+# Periods per shard (a shard is the unit of work handed to one process)
+DEFAULT_SHARD_PERIODS = 20000
+
+SHARD_DIRECTORY = ".shards"
+
+# Block size used when copying shard files into the merged output
+MERGE_BLOCK_BYTES = 1024 * 1024
+
+
+def resolve_stars(names):
+    """
+    Look up stars by name, catalog ID or alias
+
+    Args:
+        names: List of star names; "all" selects Polaris and every popular star
+
+    Returns:
+        List of Star objects (duplicates removed, order preserved)
+    """
+    stars = []
+    for name in names:
+        if name.casefold() == "all":
+            stars.append(POLARIS)
+            stars.extend(star.to_star() for star in POPULAR_STARS)
+            continue
+        star = STAR_INDEX.get(name)
+        if star is None:
+            raise ValueError(f"Unknown star: {name}")
+        stars.append(star.to_star() if hasattr(star, "to_star") else star)
+    unique = {}
+    for star in stars:
+        unique.setdefault(star.name, star)
+    return list(unique.values())
+
+
+def timeline_basename(star, interval_years):
+    """Base name of a timeline's files, e.g. polaris_100years"""
+    slug = re.sub(r"[^0-9a-z]+", "_", star.name.casefold()).strip("_")
+    return f"{slug}_{interval_years}years"
+
+
+def timeline_filename(star, interval_years, compact=False):
+    """Output file name, e.g. polaris_100years.json (same naming as polaris.py)"""
+    return f"{timeline_basename(star, interval_years)}{'.compact' if compact else ''}.json"
+
+
+def shard_ranges(total_periods, shard_periods):
+    """Split [0, total_periods) into (offset, limit) ranges of at most shard_periods"""
+    return [(offset, min(shard_periods, total_periods - offset))
+            for offset in range(0, total_periods, shard_periods)]
+
+
+def write_shard(path, star, start_year, end_year, future_year, interval_years,
+                max_precision, reference_time, evaluator, indent, offset, limit, compact=False):
+    """
+    Generate one shard of a timeline and write its JSON text (worker process)
+
+    Args:
+        path: Shard file to write
+        reference_time: ISO 8601 reference time shared by all shards
+        indent: JSON indentation of the merged file
+        offset, limit: Period range of this shard
+        compact: Also collect the shard's compact columnar data
+        (other arguments as for iter_historical_polaris_timeline)
+
+    Returns:
+        Tuple of (TimelineStatistics, compact (columns, overrides) or None)
+    """
+    reference_time = datetime.fromisoformat(reference_time)
+    periods = iter_historical_polaris_timeline(
+        star, start_year, end_year, future_year, interval_years, max_precision,
+        reference_time, evaluator, offset=offset, limit=limit
+    )
+    if compact:
+        periods = list(periods)
+    statistics = TimelineStatistics()
+    with open(path, 'w', encoding='utf-8') as f:
+        f.writelines(iter_timeline_period_json(periods, indent, statistics, first=(offset == 0)))
+    if not compact:
+        return statistics, None
+    columns, overrides, _ = compact_timeline_columns(periods, start_year, reference_time, first_index=offset)
+    return statistics, (columns, overrides)
+
+
+def iter_shard_text(paths):
+    """Read shard files back as text blocks, in the given order"""
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            while True:
+                block = f.read(MERGE_BLOCK_BYTES)
+                if not block:
+                    break
+                yield block
+
+
+def precompute_timelines(stars, intervals, output_dir, start_year=2025, end_year=-3200,
+                         future_year=None, max_precision=18, processes=None,
+                         shard_periods=DEFAULT_SHARD_PERIODS, indent=2, evaluator="decimal",
+                         reference_time=None, keep_shards=False, compact=False,
+                         compression=("gzip", "br")):
+    """
+    Generate timeline files for every (star, interval) pair across a process pool
+
+    Args:
+        stars: List of Star objects
+        intervals: List of interval lengths in years
+        output_dir: Directory for the timeline files
+        processes: Worker processes (default: number of CPUs)
+        shard_periods: Periods per shard
+        indent: JSON indentation of the output files
+        reference_time: Reference datetime shared by all timelines (default: now)
+        keep_shards: Leave the intermediate shard files on disk
+        compact: Also write compact timeline files (see compact_timeline_report)
+        compression: Pre-compressed siblings of the compact files
+        (other arguments as for generate_historical_polaris_timeline)
+
+    Returns:
+        List of dicts (star, interval_years, file, compact_files, total_periods, shards)
+    """
+    if shard_periods <= 0:
+        raise ValueError("shard_periods must be positive")
+    reference_time = reference_time or datetime.now(timezone.utc)
+    shard_dir = os.path.join(output_dir, SHARD_DIRECTORY)
+    os.makedirs(shard_dir, exist_ok=True)
+
+    jobs = []
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        # Submit every shard of every timeline up front so the pool stays busy
+        for star in stars:
+            for interval_years in intervals:
+                total = timeline_period_count(start_year, end_year, future_year, interval_years)
+                filename = timeline_filename(star, interval_years)
+                shards = []
+                for index, (offset, limit) in enumerate(shard_ranges(total, shard_periods)):
+                    path = os.path.join(shard_dir, f"{filename}.{index:06d}.part")
+                    future = pool.submit(
+                        write_shard, path, star, start_year, end_year, future_year, interval_years,
+                        max_precision, reference_time.isoformat(), evaluator, indent, offset, limit, compact
+                    )
+                    shards.append((path, future))
+                jobs.append((star, interval_years, filename, total, shards))
+
+        # Merge in submission order; each timeline is written once all its shards exist
+        results = []
+        for star, interval_years, filename, total, shards in jobs:
+            statistics = TimelineStatistics()
+            columns, overrides = None, {}
+            for _, future in shards:
+                shard_statistics, shard_compact = future.result()
+                statistics.merge(shard_statistics)
+                if shard_compact is not None:
+                    shard_columns, shard_overrides = shard_compact
+                    if columns is None:
+                        columns = shard_columns
+                    else:
+                        for name, values in shard_columns.items():
+                            columns[name].extend(values)
+                    overrides.update(shard_overrides)
+            if statistics.total_periods != total:
+                raise RuntimeError(f"{filename}: expected {total} periods, shards contain {statistics.total_periods}")
+            paths = [path for path, _ in shards]
+            output_file = os.path.join(output_dir, filename)
+            write_historical_polaris_timeline(
+                star, output_file, start_year, end_year, future_year, interval_years,
+                max_precision, reference_time, indent=indent, evaluator=evaluator,
+                period_chunks=iter_shard_text(paths), statistics=statistics
+            )
+            if not keep_shards:
+                for path in paths:
+                    os.remove(path)
+            compact_files = []
+            if compact:
+                compact_timeline = assemble_compact_timeline(
+                    star, start_year, end_year, future_year, interval_years, max_precision,
+                    reference_time, columns, overrides, statistics
+                )
+                compact_files = write_compact_timeline(
+                    compact_timeline, os.path.join(output_dir, timeline_filename(star, interval_years, compact=True)),
+                    compression
+                )
+            results.append({
+                "star": star.name,
+                "interval_years": interval_years,
+                "file": output_file,
+                "compact_files": compact_files,
+                "total_periods": total,
+                "shards": len(paths)
+            })
+
+    if not keep_shards:
+        try:
+            os.rmdir(shard_dir)
+        except OSError:
+            pass
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute historical distance timelines in parallel")
+    parser.add_argument("--stars", default="Polaris",
+                        help='Comma-separated star names, catalog IDs or aliases ("all" for every known star)')
+    parser.add_argument("--start-year", type=int, default=2025, help="Reference year")
+    parser.add_argument("--end-year", type=int, default=-3200, help="Oldest year (negative for BC)")
+    parser.add_argument("--future-year", type=int, default=None, help="Latest future year (optional)")
+    parser.add_argument("--intervals", default="100,10", help="Comma-separated interval lengths in years")
+    parser.add_argument("--max-precision", type=int, default=18)
+    parser.add_argument("--output-dir", default=".")
+    parser.add_argument("--processes", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--shard-periods", type=int, default=DEFAULT_SHARD_PERIODS,
+                        help="Periods per shard")
+    parser.add_argument("--indent", type=int, default=2, help="JSON indentation (negative for a single line)")
+    parser.add_argument("--evaluator", choices=TIMELINE_EVALUATORS, default="decimal")
+    parser.add_argument("--keep-shards", action="store_true", help="Keep intermediate shard files")
+    parser.add_argument("--compact", action="store_true",
+                        help="Also write compact columnar timelines with pre-compressed siblings")
+    parser.add_argument("--compress", default="gzip,br",
+                        help='Pre-compressed siblings of compact files ("gzip", "br", or "" for none)')
+    args = parser.parse_args(argv)
+
+    try:
+        stars = resolve_stars([name.strip() for name in args.stars.split(",") if name.strip()])
+        intervals = [int(value) for value in args.intervals.split(",") if value.strip()]
+    except ValueError as e:
+        parser.error(str(e))
+    if not stars or not intervals or min(intervals) <= 0:
+        parser.error("at least one star and one positive interval are required")
+
+    print("=" * 60)
+    print("POLARIS TIMELINE PRECOMPUTATION")
+    print("=" * 60)
+    print(f"Stars: {', '.join(star.name for star in stars)}")
+    print(f"Intervals: {', '.join(str(i) for i in intervals)} years")
+    print(f"Processes: {args.processes or os.cpu_count()}  |  Shard size: {args.shard_periods} periods")
+
+    started = time.perf_counter()
+    results = precompute_timelines(
+        stars, intervals, args.output_dir,
+        start_year=args.start_year, end_year=args.end_year, future_year=args.future_year,
+        max_precision=args.max_precision, processes=args.processes,
+        shard_periods=args.shard_periods, indent=args.indent if args.indent >= 0 else None,
+        evaluator=args.evaluator, keep_shards=args.keep_shards, compact=args.compact,
+        compression=tuple(name.strip() for name in args.compress.split(",") if name.strip())
+    )
+    elapsed = time.perf_counter() - started
+
+    for result in results:
+        print(f"  {result['file']}: {result['total_periods']:,} periods ({result['shards']} shards)")
+        for path in result["compact_files"]:
+            print(f"    {path}: {os.path.getsize(path):,} bytes")
+    print(f"Done in {elapsed:.2f} s")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
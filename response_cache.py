@@ -0,0 +1,216 @@
+"""
+Polaris Response Cache
+Time-bucketed HTTP response cache for the live distance endpoints
+
+Distance endpoints only change when a displayed value changes at its
+displayed precision. Responses are cached under (endpoint, arguments,
+time bucket), where the bucket length is the time the fastest-moving star
+needs to change its least stable field by one unit in the last displayed
+decimal. Entries are served with ETag / Cache-Control headers and evicted
+least-recently-used once the cache exceeds its byte budget.
+
+A cached body is shared by every request in its bucket, so cached views
+evaluate at the start of the bucket (bucket_time) rather than at the time
+of the request that happened to fill the entry: their "timestamp" field
+and every time-dependent value describe that same instant.
+"""
+
+from collections import OrderedDict, namedtuple
+from datetime import datetime, timezone
+from functools import wraps
+import hashlib
+import math
+import threading
+import time
+
+from flask import g, make_response, request
+
+from polaris import AU_PER_LIGHT_YEAR, KM_PER_LIGHT_YEAR_FLOAT, PARSEC_LY, get_star_kinematics
+
+# Displayed precision (decimal places) per distance field. A cached body is
+# reused until the fastest-changing field would change at this precision.
+DEFAULT_FIELD_PRECISION = {
+    "distance_ly": 12,
+    "distance_parsec": 12,
+    "distance_au": 6,
+}
+
+# Light years → field unit
+FIELD_UNITS_PER_LY = {
+    "distance_ly": 1.0,
+    "distance_km": KM_PER_LIGHT_YEAR_FLOAT,
+    "distance_au": float(AU_PER_LIGHT_YEAR),
+    "distance_parsec": 1.0 / float(PARSEC_LY),
+}
+
+CachedResponse = namedtuple("CachedResponse", ["body", "etag", "mimetype", "status", "expires_at"])
+
+
+def precision_bucket_seconds(stars, field_precision=None, min_seconds=1.0, max_seconds=300.0):
+    """
+    Length of a cache time bucket for responses about the given stars
+
+    For each field, the time for its value to change by 10^-precision is
+    10^-precision / (|v_r| in field units per second); the bucket is the
+    smallest such time over all stars and fields, clamped to
+    [min_seconds, max_seconds].
+
+    Args:
+        stars: Iterable of Star objects included in the response
+        field_precision: Dict of field name → displayed decimal places
+        min_seconds: Lower bound on the bucket length
+        max_seconds: Upper bound (also used for stars with v_r = 0)
+
+    Returns:
+        Bucket length in seconds
+    """
+    field_precision = field_precision or DEFAULT_FIELD_PRECISION
+    fastest_ly_per_second = max((abs(get_star_kinematics(star).rv_ly_per_second) for star in stars), default=0.0)
+    seconds = max_seconds
+    if fastest_ly_per_second > 0:
+        for field, decimals in field_precision.items():
+            rate = fastest_ly_per_second * FIELD_UNITS_PER_LY[field]
+            seconds = min(seconds, 10.0 ** -decimals / rate)
+    return min(max(seconds, min_seconds), max_seconds)
+
+
+def bucket_time():
+    """
+    Reference time of the response being built (UTC datetime)
+
+    Inside a view wrapped by ResponseCache.cached this is the start of the
+    current time bucket; anywhere else it is the current time.
+    """
+    start = g.get("cache_bucket_start")
+    return datetime.fromtimestamp(time.time() if start is None else start, timezone.utc)
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache of serialized responses with a total byte budget
+
+    Args:
+        max_bytes: Evict least recently used entries beyond this many body bytes
+    """
+
+    def __init__(self, max_bytes=8 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, now=None):
+        """Return a live CachedResponse for key, or None (expired entries are dropped)"""
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= now:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, entry):
+        """Store an entry, evicting least recently used entries to fit the byte budget"""
+        if len(entry.body) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += len(entry.body)
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= len(entry.body)
+
+    def clear(self):
+        """Drop all entries"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Cache counters for health/monitoring endpoints"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+    def cached(self, endpoint, bucket_seconds):
+        """
+        Decorator caching a Flask view per (endpoint, view arguments, time bucket)
+
+        Only 200 responses are cached. Clients sending a matching
+        If-None-Match header get 304 Not Modified without a body. Views
+        should take their reference time from bucket_time().
+
+        Args:
+            endpoint: Name used in the cache key
+            bucket_seconds: Callable taking the view arguments and returning
+                the bucket length in seconds (see precision_bucket_seconds)
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(**view_args):
+                seconds = bucket_seconds(**view_args)
+                now = time.time()
+                bucket = int(now // seconds)
+                arguments = tuple(sorted((name, str(value).casefold()) for name, value in view_args.items()))
+                key = (endpoint, arguments, seconds, bucket)
+
+                entry = self.get(key, now)
+                if entry is None:
+                    g.cache_bucket_start = bucket * seconds
+                    response = make_response(view(**view_args))
+                    if response.status_code != 200 or response.is_streamed:
+                        return response
+                    body = response.get_data()
+                    entry = CachedResponse(
+                        body=body,
+                        etag=hashlib.sha1(body).hexdigest(),
+                        mimetype=response.mimetype,
+                        status=response.status_code,
+                        expires_at=(bucket + 1) * seconds
+                    )
+                    self.put(key, entry)
+                return _serve(entry, now, seconds)
+            return wrapper
+        return decorator
+
+
+def _serve(entry, now, seconds):
+    """
+    Build a Flask response for a cache entry, honoring If-None-Match
+
+    max-age is the rest of the bucket rounded up to whole seconds (rounding
+    down would send max-age=0 for most of a short bucket). Buckets shorter
+    than a second cannot be expressed, so clients revalidate with the ETag.
+    """
+    if entry.etag in request.if_none_match:
+        response = make_response("", 304)
+    else:
+        response = make_response(entry.body, entry.status)
+        response.mimetype = entry.mimetype
+    response.set_etag(entry.etag)
+    if seconds < 1:
+        response.headers["Cache-Control"] = "no-cache"
+    else:
+        response.headers["Cache-Control"] = f"public, max-age={max(math.ceil(entry.expires_at - now), 0)}"
+    return response
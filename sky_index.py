@@ -0,0 +1,95 @@
+"""
+Polaris Sky Index
+Equal-area spatial index over unit vectors on the celestial sphere
+
+Answers "which stars lie within r of this direction" without touching
+the whole catalog. The sphere is cut into n_zones bands of equal height
+in z = sin δ and every band into 2 · n_zones equal slices in RA, so all
+cells have the same area (Lambert cylindrical projection, the same idea
+as HEALPix rings without the pixel-shape balancing). Stars are sorted by
+cell once; a cell is then a contiguous slice of the sorted order and a
+cap query gathers the slices of the cells it overlaps.
+
+Building is one argsort, so the index is cheap to rebuild when stars
+move (pole_stars.py rebuilds it for every epoch block).
+"""
+
+import numpy as np
+
+# Average number of stars per cell the default grid resolution aims for
+STARS_PER_CELL = 8
+MAX_ZONES = 2048
+
+
+class SkyIndex:
+    """Cell grid over unit vectors (x, y, z) with cap queries"""
+
+    def __init__(self, x, y, z, n_zones=None):
+        """
+        Args:
+            x, y, z: 1-D arrays of unit vector components (ICRS)
+            n_zones: Number of declination bands (default: from the star count)
+        """
+        x, y, z = (np.asarray(c, dtype=np.float64) for c in (x, y, z))
+        if n_zones is None:
+            n_zones = int(np.clip(np.sqrt(len(z) / (2 * STARS_PER_CELL)), 1, MAX_ZONES))
+        self.n_zones = n_zones
+        self.n_phi = 2 * n_zones
+        cells = self._cell(x, y, z)
+        self.order = np.argsort(cells)
+        self.starts = np.searchsorted(cells[self.order], np.arange(self.n_zones * self.n_phi + 1))
+
+    def __len__(self):
+        return len(self.order)
+
+    def _zone(self, z):
+        return np.clip(((z + 1.0) * 0.5 * self.n_zones).astype(np.int64), 0, self.n_zones - 1)
+
+    def _phi_bin(self, phi):
+        return np.clip((phi / (2 * np.pi) * self.n_phi).astype(np.int64), 0, self.n_phi - 1)
+
+    def _cell(self, x, y, z):
+        phi = np.arctan2(y, x) % (2 * np.pi)
+        return self._zone(z) * self.n_phi + self._phi_bin(phi)
+
+    def query_cap(self, center, radius):
+        """
+        Indices of all stars within an angular radius of a direction
+
+        The result is a superset (every star in an overlapping cell);
+        callers compute exact separations for the candidates.
+
+        Args:
+            center: Unit vector (3,)
+            radius: Angular radius in radians
+
+        Returns:
+            1-D int array of star indices
+        """
+        x, y, z = (float(c) for c in center)
+        if radius >= np.pi:
+            return self.order.copy()
+        dec = np.arcsin(np.clip(z, -1.0, 1.0))
+        dec_lo, dec_hi = dec - radius, dec + radius
+        zones = np.arange(self._zone(np.sin(max(dec_lo, -np.pi / 2))),
+                          self._zone(np.sin(min(dec_hi, np.pi / 2))) + 1)
+
+        if dec_hi >= np.pi / 2 or dec_lo <= -np.pi / 2:
+            # The cap contains a pole: every RA slice of the bands
+            phi_bins = np.arange(self.n_phi)
+        else:
+            half_width = np.arcsin(min(np.sin(radius) / np.cos(dec), 1.0))
+            phi = np.arctan2(y, x) % (2 * np.pi)
+            first = int(np.floor((phi - half_width) / (2 * np.pi) * self.n_phi))
+            last = int(np.floor((phi + half_width) / (2 * np.pi) * self.n_phi))
+            phi_bins = np.arange(first, min(last, first + self.n_phi - 1) + 1) % self.n_phi
+
+        cells = (zones[:, np.newaxis] * self.n_phi + phi_bins[np.newaxis, :]).ravel()
+        lo, hi = self.starts[cells], self.starts[cells + 1]
+        counts = hi - lo
+        total = int(counts.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.int64)
+        # Concatenate the slices [lo, hi) of every cell without a Python loop
+        offsets = np.repeat(lo - np.cumsum(counts) + counts, counts)
+        return self.order[offsets + np.arange(total)]
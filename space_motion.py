@@ -0,0 +1,200 @@
+"""
+Polaris Space Motion Engine
+Vectorized 3D propagation of catalog stars in ICRS Cartesian coordinates
+
+distance_at_time and calculate_distance_high_precision move a star along
+the line of sight only (d = d₀ + v_r · t). Over thousands of years the
+transverse motion matters as well: Polaris moves ~0.05 ly across the sky
+per 1,000 years and its direction changes, so its declination and its
+separation from the celestial pole drift.
+
+Each star is turned into a position and a velocity in ICRS Cartesian
+coordinates (light years, light years per Julian year) from ra_hours,
+dec_degrees, distance_ly, radial_velocity_km_s and the proper motions
+(pmRA is μα* = μα · cos δ, as in Gaia and Hipparcos), and moved along a
+straight line:
+
+    r(t) = r₀ + v · t
+
+Distance, RA/Dec and the angular separation from the ICRS north pole are
+then evaluated for every star and every epoch in one batched NumPy pass.
+Epochs use the years_ago convention of the timeline (positive for the
+past): the position years_ago years before the catalog epoch is
+r₀ − v · years_ago.
+
+Run:
+    python space_motion.py Polaris Vega --end-year -20000 --future-year 20000 --interval 1000
+"""
+
+import argparse
+import sys
+
+import numpy as np
+
+from batch_kinematics import LY_PER_KM_S_YEAR
+from polaris import timeline_year_ranges
+from popular_stars import STAR_INDEX
+
+LY_PER_KM_S_YEAR_FLOAT = float(LY_PER_KM_S_YEAR)
+
+# Proper motion in mas/yr → radians per year
+RAD_PER_MAS = np.pi / (180.0 * 3600.0 * 1000.0)
+
+
+def _star_column(stars, field):
+    """One Star field of every star as float64 (NaN for None)"""
+    if hasattr(stars, "column"):
+        return np.array(stars.column(field), dtype=np.float64)
+    return np.array([getattr(star, field) for star in stars], dtype=np.float64)
+
+
+def state_vectors(stars):
+    """
+    ICRS Cartesian position and velocity of every star
+
+    Stars without RA/Dec are placed on the x axis: their distance is still
+    exact (it does not depend on the orientation of the frame), but their
+    directions are meaningless and propagate() reports them as NaN.
+    Missing proper motions count as zero.
+
+    Args:
+        stars: Sequence of Star objects or a StarCatalog
+
+    Returns:
+        Tuple (position, velocity, has_direction): arrays (n_stars, 3) in
+        ly and ly/yr, and a boolean array (n_stars,)
+    """
+    if not hasattr(stars, "column"):
+        stars = list(stars)
+    ra = np.radians(_star_column(stars, "ra_hours") * 15.0)
+    dec = np.radians(_star_column(stars, "dec_degrees"))
+    has_direction = np.isfinite(ra) & np.isfinite(dec)
+    ra = np.where(has_direction, ra, 0.0)
+    dec = np.where(has_direction, dec, 0.0)
+    distance = _star_column(stars, "distance_ly")
+    radial = np.nan_to_num(_star_column(stars, "radial_velocity_km_s")) * LY_PER_KM_S_YEAR_FLOAT
+    # Transverse velocity: μ (rad/yr) · d (ly) in ly/yr
+    pm_ra = np.nan_to_num(_star_column(stars, "proper_motion_ra_mas_yr")) * RAD_PER_MAS * distance
+    pm_dec = np.nan_to_num(_star_column(stars, "proper_motion_dec_mas_yr")) * RAD_PER_MAS * distance
+
+    sin_ra, cos_ra = np.sin(ra), np.cos(ra)
+    sin_dec, cos_dec = np.sin(dec), np.cos(dec)
+    # Unit vectors toward the star, toward increasing RA and toward increasing Dec
+    r_hat = np.stack([cos_dec * cos_ra, cos_dec * sin_ra, sin_dec], axis=1)
+    p_hat = np.stack([-sin_ra, cos_ra, np.zeros_like(ra)], axis=1)
+    q_hat = np.stack([-sin_dec * cos_ra, -sin_dec * sin_ra, cos_dec], axis=1)
+
+    position = distance[:, np.newaxis] * r_hat
+    velocity = radial[:, np.newaxis] * r_hat + pm_ra[:, np.newaxis] * p_hat + pm_dec[:, np.newaxis] * q_hat
+    return position, velocity, has_direction
+
+
+def positions(stars, years_ago):
+    """
+    ICRS Cartesian coordinates of many stars at many epochs
+
+    Args:
+        stars: Sequence of Star objects or a StarCatalog
+        years_ago: Scalar or 1-D array of epochs (negative for future, positive for past)
+
+    Returns:
+        Tuple (x, y, z, has_direction): arrays (n_stars, n_epochs) in light
+        years, and the has_direction mask of state_vectors
+    """
+    epochs = np.atleast_1d(np.asarray(years_ago, dtype=np.float64))
+    if epochs.ndim != 1:
+        raise ValueError("years_ago must be a scalar or a 1-D array")
+    position, velocity, has_direction = state_vectors(stars)
+    t = -epochs[np.newaxis, :]
+    x = position[:, 0:1] + velocity[:, 0:1] * t
+    y = position[:, 1:2] + velocity[:, 1:2] * t
+    z = position[:, 2:3] + velocity[:, 2:3] * t
+    return x, y, z, has_direction
+
+
+def propagate(stars, years_ago):
+    """
+    Distance, RA/Dec and pole separation of many stars at many epochs
+
+    Args:
+        stars: Sequence of Star objects or a StarCatalog
+        years_ago: Scalar or 1-D array of epochs (negative for future, positive for past)
+
+    Returns:
+        Dict of arrays shaped (n_stars, n_epochs):
+            "distance_ly", "ra_hours", "dec_degrees", "pole_separation_deg"
+        RA/Dec and pole separation are NaN for stars without coordinates.
+        The pole is the fixed ICRS pole; precession.py gives the pole of date.
+    """
+    x, y, z, has_direction = positions(stars, years_ago)
+    distance = np.sqrt(x * x + y * y + z * z)
+    ra_hours = np.degrees(np.arctan2(y, x)) % 360.0 / 15.0
+    # atan2 of z over the projected distance stays accurate near the pole
+    dec = np.degrees(np.arctan2(z, np.hypot(x, y)))
+
+    missing = ~has_direction[:, np.newaxis]
+    ra_hours[np.broadcast_to(missing, ra_hours.shape)] = np.nan
+    dec[np.broadcast_to(missing, dec.shape)] = np.nan
+    return {
+        "distance_ly": distance,
+        "ra_hours": ra_hours,
+        "dec_degrees": dec,
+        "pole_separation_deg": 90.0 - dec,
+    }
+
+
+def space_motion_timeline(stars, start_year=2025, end_year=-3200, future_year=None, interval_years=100):
+    """
+    Propagate stars over the period grid of generate_historical_polaris_timeline
+
+    The catalog values are taken to be those of start_year.
+
+    Args:
+        stars: Sequence of Star objects or a StarCatalog
+        (other arguments as for generate_historical_polaris_timeline)
+
+    Returns:
+        Dict with "year" and "years_ago" (n_periods,) and the propagate()
+        arrays (n_stars, n_periods)
+    """
+    years = np.concatenate([
+        np.arange(r.start, r.stop, r.step, dtype=np.int64)
+        for r in timeline_year_ranges(start_year, end_year, future_year, interval_years)
+    ])
+    years_ago = start_year - years
+    result = propagate(stars, years_ago)
+    result["year"] = years
+    result["years_ago"] = years_ago
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="3D space motion of stars over a timeline")
+    parser.add_argument("stars", nargs="+", help="Star names (e.g. Polaris, Vega)")
+    parser.add_argument("--start-year", type=int, default=2025)
+    parser.add_argument("--end-year", type=int, default=-3200)
+    parser.add_argument("--future-year", type=int, default=None)
+    parser.add_argument("--interval", type=int, default=100, help="Interval in years")
+    args = parser.parse_args(argv)
+
+    stars = []
+    for name in args.stars:
+        star = STAR_INDEX.get(name)
+        if star is None:
+            parser.error(f"unknown star: {name}")
+        stars.append(star)
+
+    result = space_motion_timeline(stars, args.start_year, args.end_year, args.future_year, args.interval)
+    for i, star in enumerate(stars):
+        print("=" * 60)
+        print(f"{star.name}: {len(result['year'])} periods")
+        print("=" * 60)
+        print(f"{'Year':>8}  {'Distance (ly)':>16}  {'RA (h)':>10}  {'Dec (°)':>10}  {'Pole sep. (°)':>13}")
+        for j, year in enumerate(result["year"]):
+            print(f"{year:>8}  {result['distance_ly'][i, j]:>16.6f}  {result['ra_hours'][i, j]:>10.5f}  "
+                  f"{result['dec_degrees'][i, j]:>10.5f}  {result['pole_separation_deg'][i, j]:>13.5f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,462 @@
+"""
+Polaris Star Catalog Store
+Compact struct-of-arrays storage for large star catalogs (Hipparcos/Gaia)
+
+A list of Star dataclass instances costs several hundred bytes per star.
+StarCatalog keeps every numeric Star field in a NumPy column and every
+string field as an int32 code into an interned string table, so a
+100,000-star catalog fits in a few MB. Vectorized engines read the columns
+directly; code written against Star gets lightweight StarView objects.
+
+StarIndex provides name / catalog ID / alias lookup, prefix autocomplete
+and fuzzy search over any collection of stars.
+"""
+
+from bisect import bisect_left
+from difflib import SequenceMatcher
+
+import numpy as np
+
+from polaris import Star
+
+# Star fields stored as float64 columns (None is stored as NaN)
+FLOAT_FIELDS = (
+    "distance_ly",
+    "radial_velocity_km_s",
+    "distance_ly_uncertainty",
+    "radial_velocity_uncertainty_km_s",
+    "ra_hours",
+    "dec_degrees",
+    "proper_motion_ra_mas_yr",
+    "proper_motion_dec_mas_yr",
+    "magnitude",
+)
+
+# Star fields stored as int32 codes into a StringTable (None is stored as -1)
+STRING_FIELDS = ("name", "catalog_id", "spectral_type")
+
+# Field order of the Star dataclass
+STAR_FIELDS = (
+    "name",
+    "distance_ly",
+    "radial_velocity_km_s",
+    "distance_ly_uncertainty",
+    "radial_velocity_uncertainty_km_s",
+    "catalog_id",
+    "ra_hours",
+    "dec_degrees",
+    "proper_motion_ra_mas_yr",
+    "proper_motion_dec_mas_yr",
+    "spectral_type",
+    "magnitude",
+)
+
+MISSING_CODE = -1
+
+
+class StringTable:
+    """Interned string table: each distinct string is stored once and referenced by code"""
+
+    def __init__(self):
+        self.values = []
+        self._codes = {}
+
+    def intern(self, value):
+        """Return the code for value, adding it to the table if needed"""
+        if value is None:
+            return MISSING_CODE
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self._codes[value] = code
+        return code
+
+    def lookup(self, code):
+        """Return the string for a code (None for MISSING_CODE)"""
+        return None if code == MISSING_CODE else self.values[code]
+
+    def __len__(self):
+        return len(self.values)
+
+
+class StarView:
+    """
+    Lightweight Star-compatible view of one catalog row
+
+    Exposes the same attributes as Star, read from (and written to) the
+    catalog columns. Only the catalog reference and the row index are stored.
+    """
+
+    __slots__ = ("_catalog", "_index")
+
+    def __init__(self, catalog, index):
+        self._catalog = catalog
+        self._index = index
+
+    @property
+    def index(self):
+        """Row index of this star in its catalog"""
+        return self._index
+
+    def to_star(self):
+        """Materialize this row as a standalone Star object"""
+        return Star(**{field: getattr(self, field) for field in STAR_FIELDS})
+
+    def __eq__(self, other):
+        if isinstance(other, (StarView, Star)):
+            return all(getattr(self, field) == getattr(other, field) for field in STAR_FIELDS)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        fields = ", ".join(f"{field}={getattr(self, field)!r}" for field in STAR_FIELDS)
+        return f"StarView({fields})"
+
+
+def _float_property(field):
+    def getter(view):
+        value = view._catalog._columns[field][view._index]
+        return None if np.isnan(value) else float(value)
+
+    def setter(view, value):
+        view._catalog._set_value(field, view._index, value)
+
+    return property(getter, setter, doc=f"Star.{field} read from the catalog column")
+
+
+def _string_property(field):
+    def getter(view):
+        catalog = view._catalog
+        return catalog._strings[field].lookup(int(catalog._columns[field][view._index]))
+
+    def setter(view, value):
+        view._catalog._set_value(field, view._index, value)
+
+    return property(getter, setter, doc=f"Star.{field} read from the interned string table")
+
+
+for _field in FLOAT_FIELDS:
+    setattr(StarView, _field, _float_property(_field))
+for _field in STRING_FIELDS:
+    setattr(StarView, _field, _string_property(_field))
+
+
+class StarCatalog:
+    """
+    Columnar (struct-of-arrays) star catalog
+
+    Rows are appended into preallocated NumPy columns that grow
+    geometrically. Indexing and iteration return StarView objects, so the
+    catalog can be passed anywhere a list of Star objects is expected.
+    """
+
+    def __init__(self, capacity=0):
+        capacity = max(int(capacity), 0)
+        self._size = 0
+        self._columns = {field: np.full(capacity, np.nan) for field in FLOAT_FIELDS}
+        self._columns.update({field: np.full(capacity, MISSING_CODE, dtype=np.int32) for field in STRING_FIELDS})
+        self._strings = {field: StringTable() for field in STRING_FIELDS}
+
+    @classmethod
+    def from_stars(cls, stars):
+        """Build a catalog from an iterable of Star (or Star-like) objects"""
+        stars = list(stars)
+        catalog = cls(capacity=len(stars))
+        catalog.extend(stars)
+        return catalog
+
+    @classmethod
+    def from_columns(cls, **columns):
+        """
+        Build a catalog directly from column arrays (no per-star objects)
+
+        Float fields accept any array-like (NaN for missing values); string
+        fields accept sequences of str/None. Omitted fields are missing.
+        """
+        catalog = cls()
+        catalog.append_columns(**columns)
+        return catalog
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [StarView(self, i) for i in range(*index.indices(self._size))]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("StarCatalog index out of range")
+        return StarView(self, index)
+
+    def __iter__(self):
+        for index in range(self._size):
+            yield StarView(self, index)
+
+    @property
+    def nbytes(self):
+        """Bytes used by the column arrays (excluding string table contents)"""
+        return sum(column.nbytes for column in self._columns.values())
+
+    def _reserve(self, capacity):
+        current = len(self._columns["distance_ly"])
+        if capacity <= current:
+            return
+        new_capacity = max(capacity, current * 2, 16)
+        for field, column in self._columns.items():
+            grown = np.full(new_capacity, MISSING_CODE if field in STRING_FIELDS else np.nan, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[field] = grown
+
+    def _encode(self, field, value):
+        if field in STRING_FIELDS:
+            return self._strings[field].intern(value)
+        return np.nan if value is None else float(value)
+
+    def _set_value(self, field, index, value):
+        self._columns[field][index] = self._encode(field, value)
+
+    def append(self, star):
+        """Append one Star (or Star-like object) and return its row index"""
+        self._reserve(self._size + 1)
+        index = self._size
+        for field in STAR_FIELDS:
+            self._columns[field][index] = self._encode(field, getattr(star, field, None))
+        self._size += 1
+        return index
+
+    def extend(self, stars):
+        """Append many Star (or Star-like) objects"""
+        for star in stars:
+            self.append(star)
+
+    def append_columns(self, **columns):
+        """
+        Append a block of rows given as columns (vectorized)
+
+        Args:
+            **columns: Field name → array-like of values, all the same length
+
+        Returns:
+            Range of the new row indices
+        """
+        unknown = set(columns) - set(STAR_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown Star fields: {', '.join(sorted(unknown))}")
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length")
+        count = lengths.pop() if lengths else 0
+        start = self._size
+        self._reserve(start + count)
+        for field, values in columns.items():
+            if field in STRING_FIELDS:
+                table = self._strings[field]
+                self._columns[field][start:start + count] = [table.intern(value) for value in values]
+            else:
+                # NumPy converts None to NaN for float64 arrays
+                self._columns[field][start:start + count] = np.asarray(values, dtype=np.float64)
+        self._size += count
+        return range(start, start + count)
+
+    def column(self, field):
+        """
+        Return a read-only view of one column (no copy)
+
+        Float fields come back as float64 arrays with NaN for missing
+        values; string fields as int32 codes into strings(field).
+        """
+        view = self._columns[field][:self._size]
+        view.flags.writeable = False
+        return view
+
+    def strings(self, field):
+        """Return the interned StringTable of a string field"""
+        return self._strings[field]
+
+    def decoded(self, field):
+        """Return a string column decoded to a list of str/None"""
+        table = self._strings[field]
+        return [table.lookup(code) for code in self._columns[field][:self._size]]
+
+    def kinematic_columns(self, dtype=np.float64):
+        """
+        Columns used by the vectorized kinematics engines
+
+        Returns:
+            Tuple of (distance_ly, radial_velocity_km_s, distance_ly_uncertainty,
+            radial_velocity_uncertainty_km_s); missing uncertainties are 0.0
+        """
+        distance = self._columns["distance_ly"][:self._size].astype(dtype)
+        rv = self._columns["radial_velocity_km_s"][:self._size].astype(dtype)
+        distance_unc = np.nan_to_num(self._columns["distance_ly_uncertainty"][:self._size]).astype(dtype)
+        rv_unc = np.nan_to_num(self._columns["radial_velocity_uncertainty_km_s"][:self._size]).astype(dtype)
+        return distance, rv, distance_unc, rv_unc
+
+    def to_stars(self):
+        """Materialize the whole catalog as a list of Star objects"""
+        return [view.to_star() for view in self]
+
+
+def normalize_name(text):
+    """Case-folded, whitespace-collapsed lookup key for star names and aliases"""
+    return " ".join(str(text).casefold().split())
+
+
+def normalize_identifier(text):
+    """Lookup key for catalog identifiers: 'HIP 11767', 'hip11767' and 'HIP_11767' all match"""
+    return "".join(ch for ch in str(text).casefold() if ch.isalnum())
+
+
+def _trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class StarIndex:
+    """
+    Lookup index over stars by name, catalog ID and aliases
+
+    - get(): O(1) dict lookup on case-folded names/aliases and normalized
+      catalog identifiers (HIP numbers, Gaia source_ids, ...)
+    - prefix(): O(log n + k) autocomplete via binary search over sorted keys
+    - fuzzy(): typo-tolerant matching; candidates come from a trigram
+      inverted index, so only stars sharing trigrams with the query are scored
+    """
+
+    def __init__(self):
+        self._by_key = {}
+        self._by_identifier = {}
+        self._display = {}
+        self._sorted_keys = []
+        self._sorted_dirty = False
+        self._trigram_postings = {}
+
+    @classmethod
+    def from_stars(cls, stars, aliases=None):
+        """
+        Build an index over stars (a list of Star objects or a StarCatalog)
+
+        Args:
+            stars: Iterable of Star/StarView objects
+            aliases: Optional dict of star name → list of alternative names/IDs
+        """
+        aliases = aliases or {}
+        index = cls()
+        for star in stars:
+            index.add(star, aliases.get(star.name, ()))
+        return index
+
+    def __len__(self):
+        return len({id(star) for star in self._by_key.values()})
+
+    def add(self, star, aliases=()):
+        """Index a star under its name, catalog ID and any aliases"""
+        names = [star.name, *aliases]
+        if star.catalog_id:
+            names.append(star.catalog_id)
+        for name in names:
+            if not name:
+                continue
+            key = normalize_name(name)
+            if key not in self._by_key:
+                self._sorted_dirty = True
+                for trigram in _trigrams(key):
+                    self._trigram_postings.setdefault(trigram, []).append(key)
+            self._by_key[key] = star
+            self._display[key] = name
+            identifier = normalize_identifier(name)
+            if identifier:
+                self._by_identifier[identifier] = star
+                # Bare Gaia source_id (e.g. "Gaia DR3 131081166581443968" → "131081166581443968")
+                source_id = str(name).split()[-1]
+                if source_id != str(name) and len(source_id) >= 10 and source_id.isdigit():
+                    self._by_identifier[source_id] = star
+
+    def get(self, query):
+        """Exact lookup by name, alias or catalog identifier; None if not found"""
+        star = self._by_key.get(normalize_name(query))
+        if star is None:
+            star = self._by_identifier.get(normalize_identifier(query))
+        return star
+
+    def _keys(self):
+        if self._sorted_dirty:
+            self._sorted_keys = sorted(self._by_key)
+            self._sorted_dirty = False
+        return self._sorted_keys
+
+    def prefix(self, query, limit=10):
+        """
+        Autocomplete: stars with a name/alias/ID starting with query
+
+        Returns:
+            List of (matched_key_display, star) tuples, in key order
+        """
+        key = normalize_name(query)
+        keys = self._keys()
+        start = bisect_left(keys, key)
+        results, seen = [], set()
+        for candidate in keys[start:]:
+            if not candidate.startswith(key) or len(results) >= limit:
+                break
+            star = self._by_key[candidate]
+            if id(star) not in seen:
+                seen.add(id(star))
+                results.append((self._display[candidate], star))
+        return results
+
+    def fuzzy(self, query, limit=5, cutoff=0.6):
+        """
+        Typo-tolerant lookup ("betelguese" → Betelgeuse)
+
+        Returns:
+            List of (matched_key_display, star, score) tuples, best first
+        """
+        key = normalize_name(query)
+        shared = {}
+        for trigram in _trigrams(key):
+            for candidate in self._trigram_postings.get(trigram, ()):
+                shared[candidate] = shared.get(candidate, 0) + 1
+        # Score only the candidates that share the most trigrams with the query
+        candidates = sorted(shared, key=shared.get, reverse=True)[:max(limit * 10, 50)]
+        scored = []
+        for candidate in candidates:
+            score = SequenceMatcher(None, key, candidate).ratio()
+            if score >= cutoff:
+                scored.append((score, candidate))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        results, seen = [], set()
+        for score, candidate in scored:
+            star = self._by_key[candidate]
+            if id(star) not in seen and len(results) < limit:
+                seen.add(id(star))
+                results.append((self._display[candidate], star, round(score, 3)))
+        return results
+
+    def search(self, query, limit=10, fuzzy=True):
+        """
+        Combined search: exact match first, then prefix matches; fuzzy
+        matches are only used when nothing matched exactly or by prefix
+
+        Returns:
+            List of dicts with "name", "matched", "match" and "star" keys
+        """
+        results, seen = [], set()
+
+        def add(matched, star, match):
+            if id(star) not in seen and len(results) < limit:
+                seen.add(id(star))
+                results.append({"name": star.name, "matched": matched, "match": match, "star": star})
+
+        exact = self.get(query)
+        if exact is not None:
+            add(query, exact, "exact")
+        for matched, star in self.prefix(query, limit):
+            add(matched, star, "prefix")
+        if fuzzy and not results:
+            for matched, star, _score in self.fuzzy(query, limit):
+                add(matched, star, "fuzzy")
+        return results
@@ -0,0 +1,61 @@
+"""Shared fixtures: random epochs and a reference timeline grid"""
+
+from datetime import datetime, timezone
+import math
+import random
+
+import pytest
+
+REFERENCE_TIME = datetime(2025, 12, 23, 8, 7, 7, 820902, tzinfo=timezone.utc)
+
+
+def random_epochs(seed, count):
+    """
+    years_ago values mixing edge cases, integers, millennia-scale fractions
+    and tiny magnitudes (the cases where the precision rule changes)
+    """
+    rng = random.Random(seed)
+    values = [0, 1, -1, 10, 100, -1000, 1e-3, 1e-6, -1e-9, 0.5]
+    while len(values) < count:
+        kind = len(values) % 3
+        if kind == 0:
+            values.append(rng.randint(-10**6, 10**6))
+        elif kind == 1:
+            values.append(round(rng.uniform(-1e4, 1e4), 3))
+        else:
+            values.append(rng.uniform(-1, 1) * 10.0 ** rng.randint(-12, 2))
+    return values
+
+
+@pytest.fixture
+def epochs():
+    """random_epochs(seed, count)"""
+    return random_epochs
+
+
+@pytest.fixture
+def timeline_options():
+    """Keyword arguments of a 10-year 3200 BC - 2500 AD timeline at a fixed reference time"""
+    return dict(start_year=2025, end_year=-3200, future_year=2500, interval_years=10, reference_time=REFERENCE_TIME)
+
+
+@pytest.fixture
+def timeline_length(timeline_options):
+    """
+    Periods in the timeline_options grid: the end_year endpoint and the
+    historical steps, the reference year, the future steps and a final
+    future_year point when the steps do not land on it
+    """
+    start, end, future, interval = (timeline_options[name] for name in ("start_year", "end_year", "future_year", "interval_years"))
+    return math.ceil((start - end) / interval) + 1 + math.ceil((future - start) / interval)
+
+
+@pytest.fixture(scope="session")
+def timeline_store(tmp_path_factory):
+    """TimelineStore holding Polaris' 100- and 10-year timelines over 3200 BC - 2500 AD"""
+    from polaris import POLARIS
+    from timeline_store import TimelineStore
+
+    store = TimelineStore(str(tmp_path_factory.mktemp("timeline_store")))
+    store.build(POLARIS, [100, 10], start_year=2025, end_year=-3200, future_year=2500)
+    return store
@@ -0,0 +1,34 @@
+"""Certified distances against the exact fixed-point engine"""
+
+import pytest
+
+from adaptive_precision import certified_distance
+from fixed_point import calculate_distance_fixed
+from polaris import POLARIS, iter_historical_polaris_timeline
+from popular_stars import POPULAR_STARS
+
+EPOCHS_PER_STAR = 3150
+
+
+@pytest.mark.parametrize("star", list(POPULAR_STARS), ids=lambda star: star.name)
+def test_certified_matches_fixed(star, epochs):
+    # 20 catalog stars × 3,150 epochs: 63,000 cases
+    for years_ago in epochs(star.name, EPOCHS_PER_STAR):
+        result = certified_distance(star, years_ago)
+        assert (result.distance, result.precision) == calculate_distance_fixed(star, years_ago), years_ago
+
+
+def test_error_bound_is_below_half_a_unit(epochs):
+    for years_ago in epochs(0, 500):
+        result = certified_distance(POLARIS, years_ago)
+        assert result.error_bound_ly < 0.5 * 10.0 ** -result.precision
+        if result.backend == "exact":
+            assert result.error_bound_ly == 0.0
+
+
+def test_direct_and_decimal_timelines_are_equal(timeline_options, timeline_length):
+    decimal = list(iter_historical_polaris_timeline(POLARIS, evaluator="decimal", **timeline_options))
+    direct = list(iter_historical_polaris_timeline(POLARIS, evaluator="direct", **timeline_options))
+
+    assert len(decimal) == len(direct) == timeline_length
+    assert decimal == direct
@@ -0,0 +1,78 @@
+"""Flask API routes through the test client"""
+
+import pytest
+
+pytest.importorskip("flask")
+
+import api_server
+from fixed_point import calculate_distance_fixed
+from polaris import KM_PER_LIGHT_YEAR_FLOAT, POLARIS
+from popular_stars import POPULAR_STARS, STAR_INDEX
+
+
+@pytest.fixture
+def client():
+    api_server.RESPONSE_CACHE.clear()
+    with api_server.app.test_client() as client:
+        yield client
+
+
+def assert_current_distance(star, payload, precision_field="distance_ly_precision"):
+    distance, precision = calculate_distance_fixed(star, 0)
+    assert payload["distance_ly"] == star.distance_ly
+    assert payload[precision_field] == precision
+    assert payload["distance_ly_certified"] == str(distance)
+    # Every unit describes the same (unrounded) distance
+    assert payload["distance_km"] == pytest.approx(payload["distance_ly"] * KM_PER_LIGHT_YEAR_FLOAT, rel=1e-15)
+
+
+def test_current_distance(client):
+    payload = client.get("/api/current-distance").get_json()
+    assert_current_distance(POLARIS, payload, precision_field="precision")
+
+
+def test_star_and_popular_stars_agree(client):
+    popular = client.get("/api/popular-stars").get_json()
+    assert popular["count"] == len(POPULAR_STARS)
+    for star, payload in zip(POPULAR_STARS, popular["stars"]):
+        assert_current_distance(star, payload)
+        assert client.get(f"/api/star/{star.name}").get_json() == payload
+
+
+def test_unknown_star_is_404(client):
+    assert STAR_INDEX.get("Nostar") is None
+    assert client.get("/api/star/Nostar").status_code == 404
+
+
+@pytest.mark.parametrize("query", ["North Star", "hip11767", "131081166581443968"])
+def test_star_lookup_by_alias_and_id(client, query):
+    assert client.get(f"/api/star/{query}").get_json()["name"] == "Polaris"
+
+
+def test_star_search(client):
+    payload = client.get("/api/star-search?q=betelguese").get_json()
+    assert payload["results"][0]["name"] == "Betelgeuse"
+    assert client.get("/api/star-search").status_code == 400
+
+
+@pytest.fixture
+def timeline_client(client, timeline_store, monkeypatch):
+    monkeypatch.setattr(api_server, "TIMELINE_STORE", timeline_store)
+    return client
+
+
+def test_timeline_slice(timeline_client):
+    payload = timeline_client.get("/api/timeline/Polaris?from=-1000&to=1000&step=100").get_json()
+    assert payload["source"] == "store"
+    assert payload["columns"]["year"] == list(range(-975, 1001, 100))
+
+
+@pytest.mark.parametrize("query", [
+    "step=0", "from=10&to=0", "points=1", "points=999999",
+    # Outside the store: tiles need an explicit range
+    "step=7", "from=-9000",
+])
+def test_timeline_bad_step_or_range_is_400(timeline_client, query):
+    response = timeline_client.get(f"/api/timeline/Polaris?{query}")
+    assert response.status_code == 400
+    assert "error" in response.get_json()
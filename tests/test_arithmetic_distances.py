@@ -0,0 +1,54 @@
+"""Incremental grid evaluation against point-by-point evaluation"""
+
+from decimal import Decimal
+
+import pytest
+
+from fixed_point import calculate_distance_fixed
+from polaris import (
+    POLARIS,
+    calculate_distance_high_precision,
+    calculate_distance_uncertainty,
+    iter_arithmetic_distances,
+)
+from popular_stars import STAR_INDEX
+
+GRIDS = [(5225, -10, 1000), (-10, -10, 500), ("0.25", "0.5", 200), (0, "-1e-6", 100)]
+
+
+def epochs(first, step, count):
+    return [Decimal(str(first)) + i * Decimal(str(step)) for i in range(count)]
+
+
+@pytest.mark.parametrize("star", [POLARIS, STAR_INDEX.get("Sirius")], ids=lambda star: star.name)
+@pytest.mark.parametrize("first, step, count", GRIDS)
+def test_decimal_mode_matches_direct(star, first, step, count):
+    values = iter_arithmetic_distances(star, first, step, count)
+    for years_ago, (distance, precision, uncertainty) in zip(epochs(first, step, count), values):
+        expected, expected_precision = calculate_distance_high_precision(star, years_ago)
+        assert distance == pytest.approx(expected, rel=1e-15, abs=0)
+        assert precision == expected_precision
+        assert uncertainty == pytest.approx(calculate_distance_uncertainty(star, years_ago), rel=1e-12)
+
+
+@pytest.mark.parametrize("first, step, count", GRIDS)
+def test_compensated_mode_tracks_decimal(first, step, count):
+    decimal = list(iter_arithmetic_distances(POLARIS, first, step, count))
+    compensated = list(iter_arithmetic_distances(POLARIS, first, step, count, mode="compensated"))
+    for (exact, _, sigma), (approximate, _, approximate_sigma) in zip(decimal, compensated):
+        assert approximate == pytest.approx(exact, rel=4e-16, abs=0)
+        assert approximate_sigma == sigma
+
+
+@pytest.mark.parametrize("first, step, count", GRIDS)
+def test_fixed_mode_matches_fixed_point(first, step, count):
+    values = iter_arithmetic_distances(POLARIS, first, step, count, mode="fixed")
+    for years_ago, (distance, precision, _) in zip(epochs(first, step, count), values):
+        assert (distance, precision) == calculate_distance_fixed(POLARIS, years_ago)
+
+
+def test_count_and_unknown_mode():
+    assert list(iter_arithmetic_distances(POLARIS, 0, 1, 0)) == []
+    assert len(list(iter_arithmetic_distances(POLARIS, 0, 1, 7))) == 7
+    with pytest.raises(ValueError):
+        next(iter_arithmetic_distances(POLARIS, 0, 1, 1, mode="float"))
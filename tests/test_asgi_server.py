@@ -0,0 +1,103 @@
+"""ASGI entry point driven with in-memory receive/send channels"""
+
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("a2wsgi")
+
+import asgi_server
+import api_server
+from polaris import POLARIS
+
+
+def call(scope, messages):
+    """Run the application on one scope; returns the sent messages"""
+    sent = []
+    incoming = list(messages)
+
+    async def receive():
+        if incoming:
+            return incoming.pop(0)
+        await asyncio.sleep(3600)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(asyncio.wait_for(asgi_server.application(scope, receive, send), timeout=30))
+    return sent
+
+
+def request(method, path, body=b"", query_string=b""):
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method,
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": query_string, "headers": [(b"host", b"testserver")],
+        "client": ("127.0.0.1", 50000), "server": ("testserver", 80),
+    }
+    sent = call(scope, [{"type": "http.request", "body": body, "more_body": False}])
+    start = next(message for message in sent if message["type"] == "http.response.start")
+    payload = b"".join(message.get("body", b"") for message in sent if message["type"] == "http.response.body")
+    return start["status"], json.loads(payload)
+
+
+@pytest.fixture(autouse=True)
+def no_ai_client(monkeypatch):
+    monkeypatch.setattr(asgi_server, "get_async_client", lambda: None)
+    api_server.RESPONSE_CACHE.clear()
+
+
+@pytest.mark.parametrize("body", [b"[]", b'"x"', b"42", b'["query"]'])
+def test_non_object_body_is_400(body):
+    status, payload = request("POST", "/api/ai-search", body)
+    assert status == 400
+    assert "error" in payload
+
+
+@pytest.mark.parametrize("body, status", [
+    (b"", 400), (b"{}", 400), (b"not json", 400),
+    (b'{"query": "How far is Polaris?"}', 200),
+    (b" " * (asgi_server.AI_SEARCH_MAX_BODY_BYTES + 1), 413),
+])
+def test_ai_search(body, status):
+    code, payload = request("POST", "/api/ai-search", body)
+    assert code == status
+    if status == 200:
+        assert payload == api_server.AI_SEARCH_UNAVAILABLE
+
+
+def test_flask_routes_are_served():
+    status, payload = request("GET", "/api/current-distance")
+    assert status == 200
+    assert payload["distance_ly"] == POLARIS.distance_ly
+
+
+def test_lifespan_creates_the_semaphore_in_the_serving_loop(monkeypatch):
+    monkeypatch.setattr(asgi_server, "_ai_search_slots", None)
+    slots = []
+
+    async def run():
+        sent = []
+        messages = asyncio.Queue()
+        await messages.put({"type": "lifespan.startup"})
+
+        async def send(message):
+            sent.append(message["type"])
+            if message["type"] == "lifespan.startup.complete":
+                slots.append(asgi_server._ai_search_slots)
+                await messages.put({"type": "lifespan.shutdown"})
+
+        await asgi_server.application({"type": "lifespan"}, messages.get, send)
+        return sent
+
+    assert asyncio.run(run()) == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+    assert isinstance(slots[0], asyncio.Semaphore)
+    assert asgi_server._ai_search_slots is None
+
+
+def test_flask_rejects_non_object_body_too():
+    with api_server.app.test_client() as client:
+        response = client.post("/api/ai-search", json=[1, 2])
+    assert response.status_code == 400
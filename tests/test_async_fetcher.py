@@ -0,0 +1,244 @@
+"""Tests for async_fetcher against an in-process stub (httpx.MockTransport)"""
+
+import asyncio
+import time
+import types
+
+import httpx
+import pytest
+
+import async_fetcher
+from async_fetcher import AsyncAstronomicalDataFetcher
+
+SIMBAD_URL = "http://simbad.test/sim-id"
+VIZIER_URL = "http://vizier.test/asu-tsv"
+
+GAIA_TSV = (
+    "#RESOURCE=yCat_1350\n"
+    "_r\tSource\tPlx\te_Plx\tpmRA\tpmDE\tRVDR2\te_RVDR2\tGmag\n"
+    "arcmin\t\tmas\tmas\tmas/yr\tmas/yr\tkm/s\tkm/s\tmag\n"
+    "------\t------\t------\t------\t------\t------\t------\t------\t------\n"
+    "0.001\t576402619921510144\t7.3214\t0.1160\t44.48\t-11.85\t\t\t1.8563\n"
+)
+HIPPARCOS_TSV = (
+    "_r\tHIP\tPlx\te_Plx\tpmRA\tpmDE\tVmag\n"
+    "arcmin\t\tmas\tmas\tmas/yr\tmas/yr\tmag\n"
+    "------\t------\t------\t------\t------\t------\t------\n"
+    "0.002\t11767\t7.56\t0.48\t44.22\t-11.74\t2.02\n"
+)
+SIMBAD_JSON = {
+    "coordinates": {"ra": 37.95, "dec": 89.26},
+    "velocity": {"radvel": {"value": -16.42, "error": 0.03}},
+}
+
+
+def stub_handler(gaia=GAIA_TSV, hipparcos=HIPPARCOS_TSV, simbad=SIMBAD_JSON):
+    """Handler answering VizieR and SIMBAD requests like the real services"""
+    def handler(request):
+        if request.url.host == "vizier.test":
+            body = {"I/350/gaiaedr3": gaia, "I/239/hip_main": hipparcos}[request.url.params["-source"]]
+            return httpx.Response(200, text=body or "")
+        if simbad is None:
+            return httpx.Response(404)
+        return httpx.Response(200, json=simbad)
+    return handler
+
+
+def sequence_handler(responses):
+    """Handler returning the given responses in order (the last one repeats)"""
+    calls = []
+
+    def handler(request):
+        response = responses[min(len(calls), len(responses) - 1)]
+        calls.append(request)
+        return response
+    handler.calls = calls
+    return handler
+
+
+def make_fetcher(handler, **options):
+    options.setdefault("retries", 3)
+    return AsyncAstronomicalDataFetcher(simbad_url=SIMBAD_URL, vizier_url=VIZIER_URL,
+                                        transport=httpx.MockTransport(handler), **options)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record backoff delays instead of sleeping"""
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(async_fetcher.asyncio, "sleep", fake_sleep)
+    return delays
+
+
+def run_get(fetcher):
+    async def run():
+        async with fetcher:
+            return await fetcher.get(VIZIER_URL, {"-source": "I/239/hip_main"})
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("status", [503, 429])
+def test_retries_with_backoff(sleeps, status):
+    handler = sequence_handler([httpx.Response(status), httpx.Response(status), httpx.Response(200, text="ok")])
+    fetcher = make_fetcher(handler, backoff=0.5, max_backoff=30.0)
+
+    response = run_get(fetcher)
+
+    assert response.text == "ok"
+    assert len(handler.calls) == 3
+    assert fetcher.retried == 2
+    # Full jitter: attempt k waits at most backoff · 2^k
+    assert len(sleeps) == 2
+    assert 0 <= sleeps[0] <= 0.5 and 0 <= sleeps[1] <= 1.0
+
+
+def test_retry_after_is_honoured_and_capped(sleeps):
+    handler = sequence_handler([
+        httpx.Response(429, headers={"Retry-After": "7"}),
+        httpx.Response(503, headers={"Retry-After": "120"}),
+        httpx.Response(200, text="ok"),
+    ])
+    fetcher = make_fetcher(handler, max_backoff=30.0)
+
+    assert run_get(fetcher).text == "ok"
+    assert sleeps == [7.0, 30.0]
+
+
+def test_gives_up_after_retries(sleeps):
+    handler = sequence_handler([httpx.Response(503)])
+    fetcher = make_fetcher(handler, retries=2)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        run_get(fetcher)
+    assert len(handler.calls) == 3
+    assert len(sleeps) == 2
+
+
+def test_client_errors_are_not_retried(sleeps):
+    handler = sequence_handler([httpx.Response(404)])
+    fetcher = make_fetcher(handler)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        run_get(fetcher)
+    assert len(handler.calls) == 1
+    assert sleeps == []
+
+
+def test_failed_source_counts_as_missing(sleeps):
+    fetcher = make_fetcher(sequence_handler([httpx.Response(503)]), retries=1)
+
+    async def run():
+        async with fetcher:
+            return await fetcher.fetch_hipparcos_data("HIP 11767")
+
+    assert asyncio.run(run()) is None
+    assert fetcher.stats()["failures"] == 1
+
+
+def test_per_host_limit():
+    in_flight = {}
+    peak = {}
+
+    async def handler(request):
+        host = request.url.host
+        in_flight[host] = in_flight.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), in_flight[host])
+        await asyncio.sleep(0.01)
+        in_flight[host] -= 1
+        return stub_handler()(request)
+
+    fetcher = make_fetcher(handler, per_host_limit=2)
+
+    async def run():
+        async with fetcher:
+            return await fetcher.fetch_many([f"HIP {i}" for i in range(10)], concurrency=10)
+
+    results = asyncio.run(run())
+    assert len(results) == 10
+    assert peak == {"vizier.test": 2, "simbad.test": 2}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+def test_cache_ttl(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(async_fetcher, "time", types.SimpleNamespace(monotonic=clock.monotonic,
+                                                                     perf_counter=time.perf_counter))
+    handler = sequence_handler([httpx.Response(200, text=HIPPARCOS_TSV)])
+    fetcher = make_fetcher(handler, cache_ttl=60)
+
+    async def run():
+        async with fetcher:
+            first = await fetcher.fetch_hipparcos_data("HIP 11767")
+            clock.now += 59
+            second = await fetcher.fetch_hipparcos_data("HIP 11767")
+            clock.now += 2
+            third = await fetcher.fetch_hipparcos_data("HIP 11767")
+            return first, second, third
+
+    first, second, third = asyncio.run(run())
+    assert first == second == third
+    assert first["hip_id"] == 11767
+    assert len(handler.calls) == 2
+    assert fetcher.stats()["cache_hits"] == 1
+
+
+def test_cache_ttl_zero_disables_caching():
+    handler = sequence_handler([httpx.Response(200, text=HIPPARCOS_TSV)])
+    fetcher = make_fetcher(handler, cache_ttl=0)
+
+    async def run():
+        async with fetcher:
+            for _ in range(3):
+                await fetcher.fetch_hipparcos_data("HIP 11767")
+
+    asyncio.run(run())
+    assert len(handler.calls) == 3
+    assert fetcher.stats()["cache_hits"] == 0
+    assert fetcher.stats()["cached_results"] == 0
+
+
+def test_fetch_many_merges_sources():
+    fetcher_options = {"simbad_url": SIMBAD_URL, "vizier_url": VIZIER_URL,
+                       "transport": httpx.MockTransport(stub_handler())}
+    done = []
+
+    results = async_fetcher.fetch_many(["Polaris", "HIP 11767", "Polaris"],
+                                       progress=lambda d, total: done.append((d, total)), **fetcher_options)
+
+    assert list(results) == ["Polaris", "HIP 11767"]
+    assert done[-1] == (2, 2)
+    polaris = results["Polaris"]
+    # Gaia wins, the gaps are filled from Hipparcos and SIMBAD
+    assert polaris["priority"] == "GAIA EDR3"
+    assert polaris["sources"] == ["GAIA EDR3", "Hipparcos", "SIMBAD"]
+    assert polaris["parallax_mas"] == 7.3214
+    assert polaris["distance_ly"] == pytest.approx(1000.0 / 7.3214 * 3.261563777167433)
+    assert polaris["magnitude_v"] == 2.02
+    assert polaris["radial_velocity_km_s"] == -16.42
+    assert polaris["radial_velocity_uncertainty"] == 0.03
+    assert polaris["identifier"] == "Polaris"
+
+
+def test_fetch_many_without_any_source():
+    handler = stub_handler(gaia="", hipparcos="", simbad=None)
+    results = async_fetcher.fetch_many(["Nowhere"], simbad_url=SIMBAD_URL, vizier_url=VIZIER_URL,
+                                       transport=httpx.MockTransport(handler))
+    assert results == {"Nowhere": None}
+
+
+def test_parse_vizier_tsv_skips_units_and_dashes():
+    rows = async_fetcher.parse_vizier_tsv(GAIA_TSV)
+    assert len(rows) == 1
+    assert rows[0]["Source"] == "576402619921510144"
+    assert "radial_velocity_km_s" not in async_fetcher.parse_gaia_row(rows[0])
@@ -0,0 +1,54 @@
+"""Vectorized batch engine against the scalar Decimal engine"""
+
+import numpy as np
+import pytest
+
+from batch_kinematics import calculate_distances_batch, precision_from_delta
+from polaris import calculate_distance_high_precision, calculate_distance_uncertainty
+from popular_stars import POPULAR_STARS
+from star_catalog import StarCatalog
+
+EPOCHS = np.array([0.0, 1.0, -1.0, 0.5, 100.0, -2500.0, 5225.0, 1e-4, -1e-7])
+
+
+def test_matches_scalar_engine():
+    stars = list(POPULAR_STARS)
+    batch = calculate_distances_batch(stars, EPOCHS)
+    assert batch["distance_ly"].shape == (len(stars), len(EPOCHS))
+    for i, star in enumerate(stars):
+        for j, years_ago in enumerate(EPOCHS):
+            distance, precision = calculate_distance_high_precision(star, years_ago)
+            assert batch["distance_ly"][i, j] == pytest.approx(distance, rel=1e-14, abs=0)
+            assert batch["precision"][i, j] == precision
+            assert batch["uncertainty_ly"][i, j] == pytest.approx(calculate_distance_uncertainty(star, years_ago), rel=1e-12)
+
+
+def test_check_decimal_reports_no_mismatches():
+    batch = calculate_distances_batch(list(POPULAR_STARS)[:5], EPOCHS, check_decimal=True)
+    assert batch["precision_mismatches"] == 0
+    assert batch["max_abs_error_ly"] < 1e-11
+
+
+def test_catalog_and_star_list_agree():
+    stars = list(POPULAR_STARS)
+    from_list = calculate_distances_batch(stars, EPOCHS)
+    from_catalog = calculate_distances_batch(StarCatalog.from_stars(stars), EPOCHS)
+    for name in ("distance_ly", "precision", "uncertainty_ly"):
+        np.testing.assert_array_equal(from_list[name], from_catalog[name])
+
+
+def test_scalar_epoch_and_longdouble():
+    star = POPULAR_STARS[0]
+    scalar = calculate_distances_batch([star], 100)
+    assert scalar["distance_ly"].shape == (1, 1)
+    extended = calculate_distances_batch([star], 100, dtype=np.longdouble)
+    assert float(extended["distance_ly"][0, 0]) == pytest.approx(float(scalar["distance_ly"][0, 0]), rel=1e-15)
+
+
+def test_rejects_2d_epochs():
+    with pytest.raises(ValueError):
+        calculate_distances_batch(list(POPULAR_STARS), np.zeros((2, 2)))
+
+
+def test_precision_rule():
+    np.testing.assert_array_equal(precision_from_delta([0.0, 1.0, 1e-3, 2e-4, -3e-9, 1e-30]), [6, 6, 6, 6, 11, 18])
@@ -0,0 +1,189 @@
+"""Tests for the persistent catalog response cache"""
+
+import types
+
+import pytest
+import requests
+
+import catalog_cache
+from catalog_cache import CatalogCache, cached_get, is_fresh, request_fingerprint
+
+URL = "http://vizier.test/asu-tsv"
+PARAMS = {"-source": "I/239/hip_main", "-c": "HIP 11767"}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"HTTP {self.status_code}")
+
+
+class FakeSession:
+    """requests.Session stand-in answering with queued responses (or raising exceptions)"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.requests.append({"url": url, "params": params, "headers": headers})
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(catalog_cache, "time", types.SimpleNamespace(time=clock))
+    return clock
+
+
+@pytest.fixture
+def cache(clock):
+    with CatalogCache(":memory:", max_bytes=1000, default_ttl=60) as cache:
+        yield cache
+
+
+def test_ttl(cache, clock):
+    cache.put("SIMBAD", "sim-id", "Polaris", b"body")
+    entry = cache.get("SIMBAD", "sim-id", "Polaris")
+    assert entry.body == b"body"
+    assert is_fresh(entry, clock.now + 59)
+    assert not is_fresh(entry, clock.now + 60)
+
+    cache.put("SIMBAD", "sim-id", "Vega", b"other", ttl=10)
+    clock.now += 30
+    assert cache.purge_expired() == 1
+    assert cache.get("SIMBAD", "sim-id", "Vega") is None
+    assert cache.get("SIMBAD", "sim-id", "Polaris") is not None
+
+
+def test_fresh_entry_is_served_without_request(cache):
+    session = FakeSession(FakeResponse(200, b"v1", {"ETag": '"a"'}))
+    assert cached_get(session, cache, "VizieR", "I/239", "HIP 11767", URL, PARAMS) == b"v1"
+    assert cached_get(session, cache, "VizieR", "I/239", "HIP 11767", URL, PARAMS) == b"v1"
+    assert len(session.requests) == 1
+
+
+def test_304_revalidation_extends_expiry(cache, clock):
+    session = FakeSession(
+        FakeResponse(200, b"v1", {"ETag": '"a"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}),
+        FakeResponse(304, headers={"ETag": '"b"'}),
+    )
+    cached_get(session, cache, "VizieR", "I/239", "HIP 11767", URL, PARAMS)
+    clock.now += 61
+
+    assert cached_get(session, cache, "VizieR", "I/239", "HIP 11767", URL, PARAMS) == b"v1"
+    assert session.requests[1]["headers"] == {"If-None-Match": '"a"',
+                                              "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+    entry = cache.get("VizieR", "I/239", "HIP 11767", request_fingerprint(URL, PARAMS))
+    assert entry.etag == '"b"'
+    assert entry.expires_at == clock.now + 60
+    assert cache.stats()["revalidations"] == 1
+
+
+def test_changed_body_replaces_entry(cache, clock):
+    session = FakeSession(FakeResponse(200, b"v1"), FakeResponse(200, b"v2"))
+    cached_get(session, cache, "VizieR", "I/239", "HIP 11767", URL, PARAMS)
+    clock.now += 61
+    assert cached_get(session, cache, "VizieR", "I/239", "HIP 11767", URL, PARAMS) == b"v2"
+    assert cache.stats()["bodies"] == 1
+
+
+@pytest.mark.parametrize("failure", [requests.ConnectionError("down"), FakeResponse(503)])
+def test_stale_if_error(cache, clock, failure):
+    session = FakeSession(FakeResponse(200, b"v1"), failure)
+    cached_get(session, cache, "VizieR", "I/239", "HIP 11767", URL, PARAMS)
+    clock.now += 61
+    assert cached_get(session, cache, "VizieR", "I/239", "HIP 11767", URL, PARAMS) == b"v1"
+
+
+def test_error_without_cached_body_raises(cache):
+    session = FakeSession(requests.ConnectionError("down"))
+    with pytest.raises(requests.ConnectionError):
+        cached_get(session, cache, "VizieR", "I/239", "HIP 11767", URL, PARAMS)
+
+
+def test_query_fingerprint_mismatch_is_a_miss(cache):
+    session = FakeSession(FakeResponse(200, b"narrow"), FakeResponse(200, b"wide"))
+    cached_get(session, cache, "VizieR", "I/239", "HIP 11767", URL, PARAMS)
+
+    wider = dict(PARAMS, **{"-c.rm": 5})
+    assert request_fingerprint(URL, wider) != request_fingerprint(URL, PARAMS)
+    assert cache.get("VizieR", "I/239", "HIP 11767", request_fingerprint(URL, wider)) is None
+    assert cached_get(session, cache, "VizieR", "I/239", "HIP 11767", URL, wider) == b"wide"
+    assert len(session.requests) == 2
+    # Parameter order does not matter
+    assert request_fingerprint(URL, dict(reversed(list(PARAMS.items())))) == request_fingerprint(URL, PARAMS)
+
+
+def test_eviction_keeps_the_entry_being_written(clock):
+    with CatalogCache(":memory:", max_bytes=100) as cache:
+        cache.put("SIMBAD", "sim-id", "A", b"a" * 60)
+        clock.now += 1
+        entry = cache.put("SIMBAD", "sim-id", "B", b"b" * 60)
+
+        assert cache.get("SIMBAD", "sim-id", "A") is None
+        assert cache.get("SIMBAD", "sim-id", "B").body == entry.body
+        assert cache.stats()["entries"] == 1
+        assert cache.stats()["evictions"] == 1
+
+
+def test_eviction_stops_once_within_budget(clock):
+    with CatalogCache(":memory:", max_bytes=100) as cache:
+        for name in "ABCD":
+            cache.put("SIMBAD", "sim-id", name, name.encode() * 20)
+            clock.now += 1
+        # Touching A makes B the least recently used entry
+        cache.get("SIMBAD", "sim-id", "A")
+        clock.now += 1
+        cache.put("SIMBAD", "sim-id", "E", b"e" * 30)
+
+        stored = {name for name in "ABCDE" if cache.get("SIMBAD", "sim-id", name) is not None}
+        assert stored == {"A", "C", "D", "E"}
+        assert cache.stats()["bytes"] == 90
+
+
+def test_eviction_of_shared_bodies(clock):
+    with CatalogCache(":memory:", max_bytes=100) as cache:
+        cache.put("SIMBAD", "sim-id", "A", b"x" * 40)
+        clock.now += 1
+        cache.put("SIMBAD", "sim-id", "B", b"x" * 40)
+        clock.now += 1
+        cache.put("SIMBAD", "sim-id", "C", b"y" * 70)
+
+        # Dropping A alone frees nothing; B must go too
+        assert cache.stats()["entries"] == 1
+        assert cache.stats()["bytes"] == 70
+
+
+def test_oversized_body_is_kept_alone(clock):
+    with CatalogCache(":memory:", max_bytes=100) as cache:
+        cache.put("SIMBAD", "sim-id", "A", b"a" * 10)
+        clock.now += 1
+        cache.put("SIMBAD", "sim-id", "B", b"b" * 150)
+        assert cache.get("SIMBAD", "sim-id", "A") is None
+        assert cache.get("SIMBAD", "sim-id", "B").body == b"b" * 150
+
+
+def test_explicit_evict(cache, clock):
+    for name in "ABC":
+        cache.put("SIMBAD", "sim-id", name, name.encode() * 100)
+        clock.now += 1
+    assert cache.evict(150) == 2
+    assert cache.get("SIMBAD", "sim-id", "C") is not None
@@ -0,0 +1,67 @@
+"""Tests for the streaming CSV/TSV catalog reader"""
+
+import pytest
+
+from catalog_stream import read_csv, stream_into_catalog
+
+ASU_TSV = (
+    "#RESOURCE=yCat_1239\n"
+    "HIP\tRAICRS\tDEICRS\tPlx\te_Plx\n"
+    "\tdeg\tdeg\tmas\tmas\n"
+    "------\t------\t------\t------\t------\n"
+    "11767\t37.94614689\t89.26413805\t7.56\t0.48\n"
+    "91262\t279.23410832\t38.78299311\t130.23\t0.36\n"
+)
+
+
+def lines(text):
+    return text.splitlines(keepends=True)
+
+
+def test_leading_row_without_numbers_is_data():
+    table = read_csv(lines("main_id,sp_type,distance_ly\nPolaris,F7,\nVega,A0,25\n"))
+    assert list(table.rows) == [["Polaris", "F7", ""], ["Vega", "A0", "25"]]
+    assert table.units == ["", "", ""]
+
+
+def test_leading_row_without_numbers_is_counted():
+    table = read_csv(lines("main_id,sp_type,distance_ly\nPolaris,F7,\nVega,A0,25\n"))
+    result = stream_into_catalog(table)
+    assert (result["rows"], result["appended"], result["rejected"]) == (2, 1, 1)
+    assert result["catalog"].decoded("name") == ["Vega"]
+
+
+def test_asu_tsv_units_and_dashes():
+    table = read_csv(lines(ASU_TSV), delimiter="\t")
+    rows = list(table.rows)
+    assert table.units == ["", "deg", "deg", "mas", "mas"]
+    assert [row[0] for row in rows] == ["11767", "91262"]
+
+
+def test_units_row_followed_by_dashes_is_units_whatever_its_tokens():
+    table = read_csv(lines("name,plx\nstring,milliarcsec\n----,---\nVega,130.23\n"))
+    assert list(table.rows) == [["Vega", "130.23"]]
+    assert table.units == ["string", "milliarcsec"]
+
+
+def test_known_unit_strings_without_dashes():
+    table = read_csv(lines("name,plx,dist\n,arcsec,pc\nVega,0.13023,7.68\n"))
+    result = stream_into_catalog(table)
+    assert table.units == ["", "arcsec", "pc"]
+    assert result["rows"] == 1
+    assert result["catalog"].column("distance_ly")[0] == pytest.approx(25.04, abs=0.01)
+
+
+def test_dashes_without_units():
+    table = read_csv(lines("name,plx\n----,---\nVega,130.23\n"))
+    assert list(table.rows) == [["Vega", "130.23"]]
+    assert table.units == ["", ""]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("name,plx\n", []),
+    ("name,plx\nVega,130.23\n", [["Vega", "130.23"]]),
+    ("name,plx\n,mas\n", []),
+])
+def test_short_inputs(text, expected):
+    assert list(read_csv(lines(text)).rows) == expected
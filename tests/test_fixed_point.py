@@ -0,0 +1,58 @@
+"""Fixed-point engine against an 80-digit Decimal reference"""
+
+from decimal import ROUND_HALF_EVEN, Context, Decimal
+
+import pytest
+
+from fixed_point import calculate_distance_fixed, iter_fixed_distances
+from polaris import (
+    KM_PER_LIGHT_YEAR,
+    POLARIS,
+    SECONDS_PER_YEAR,
+    _precision_for_delta,
+    iter_historical_polaris_timeline,
+)
+from popular_stars import POPULAR_STARS
+
+REFERENCE_DIGITS = 80
+EPOCHS_PER_STAR = 315
+
+
+def reference_distance(star, years_ago, max_precision=18):
+    """d₀ - v_r · years_ago in 80-digit Decimal, rounded half-even to the precision rule"""
+    context = Context(prec=REFERENCE_DIGITS, rounding=ROUND_HALF_EVEN)
+    elapsed = context.minus(Decimal(str(years_ago)))
+    delta = context.divide(
+        context.multiply(context.multiply(Decimal(str(star.radial_velocity_km_s)), elapsed), SECONDS_PER_YEAR),
+        KM_PER_LIGHT_YEAR,
+    )
+    precision = _precision_for_delta(delta, max_precision)
+    distance = context.add(Decimal(str(star.distance_ly)), delta)
+    return str(distance.quantize(Decimal(1).scaleb(-precision), rounding=ROUND_HALF_EVEN, context=context)), precision
+
+
+@pytest.mark.parametrize("star", list(POPULAR_STARS), ids=lambda star: star.name)
+def test_fixed_matches_80_digit_decimal(star, epochs):
+    # 20 catalog stars × 315 epochs: 6,300 cases
+    for years_ago in epochs(star.name, EPOCHS_PER_STAR):
+        distance, precision = calculate_distance_fixed(star, years_ago)
+        assert (str(distance), precision) == reference_distance(star, years_ago), years_ago
+
+
+@pytest.mark.parametrize("first, step", [(5225, -10), ("0.001", "-0.0001"), (-1000, 7)])
+def test_incremental_matches_direct(first, step):
+    values = list(iter_fixed_distances(POLARIS, first, step, 200))
+    for i, (distance, precision) in enumerate(values):
+        years_ago = Decimal(str(first)) + i * Decimal(str(step))
+        assert (distance, precision) == calculate_distance_fixed(POLARIS, years_ago)
+
+
+def test_fixed_and_decimal_timelines_are_equal(timeline_options, timeline_length):
+    decimal = list(iter_historical_polaris_timeline(POLARIS, evaluator="decimal", **timeline_options))
+    fixed = list(iter_historical_polaris_timeline(POLARIS, evaluator="fixed", **timeline_options))
+
+    assert len(decimal) == len(fixed) == timeline_length
+    for a, b in zip(decimal, fixed):
+        exact = b.pop("distance_ly_exact")
+        assert a == b
+        assert exact == f"{a['distance_ly']:.{a['distance_ly_precision']}f}"
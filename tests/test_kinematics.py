@@ -0,0 +1,44 @@
+"""The distance engines agree on the direction of time"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from adaptive_precision import certified_distance
+from batch_kinematics import calculate_distances_batch
+from fixed_point import calculate_distance_fixed
+from monte_carlo import monte_carlo_uncertainty
+from polaris import POLARIS, calculate_distance_high_precision, distance_at_time, iter_arithmetic_distances
+from popular_stars import STAR_INDEX
+from space_motion import propagate
+
+
+@pytest.mark.parametrize("years_ago", [5000, -5000])
+def test_engines_match_space_motion(years_ago):
+    expected = float(propagate([POLARIS], years_ago)["distance_ly"][0, 0])
+    distances = [
+        calculate_distance_high_precision(POLARIS, years_ago)[0],
+        float(calculate_distance_fixed(POLARIS, years_ago)[0]),
+        float(certified_distance(POLARIS, years_ago).distance),
+        float(calculate_distances_batch([POLARIS], years_ago)["distance_ly"][0, 0]),
+        next(iter_arithmetic_distances(POLARIS, years_ago, 1, 1))[0],
+        next(iter_arithmetic_distances(POLARIS, years_ago, 1, 1, mode="compensated"))[0],
+        float(next(iter_arithmetic_distances(POLARIS, years_ago, 1, 1, mode="fixed"))[0]),
+    ]
+    # Only the transverse motion (~1e-4 ly over 5,000 years) separates 1-D and 3-D
+    assert distances == pytest.approx([expected] * len(distances), abs=1e-3)
+
+
+def test_receding_star_was_closer_in_the_past():
+    assert POLARIS.radial_velocity_km_s > 0
+    assert calculate_distance_high_precision(POLARIS, 100)[0] < POLARIS.distance_ly
+    now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    past = distance_at_time(POLARIS, now, now - timedelta(days=36525))
+    assert float(calculate_distance_fixed(POLARIS, 100)[0]) == pytest.approx(past, abs=1e-6)
+
+
+def test_monte_carlo_follows_the_same_sign():
+    star = STAR_INDEX.get("Sirius")
+    result = monte_carlo_uncertainty([star], [10000.0], 2000, seed=0)
+    expected = calculate_distance_high_precision(star, 10000)[0]
+    assert result["bands"][0, 2, 0] == pytest.approx(expected, abs=0.05)
@@ -0,0 +1,62 @@
+"""Live distance stream: reference epoch and per-star sharing"""
+
+import dataclasses
+import json
+
+import pytest
+
+from live_stream import DistanceTicker, Subscription
+from polaris import POLARIS, get_star_kinematics
+from popular_stars import STAR_INDEX
+
+SIRIUS = STAR_INDEX.get("Sirius")
+
+
+def test_snapshot_at_the_reference_time_is_the_catalog_distance():
+    ticker = DistanceTicker()
+    subscription = Subscription([POLARIS, SIRIUS], 1.0, now=1_700_000_000.0)
+    event = ticker.event(subscription, subscription.reference_timestamp)
+
+    assert event["timestamp"] == event["reference_time"] == subscription.reference_time.isoformat()
+    for star, state in zip([POLARIS, SIRIUS], event["stars"]):
+        assert state["distance_ly"] == star.distance_ly
+        assert state["distance_km"] == get_star_kinematics(star).distance_km
+        assert state["delta_ly"] == 0
+
+
+def test_distances_extrapolate_from_the_subscription():
+    ticker = DistanceTicker()
+    subscription = Subscription([POLARIS], 1.0, now=1_700_000_000.0)
+    state = ticker.event(subscription, subscription.reference_timestamp + 3600)["stars"][0]
+
+    delta_ly = get_star_kinematics(POLARIS).rv_ly_per_second * 3600
+    assert state["delta_ly"] == delta_ly > 0  # receding
+    assert state["distance_ly"] == POLARIS.distance_ly + delta_ly
+    assert state["distance_km"] == pytest.approx(get_star_kinematics(POLARIS).distance_km + POLARIS.radial_velocity_km_s * 3600)
+
+
+def test_star_state_is_shared_by_name():
+    ticker = DistanceTicker()
+    computed = {}
+    # Equal stars from different lookups (distinct objects) share one entry
+    first = Subscription([POLARIS], 2.0, now=0.0)
+    second = Subscription([dataclasses.replace(POLARIS)], 2.0, now=10.0)
+    ticker.event(first, 20.0, computed)
+    ticker.event(second, 20.0, computed)
+    assert list(computed) == [("Polaris", 2.0)]
+
+
+def test_stream_starts_at_the_rest_distance():
+    pytest.importorskip("flask")
+    import api_server
+
+    with api_server.app.test_client() as client:
+        rest = client.get("/api/current-distance").get_json()
+        response = client.get("/api/stream/distances?stars=Polaris&interval=1", buffered=False)
+        chunks = iter(response.response)
+        assert next(chunks).startswith(b"retry: 1000")
+        initial = json.loads(next(chunks).split(b"data: ", 1)[1])
+        response.close()
+
+    assert initial["stars"][0]["distance_ly"] == rest["distance_ly"]
+    assert initial["timestamp"] == initial["reference_time"]
@@ -0,0 +1,74 @@
+"""Tests for the Monte Carlo uncertainty engine's memory budget"""
+
+import copy
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from monte_carlo import monte_carlo_uncertainty
+from popular_stars import POPULAR_STARS, STAR_INDEX
+
+MB = 1024 * 1024
+
+
+def peak_bytes(function, *args, **kwargs):
+    """Peak traced allocation (bytes) while running function"""
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        result = function(*args, **kwargs)
+        return result, tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.fixture(autouse=True)
+def warm_up():
+    # First calls import NumPy submodules; keep that out of the measured peaks
+    monte_carlo_uncertainty(POPULAR_STARS[:2], [0.0, 1.0], 10, seed=0)
+
+
+@pytest.mark.parametrize("stars, n_samples, n_epochs, budget", [
+    ((list(POPULAR_STARS) * 20)[:200], 20000, 1, 16 * MB),
+    ([STAR_INDEX.get("Polaris")], 200000, 20, 4 * MB),
+])
+def test_peak_memory_within_budget(stars, n_samples, n_epochs, budget):
+    result, peak = peak_bytes(monte_carlo_uncertainty, stars, np.linspace(0, 5000, n_epochs), n_samples,
+                              seed=0, memory_budget=budget)
+    assert peak <= budget
+    assert np.isfinite(result["bands"]).all()
+
+
+def test_results_do_not_depend_on_budget():
+    stars = POPULAR_STARS[:12]
+    epochs = [0.0, 100.0, 1000.0, -5000.0]
+    reference = monte_carlo_uncertainty(stars, epochs, 5000, seed=1, proper_motion_uncertainty_mas_yr=0.5)
+    for budget in (200_000, 1_000_000):
+        result = monte_carlo_uncertainty(stars, epochs, 5000, seed=1, proper_motion_uncertainty_mas_yr=0.5,
+                                         memory_budget=budget)
+        assert np.array_equal(result["bands"], reference["bands"])
+        np.testing.assert_allclose(result["mean_ly"], reference["mean_ly"], rtol=1e-13)
+        np.testing.assert_allclose(result["std_ly"], reference["std_ly"], rtol=1e-12)
+
+
+def test_invalid_samples_are_excluded():
+    stars = []
+    for star in POPULAR_STARS[:6]:
+        star = copy.copy(star)
+        star.distance_ly_uncertainty = star.distance_ly * 0.8
+        stars.append(star)
+    with np.errstate(all="ignore"):
+        reference = monte_carlo_uncertainty(stars, [0.0, 100.0], 3000, seed=2)
+        small = monte_carlo_uncertainty(stars, [0.0, 100.0], 3000, seed=2, memory_budget=100_000)
+
+    assert (reference["invalid_fraction"] > 0).all()
+    np.testing.assert_array_equal(small["invalid_fraction"], reference["invalid_fraction"])
+    assert np.array_equal(small["bands"], reference["bands"])
+    assert (reference["bands"] > 0).all()
+    np.testing.assert_allclose(small["std_ly"], reference["std_ly"], rtol=1e-12)
+
+
+def test_budget_too_small_for_one_star():
+    with pytest.raises(ValueError, match="memory_budget"):
+        monte_carlo_uncertainty(POPULAR_STARS[:1], [0.0], 100000, memory_budget=1 * MB)
@@ -0,0 +1,46 @@
+"""Sharded precomputation against a single-process run"""
+
+import json
+
+import pytest
+
+from polaris import POLARIS, expand_compact_timeline, generate_historical_polaris_timeline, write_historical_polaris_timeline
+from precompute_timelines import precompute_timelines, shard_ranges, timeline_filename
+
+
+def test_shard_ranges_cover_the_timeline():
+    assert shard_ranges(10, 4) == [(0, 4), (4, 4), (8, 2)]
+    assert shard_ranges(8, 4) == [(0, 4), (4, 4)]
+    assert shard_ranges(0, 4) == []
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_sharded_output_is_byte_identical(tmp_path, indent, timeline_options, timeline_length):
+    results = precompute_timelines(
+        [POLARIS], [timeline_options["interval_years"]], tmp_path, processes=2, shard_periods=100,
+        indent=indent, **{name: value for name, value in timeline_options.items() if name != "interval_years"}
+    )
+    assert results[0]["total_periods"] == timeline_length
+    assert results[0]["shards"] == -(-timeline_length // 100)
+
+    merged = tmp_path / timeline_filename(POLARIS, timeline_options["interval_years"])
+    # Shards are cleaned up unless keep_shards is set
+    assert [path.name for path in tmp_path.iterdir()] == [merged.name]
+
+    expected = tmp_path / "single.json"
+    write_historical_polaris_timeline(POLARIS, str(expected), indent=indent, **timeline_options)
+    assert merged.read_bytes() == expected.read_bytes()
+
+
+def test_compact_output_expands_to_the_report(tmp_path, timeline_options):
+    options = {name: value for name, value in timeline_options.items() if name != "interval_years"}
+    results = precompute_timelines(
+        [POLARIS], [timeline_options["interval_years"]], tmp_path, processes=2, shard_periods=150,
+        compact=True, compression=("gzip",), **options
+    )
+    compact_file, gzip_file = results[0]["compact_files"]
+    assert gzip_file == compact_file + ".gz"
+
+    with open(compact_file, encoding="utf-8") as f:
+        compact = json.load(f)
+    assert expand_compact_timeline(compact) == generate_historical_polaris_timeline(POLARIS, **timeline_options)
@@ -0,0 +1,74 @@
+"""Time-bucketed response cache: ETags, 304s and max-age"""
+
+import pytest
+
+flask = pytest.importorskip("flask")
+
+import response_cache
+from response_cache import ResponseCache, bucket_time
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(response_cache.time, "time", clock)
+    return clock
+
+
+def make_client(bucket_seconds):
+    app = flask.Flask(__name__)
+    cache = ResponseCache()
+    calls = []
+
+    @app.route("/value")
+    @cache.cached("value", lambda: bucket_seconds)
+    def value():
+        calls.append(bucket_time())
+        return flask.jsonify({"timestamp": bucket_time().isoformat(), "calls": len(calls)})
+
+    return app.test_client(), cache, calls
+
+
+def test_if_none_match_gets_304(clock):
+    client, cache, calls = make_client(10.0)
+    first = client.get("/value")
+    assert first.status_code == 200 and first.headers["ETag"]
+
+    repeat = client.get("/value", headers={"If-None-Match": first.headers["ETag"]})
+    assert repeat.status_code == 304
+    assert repeat.get_data() == b""
+    assert repeat.headers["ETag"] == first.headers["ETag"]
+    assert len(calls) == 1 and cache.stats()["hits"] == 1
+
+    other = client.get("/value", headers={"If-None-Match": '"stale"'})
+    assert other.status_code == 200 and other.get_data() == first.get_data()
+
+
+def test_new_bucket_renders_a_new_body(clock):
+    client, _, calls = make_client(10.0)
+    first = client.get("/value")
+    clock.now += 10.0
+    second = client.get("/value", headers={"If-None-Match": first.headers["ETag"]})
+    assert second.status_code == 200
+    assert second.headers["ETag"] != first.headers["ETag"]
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize("elapsed, max_age", [(0.0, 10), (0.5, 10), (9.5, 1), (9.99, 1)])
+def test_max_age_rounds_up_to_the_bucket_end(clock, elapsed, max_age):
+    client, _, _ = make_client(10.0)
+    clock.now += elapsed
+    assert client.get("/value").headers["Cache-Control"] == f"public, max-age={max_age}"
+
+
+def test_sub_second_buckets_revalidate(clock):
+    client, _, _ = make_client(0.25)
+    assert client.get("/value").headers["Cache-Control"] == "no-cache"
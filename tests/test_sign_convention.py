@@ -0,0 +1,62 @@
+"""years_ago is positive in the past: a receding star was closer then"""
+
+from datetime import datetime, timedelta, timezone
+import json
+from pathlib import Path
+
+import pytest
+
+from adaptive_precision import certified_distance
+from batch_kinematics import calculate_distances_batch
+from fixed_point import calculate_distance_fixed
+from monte_carlo import monte_carlo_uncertainty
+from polaris import (
+    POLARIS,
+    calculate_distance_high_precision,
+    distance_at_time,
+    iter_arithmetic_distances,
+    iter_historical_polaris_timeline,
+)
+from popular_stars import STAR_INDEX
+from space_motion import propagate
+
+ROOT = Path(__file__).resolve().parent.parent
+REFERENCE_TIME = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+ENGINES = {
+    "decimal": lambda star, years_ago: calculate_distance_high_precision(star, years_ago)[0],
+    "fixed": lambda star, years_ago: float(calculate_distance_fixed(star, years_ago)[0]),
+    "certified": lambda star, years_ago: certified_distance(star, years_ago).distance_ly,
+    "batch": lambda star, years_ago: float(calculate_distances_batch([star], years_ago)["distance_ly"][0, 0]),
+    "arithmetic": lambda star, years_ago: next(iter_arithmetic_distances(star, years_ago, 1, 1))[0],
+    "compensated": lambda star, years_ago: next(iter_arithmetic_distances(star, years_ago, 1, 1, mode="compensated"))[0],
+    "monte_carlo": lambda star, years_ago: float(monte_carlo_uncertainty([star], [years_ago], 200, seed=0)["bands"][0, 2, 0]),
+    "distance_at_time": lambda star, years_ago: distance_at_time(
+        star, REFERENCE_TIME, REFERENCE_TIME - timedelta(days=years_ago * 365.25)),
+    "space_motion": lambda star, years_ago: float(propagate([star], years_ago)["distance_ly"][0, 0]),
+}
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("star", [POLARIS, STAR_INDEX.get("Vega")], ids=lambda star: star.name)
+def test_past_and_future_follow_the_radial_velocity(engine, star):
+    distance = ENGINES[engine]
+    receding = star.radial_velocity_km_s > 0
+    past, now, future = distance(star, 1000), distance(star, 0), distance(star, -1000)
+    if receding:
+        assert past < now < future
+    else:
+        assert past > now > future
+
+
+def test_published_timeline_is_pinned():
+    # Changing the sign convention again would silently rewrite these files
+    published = json.loads((ROOT / "polaris_100years.json").read_text())
+    periods = {period["year"]: period for period in published["intervals"]}
+    assert periods[-3200]["years_ago"] == 5225
+    assert periods[-3200]["distance_ly"] == 446.116393
+    assert periods[2500]["distance_ly"] == 446.187882
+
+    generated = iter_historical_polaris_timeline(POLARIS, start_year=2025, end_year=-3200, future_year=2500,
+                                                 interval_years=100, reference_time=REFERENCE_TIME)
+    assert [period["distance_ly"] for period in generated] == [period["distance_ly"] for period in published["intervals"]]
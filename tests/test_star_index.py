@@ -0,0 +1,48 @@
+"""Star lookup by name, catalog ID and alias"""
+
+import pytest
+
+from polaris import POLARIS
+from popular_stars import POPULAR_STARS, STAR_ALIASES, STAR_INDEX
+from star_catalog import StarIndex
+
+
+@pytest.mark.parametrize("query", [
+    "Polaris", "  polaris ", "POLARIS", "HIP 11767", "hip11767", "HIP_11767",
+    "North Star", "alpha ursae minoris", "Gaia DR3 131081166581443968", "131081166581443968",
+])
+def test_get_polaris(query):
+    assert STAR_INDEX.get(query).name == POLARIS.name
+
+
+def test_every_star_by_name_id_and_alias():
+    for star in POPULAR_STARS:
+        for query in [star.name, star.catalog_id, *STAR_ALIASES.get(star.name, ())]:
+            assert STAR_INDEX.get(query).name == star.name, query
+
+
+def test_unknown_star():
+    assert STAR_INDEX.get("Nostar") is None
+    assert STAR_INDEX.get("") is None
+
+
+def test_prefix_returns_each_star_once():
+    matches = STAR_INDEX.prefix("alpha", limit=50)
+    names = [star.name for _, star in matches]
+    assert len(names) == len(set(names))
+    assert {"Polaris", "Sirius", "Vega"} <= set(names)
+    assert all(matched.casefold().startswith("alpha") for matched, _ in matches)
+    assert len(STAR_INDEX.prefix("alpha", limit=3)) == 3
+
+
+def test_fuzzy_and_search():
+    assert STAR_INDEX.fuzzy("betelguese")[0][1].name == "Betelgeuse"
+    results = STAR_INDEX.search("vega")
+    assert results[0]["match"] == "exact" and results[0]["name"] == "Vega"
+    assert [result["match"] for result in STAR_INDEX.search("betelguese")] == ["fuzzy"]
+    assert STAR_INDEX.search("betelguese", fuzzy=False) == []
+
+
+def test_index_size_counts_stars():
+    index = StarIndex.from_stars(POPULAR_STARS, aliases=STAR_ALIASES)
+    assert len(index) == len(POPULAR_STARS)
@@ -0,0 +1,71 @@
+"""Binary columnar exports round-trip to the generated timeline and catalog"""
+
+import numpy as np
+import pytest
+
+from polaris import POLARIS, generate_historical_polaris_timeline
+from popular_stars import POPULAR_STARS
+from timeline_export import (
+    PYARROW_AVAILABLE,
+    export_catalog,
+    export_timeline,
+    load_catalog,
+    load_columns,
+    timeline_columns,
+    timeline_report,
+)
+
+STORAGES = ["npy"] + (["arrow", "parquet"] if PYARROW_AVAILABLE else [])
+
+
+@pytest.mark.parametrize("storage", STORAGES)
+def test_decimal_timeline_round_trip(tmp_path, storage, timeline_options, timeline_length):
+    export_timeline(POLARIS, tmp_path, storage, **timeline_options)
+    columns, sidecar = load_columns(tmp_path)
+
+    assert all(len(column) == timeline_length for column in columns.values())
+    assert timeline_report(columns, sidecar) == generate_historical_polaris_timeline(POLARIS, **timeline_options)
+
+
+def test_npy_columns_are_memory_mapped(tmp_path, timeline_options):
+    export_timeline(POLARIS, tmp_path, "npy", **timeline_options)
+    mapped, _ = load_columns(tmp_path)
+    loaded, _ = load_columns(tmp_path, mmap=False)
+
+    assert isinstance(mapped["distance_ly"], np.memmap)
+    assert not mapped["distance_ly"].flags.writeable
+    assert not isinstance(loaded["distance_ly"], np.memmap)
+    np.testing.assert_array_equal(mapped["distance_ly"], loaded["distance_ly"])
+
+
+@pytest.mark.parametrize("storage", STORAGES)
+def test_catalog_round_trip(tmp_path, storage):
+    export_catalog(POPULAR_STARS, tmp_path, storage)
+    catalog = load_catalog(tmp_path)
+
+    assert len(catalog) == len(POPULAR_STARS)
+    assert [view.to_star() for view in catalog] == list(POPULAR_STARS)
+
+
+def test_timeline_export_is_not_a_catalog(tmp_path, timeline_options):
+    export_timeline(POLARIS, tmp_path, "npy", **timeline_options)
+    with pytest.raises(ValueError):
+        load_catalog(tmp_path)
+
+
+@pytest.mark.parametrize("storage", STORAGES)
+def test_fixed_evaluator_round_trip(tmp_path, storage, timeline_options):
+    export_timeline(POLARIS, tmp_path, storage, evaluator="fixed", **timeline_options)
+    columns, sidecar = load_columns(tmp_path)
+
+    assert columns["distance_ly_exact"][0] == "446.116393"
+    expected = generate_historical_polaris_timeline(POLARIS, evaluator="fixed", **timeline_options)
+    assert timeline_report(columns, sidecar) == expected
+
+
+def test_optional_columns_only_when_emitted(timeline_options):
+    columns, _ = timeline_columns(POLARIS, **timeline_options)
+    assert "distance_ly_exact" not in columns
+    exact, _ = timeline_columns(POLARIS, evaluator="fixed", **timeline_options)
+    assert exact["distance_ly_exact"].dtype.kind == "U"
+    assert [float(value) for value in exact["distance_ly_exact"]] == exact["distance_ly"].tolist()
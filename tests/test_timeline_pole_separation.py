@@ -0,0 +1,62 @@
+"""Timeline pole separation shares the distance's motion model and epoch"""
+
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from polaris import (
+    POLARIS,
+    compact_timeline_report,
+    expand_compact_timeline,
+    generate_historical_polaris_timeline,
+    iter_historical_polaris_timeline,
+)
+from precession import pole_separation
+from space_motion import positions, propagate
+
+REFERENCE_TIME = datetime(2025, 12, 23, 8, 7, 7, 820902, tzinfo=timezone.utc)
+
+
+def timeline(start_year=2025, **options):
+    return list(iter_historical_polaris_timeline(POLARIS, start_year=start_year, end_year=-3200, future_year=2500,
+                                                 interval_years=100, reference_time=REFERENCE_TIME,
+                                                 pole_separation=True, **options))
+
+
+@pytest.mark.parametrize("start_year", [2025, 2000, 2100])
+def test_catalog_position_is_at_start_year(start_year):
+    periods = timeline(start_year)
+    years = np.array([period["year"] for period in periods], dtype=np.float64)
+    expected = pole_separation([POLARIS], years, catalog_epoch=start_year)[0]
+    np.testing.assert_allclose([period["pole_separation_deg"] for period in periods], expected, atol=1e-6)
+
+
+def test_distance_is_the_line_of_sight_component_of_the_same_motion():
+    periods = timeline()
+    years_ago = np.array([period["years_ago"] for period in periods], dtype=np.float64)
+    x, y, z, _ = positions([POLARIS], years_ago)
+    # Projection of r(t) on the catalog direction: d₀ + v_r · t exactly
+    direction = np.array([x[0, years_ago == 0][0], y[0, years_ago == 0][0], z[0, years_ago == 0][0]])
+    direction /= np.linalg.norm(direction)
+    radial = direction[0] * x[0] + direction[1] * y[0] + direction[2] * z[0]
+    distances = np.array([period["distance_ly"] for period in periods])
+    np.testing.assert_allclose(distances, radial, atol=1e-6)
+    # and within the transverse term of the 3D distance
+    np.testing.assert_allclose(distances, propagate([POLARIS], years_ago)["distance_ly"][0], atol=1e-3)
+
+
+def test_past_and_future_move_consistently():
+    periods = {period["year"]: period for period in timeline()}
+    # Polaris recedes and approaches the pole until ~2100
+    assert periods[-3200]["distance_ly"] < periods[2025]["distance_ly"] < periods[2500]["distance_ly"]
+    assert periods[-3200]["pole_separation_deg"] > periods[2025]["pole_separation_deg"]
+
+
+def test_compact_round_trip_keeps_pole_separation():
+    report = generate_historical_polaris_timeline(POLARIS, start_year=2025, end_year=-3200, future_year=2500,
+                                                  interval_years=100, reference_time=REFERENCE_TIME,
+                                                  pole_separation=True)
+    compact = compact_timeline_report(report)
+    assert "pole_separation_deg" in compact["columns"]
+    assert expand_compact_timeline(compact) == report
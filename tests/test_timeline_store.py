@@ -0,0 +1,129 @@
+"""Timeline store range queries and MinMax-LTTB downsampling"""
+
+import dataclasses
+import json
+import time
+
+import numpy as np
+import pytest
+
+from polaris import POLARIS, generate_historical_polaris_timeline
+from popular_stars import STAR_INDEX
+from timeline_export import METADATA_FILE
+from timeline_store import TimelineNotFoundError, TimelineStore, lttb_indices, minmax_lttb_indices
+
+BUILD_SPEC = {"start_year": 2025, "end_year": 1525, "future_year": None, "intervals": [10, 1]}
+
+
+def series(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.arange(n, dtype=np.float64), np.cumsum(rng.normal(size=n))
+
+
+@pytest.mark.parametrize("downsample", [lttb_indices, minmax_lttb_indices])
+@pytest.mark.parametrize("n, n_out", [(1000, 3), (1000, 100), (100_000, 500), (50, 49)])
+def test_downsampling_keeps_endpoints_and_budget(downsample, n, n_out):
+    x, y = series(n)
+    keep = downsample(x, y, n_out)
+    assert len(keep) == n_out
+    assert keep[0] == 0 and keep[-1] == n - 1
+    assert np.all(np.diff(keep) > 0)
+
+
+@pytest.mark.parametrize("downsample", [lttb_indices, minmax_lttb_indices])
+def test_downsampling_short_series_is_untouched(downsample):
+    x, y = series(10)
+    np.testing.assert_array_equal(downsample(x, y, 10), np.arange(10))
+    np.testing.assert_array_equal(downsample(x, y, 50), np.arange(10))
+
+
+def test_query_matches_generated_timeline(timeline_store, timeline_options):
+    report = generate_historical_polaris_timeline(POLARIS, **timeline_options)
+    periods = [period for period in report["intervals"] if -1000 <= period["year"] <= 1000]
+
+    result = timeline_store.query(POLARIS, -1000, 1000)
+    assert result["source_interval_years"] == 10
+    assert result["total_points"] == result["returned_points"] == len(periods)
+    columns = result["columns"]
+    assert columns["year"] == [period["year"] for period in periods]
+    assert columns["distance_ly"] == [period["distance_ly"] for period in periods]
+    assert columns["distance_ly_precision"] == [period["distance_ly_precision"] for period in periods]
+
+
+@pytest.mark.parametrize("step, source", [(100, 100), (200, 100), (50, 10)])
+def test_step_reads_the_coarsest_dividing_interval(timeline_store, timeline_options, step, source):
+    result = timeline_store.query(POLARIS, step=step)
+    assert result["source_interval_years"] == source
+
+    # The grid of a timeline generated at interval_years=step, without its off-grid endpoints
+    report = generate_historical_polaris_timeline(POLARIS, **dict(timeline_options, interval_years=step))
+    periods = [period for period in report["intervals"] if (2025 - period["year"]) % step == 0]
+    assert result["columns"]["year"] == [period["year"] for period in periods]
+    assert result["columns"]["distance_ly"] == [period["distance_ly"] for period in periods]
+
+
+def test_max_points_downsamples(timeline_store):
+    full = timeline_store.query(POLARIS)
+    result = timeline_store.query(POLARIS, max_points=40)
+    assert result["downsampled"] and result["returned_points"] == 40
+    assert result["total_points"] == full["total_points"]
+    assert result["columns"]["year"][0] == full["columns"]["year"][0]
+    assert result["columns"]["year"][-1] == full["columns"]["year"][-1]
+
+
+@pytest.mark.parametrize("options", [dict(step=0), dict(step=7), dict(max_points=1), dict(from_year=10, to_year=0)])
+def test_invalid_queries(timeline_store, options):
+    with pytest.raises(ValueError):
+        timeline_store.query(POLARIS, **options)
+
+
+def test_missing_star_without_build_spec(timeline_store):
+    with pytest.raises(TimelineNotFoundError):
+        timeline_store.query(STAR_INDEX.get("Sirius"))
+    assert not TimelineStore(timeline_store.root).covers(STAR_INDEX.get("Sirius"))
+
+
+def wait_for_build(store, star, timeout=60):
+    deadline = time.monotonic() + timeout
+    while store.is_building(star):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_builds_in_the_background(tmp_path):
+    store = TimelineStore(str(tmp_path), build_spec=BUILD_SPEC)
+    # Not covered (and not built on the calling thread) until the build finishes
+    assert not store.covers(POLARIS)
+    with pytest.raises(TimelineNotFoundError):
+        store.query(POLARIS)
+
+    wait_for_build(store, POLARIS)
+    assert store.intervals(POLARIS) == [1, 10]
+    assert store.covers(POLARIS, 1600, 2000, 20)
+    assert store.query(POLARIS, 2000, 2025)["total_points"] == 26
+    assert store.stats() == {"building": [], "build_errors": {}}
+
+
+def test_stale_timelines_are_rebuilt(tmp_path):
+    store = TimelineStore(str(tmp_path), build_spec=BUILD_SPEC)
+    store.build(POLARIS, [10], 2025, 1525)
+    moved = dataclasses.replace(POLARIS, distance_ly=POLARIS.distance_ly + 1)
+    assert store.intervals(POLARIS) == [10]
+    assert store.intervals(moved) == []
+
+    assert not store.covers(moved)
+    wait_for_build(store, moved)
+    assert store.intervals(moved) == [1, 10]
+    assert store.intervals(POLARIS) == []
+    assert store.query(moved, 2025, 2025)["columns"]["distance_ly"] == [pytest.approx(moved.distance_ly, abs=1e-6)]
+
+
+def test_exports_without_a_model_key_are_stale(tmp_path):
+    store = TimelineStore(str(tmp_path))
+    store.build(POLARIS, [10], 2025, 1525)
+    path = tmp_path / "polaris_10years" / METADATA_FILE
+    sidecar = json.loads(path.read_text(encoding="utf-8"))
+    del sidecar["model_key"]
+    path.write_text(json.dumps(sidecar), encoding="utf-8")
+
+    assert TimelineStore(str(tmp_path)).intervals(POLARIS) == []
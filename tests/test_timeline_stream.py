@@ -0,0 +1,79 @@
+"""Streaming timeline generator against the materialized report"""
+
+import io
+import json
+import tracemalloc
+
+import pytest
+
+from polaris import (
+    POLARIS,
+    TimelineStatistics,
+    generate_historical_polaris_timeline,
+    iter_historical_polaris_timeline,
+    iter_historical_polaris_timeline_json,
+    timeline_period_count,
+    write_historical_polaris_timeline,
+)
+
+GRIDS = [
+    dict(start_year=2025, end_year=-3200, future_year=2500, interval_years=100),
+    # Future steps land exactly on future_year
+    dict(start_year=2025, end_year=-3200, future_year=2525, interval_years=100),
+    dict(start_year=2025, end_year=-3200, future_year=None, interval_years=7),
+    # Empty historical range
+    dict(start_year=2025, end_year=2025, future_year=2100, interval_years=25),
+]
+
+
+@pytest.mark.parametrize("grid", GRIDS)
+def test_streamed_periods_equal_the_report(grid, timeline_options):
+    options = dict(grid, reference_time=timeline_options["reference_time"])
+    report = generate_historical_polaris_timeline(POLARIS, **options)
+    periods = list(iter_historical_polaris_timeline(POLARIS, **options))
+
+    assert periods == report["intervals"]
+    assert len(periods) == timeline_period_count(grid["start_year"], grid["end_year"], grid["future_year"], grid["interval_years"])
+    years = [period["year"] for period in periods]
+    assert years == sorted(years)
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_streamed_json_equals_dumps(indent, timeline_options):
+    report = generate_historical_polaris_timeline(POLARIS, **timeline_options)
+    text = "".join(iter_historical_polaris_timeline_json(POLARIS, indent=indent, **timeline_options))
+    assert text == json.dumps(report, ensure_ascii=False, indent=indent)
+
+
+def test_offset_and_limit_slice_the_timeline(timeline_options, timeline_length):
+    periods = list(iter_historical_polaris_timeline(POLARIS, **timeline_options))
+    for offset, limit in [(0, 1), (1, 100), (520, 5), (523, 1), (timeline_length - 3, 10), (timeline_length, 5)]:
+        shard = list(iter_historical_polaris_timeline(POLARIS, offset=offset, limit=limit, **timeline_options))
+        assert shard == periods[offset:offset + limit]
+
+
+def test_write_matches_report_and_statistics(timeline_options):
+    report = generate_historical_polaris_timeline(POLARIS, **timeline_options)
+    buffer = io.StringIO()
+    statistics = write_historical_polaris_timeline(POLARIS, buffer, indent=2, **timeline_options)
+
+    assert json.loads(buffer.getvalue()) == report
+    assert statistics.as_dict() == report["statistics"]
+
+
+def test_memory_does_not_grow_with_periods(timeline_options):
+    def peak(interval_years):
+        options = dict(timeline_options, interval_years=interval_years)
+        tracemalloc.start()
+        statistics = TimelineStatistics()
+        for period in iter_historical_polaris_timeline(POLARIS, **options):
+            statistics.add(period)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak, statistics.total_periods
+
+    peak(100)  # warm up caches and lazy imports
+    small, small_count = peak(100)
+    large, large_count = peak(1)
+    assert large_count > 90 * small_count
+    assert large < 2 * small + 64 * 1024
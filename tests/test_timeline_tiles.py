@@ -0,0 +1,37 @@
+"""Lazily computed tiles against the precomputed timeline store"""
+
+import pytest
+
+from polaris import POLARIS
+from timeline_tiles import TimelineTiles
+
+
+@pytest.mark.parametrize("from_year, to_year, step", [(-3200, 2500, 10), (-1000, 1000, 100), (-995, 2020, 50), (1500, 1500, 10)])
+def test_tiles_match_the_store(timeline_store, from_year, to_year, step):
+    # Small tiles so the windows cross tile boundaries
+    tiles = TimelineTiles(tile_size=16)
+    result = tiles.query(POLARIS, from_year, to_year, step)
+    expected = timeline_store.query(POLARIS, from_year, to_year, step)
+
+    assert result["source"] == "tiles"
+    assert result["columns"] == expected["columns"]
+    assert result["from_year"] == expected["from_year"] and result["to_year"] == expected["to_year"]
+
+
+def test_tiles_match_the_store_when_downsampled(timeline_store):
+    tiles = TimelineTiles(tile_size=64)
+    result = tiles.query(POLARIS, -3200, 2500, 10, max_points=100)
+    assert result["columns"] == timeline_store.query(POLARIS, -3200, 2500, 10, max_points=100)["columns"]
+
+
+def test_lru_eviction_and_hot_pinning():
+    tiles = TimelineTiles(max_tiles=2, tile_size=8, hot_years=20)
+    tiles.query(POLARIS, 1985, 2024, 10)  # one hot tile, pinned
+    tiles.query(POLARIS, 1000, 1700, 10)  # several cold tiles
+    stats = tiles.stats()
+    assert stats["pinned_tiles"] == 1
+    assert stats["tiles"] == 2 and stats["evictions"] > 0
+
+    misses = stats["misses"]
+    tiles.query(POLARIS, 1985, 2024, 10)
+    assert tiles.stats()["misses"] == misses
@@ -0,0 +1,397 @@
+"""
+Polaris Binary Columnar Export
+Memory-mappable column files for timelines and star catalog snapshots
+
+Analysis jobs that only need a few columns should not have to parse a
+whole polaris_*years.json file. This module writes the same data as plain
+columns in one of these storages:
+
+- "npy": one NumPy .npy file per column (np.load(..., mmap_mode="r"))
+- "arrow": a single Arrow IPC file (memory-mapped with pyarrow)
+- "parquet": a single compressed Parquet file (not memory-mappable)
+
+Every export is a directory that also holds metadata.json, a small sidecar
+carrying the NASA metadata block (reference frame, epoch, physical
+constants, provenance) and the column layout. Arrow and Parquet require
+the optional pyarrow package; NumPy storage has no extra dependencies.
+"""
+
+import argparse
+from datetime import datetime, timezone
+from itertools import islice
+import json
+import os
+import sys
+
+import numpy as np
+
+from polaris import (
+    KM_PER_LIGHT_YEAR,
+    NASA_COORDINATE_SYSTEM,
+    NASA_DATA_VERSION,
+    NASA_EPOCH,
+    NASA_REFERENCE_FRAME,
+    POLARIS,
+    SPEED_OF_LIGHT_KMS,
+    TIMELINE_COMPACT_COLUMNS,
+    TIMELINE_COMPACT_FORMAT,
+    TIMELINE_COMPACT_OPTIONAL_COLUMNS,
+    TimelineStatistics,
+    assemble_compact_timeline,
+    compact_timeline_columns,
+    expand_compact_timeline,
+    iter_historical_polaris_timeline,
+    timeline_period_count,
+)
+from star_catalog import FLOAT_FIELDS, MISSING_CODE, STRING_FIELDS, StarCatalog
+
+# Try to import pyarrow, but make it optional
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+TIMELINE_COLUMNS_FORMAT = "polaris-timeline-columns/1"
+CATALOG_COLUMNS_FORMAT = "polaris-catalog-columns/1"
+
+STORAGES = ("npy", "arrow", "parquet")
+
+METADATA_FILE = "metadata.json"
+ARROW_FILE = "columns.arrow"
+PARQUET_FILE = "columns.parquet"
+
+# Timeline columns and their dtypes (uncertainty is NaN where the report has null)
+TIMELINE_COLUMN_DTYPES = {
+    "year": np.int64,
+    "years_ago": np.int64,
+    "distance_ly": np.float64,
+    "distance_ly_precision": np.int8,
+    "distance_ly_uncertainty": np.float64,
+}
+
+# Columns only some evaluators emit (see TIMELINE_COMPACT_OPTIONAL_COLUMNS).
+# distance_ly_exact is a fixed-width string column, as wide as its longest value.
+TIMELINE_OPTIONAL_COLUMN_DTYPES = {
+    "distance_ly_exact": np.str_,
+    "pole_separation_deg": np.float64,
+}
+
+# Periods converted per step when filling timeline columns
+TIMELINE_CHUNK_PERIODS = 65536
+
+DEFAULT_PROVENANCE = "Hipparcos/GAIA EDR3 / SIMBAD"
+
+
+def nasa_metadata(provenance=DEFAULT_PROVENANCE):
+    """NASA metadata block shared by every export sidecar"""
+    return {
+        "data_version": NASA_DATA_VERSION,
+        "reference_frame": NASA_REFERENCE_FRAME,
+        "epoch": NASA_EPOCH,
+        "coordinate_system": NASA_COORDINATE_SYSTEM,
+        "physical_constants": {
+            "light_year_km": str(KM_PER_LIGHT_YEAR),
+            "speed_of_light_kms": str(SPEED_OF_LIGHT_KMS),
+            "constants_source": "CODATA 2018 / IAU 2012"
+        },
+        "provenance": provenance
+    }
+
+
+def timeline_columns(star, start_year=2025, end_year=-3200, future_year=None, interval_years=100,
+                     max_precision=18, reference_time=None, evaluator="decimal"):
+    """
+    Generate a timeline straight into NumPy columns
+
+    Values are identical to the periods of generate_historical_polaris_timeline.
+    Periods are converted in chunks, so no list of period dicts is kept.
+    Optional period fields (e.g. distance_ly_exact with evaluator="fixed")
+    become extra columns typed by TIMELINE_OPTIONAL_COLUMN_DTYPES.
+
+    Args:
+        (as for generate_historical_polaris_timeline)
+
+    Returns:
+        Tuple of (dict of column name → array, sidecar dict). The sidecar
+        holds the compact timeline without its "columns" (report sections,
+        period defaults and overrides), so the full report can be restored.
+    """
+    t_now = reference_time or datetime.now(timezone.utc)
+    total = timeline_period_count(start_year, end_year, future_year, interval_years)
+    columns = {name: np.empty(total, dtype=dtype) for name, dtype in TIMELINE_COLUMN_DTYPES.items()}
+    optional_chunks = {}
+    statistics = TimelineStatistics()
+    overrides = {}
+
+    periods = iter_historical_polaris_timeline(
+        star, start_year, end_year, future_year, interval_years, max_precision, t_now, evaluator
+    )
+    offset = 0
+    while offset < total:
+        chunk = list(islice(periods, TIMELINE_CHUNK_PERIODS))
+        if not chunk:
+            break
+        values, chunk_overrides, chunk_statistics = compact_timeline_columns(chunk, start_year, t_now, first_index=offset)
+        end = offset + len(chunk)
+        for name, column in values.items():
+            if name in TIMELINE_COLUMN_DTYPES:
+                columns[name][offset:end] = np.array(column, dtype=np.float64)
+            else:
+                optional_chunks.setdefault(name, []).append(np.array(column, dtype=TIMELINE_OPTIONAL_COLUMN_DTYPES[name]))
+        columns["years_ago"][offset:end] = start_year - columns["year"][offset:end]
+        statistics.merge(chunk_statistics)
+        overrides.update(chunk_overrides)
+        offset = end
+    for name in TIMELINE_COMPACT_OPTIONAL_COLUMNS:
+        if name in optional_chunks:
+            columns[name] = np.concatenate(optional_chunks[name])
+
+    sidecar = assemble_compact_timeline(
+        star, start_year, end_year, future_year, interval_years, max_precision, t_now,
+        {}, overrides, statistics
+    )
+    del sidecar["columns"]
+    sidecar["format"] = TIMELINE_COLUMNS_FORMAT
+    return columns, sidecar
+
+
+def catalog_columns(catalog):
+    """
+    Snapshot the columns of a StarCatalog
+
+    Returns:
+        Tuple of (dict of column name → array, dict of string field → list of
+        interned values). String columns hold int32 codes into those lists.
+    """
+    columns = {field: np.array(catalog.column(field)) for field in FLOAT_FIELDS + STRING_FIELDS}
+    strings = {field: list(catalog.strings(field).values) for field in STRING_FIELDS}
+    return columns, strings
+
+
+def _column_layout(columns):
+    return {
+        name: {"dtype": column.dtype.str, "length": int(column.shape[0])}
+        for name, column in columns.items()
+    }
+
+
+def _arrow_table(columns, strings=None, metadata=None):
+    """Arrow table of the columns; string code columns become dictionary arrays"""
+    arrays = {}
+    for name, column in columns.items():
+        if strings and name in strings:
+            indices = pa.array(column, mask=(column == MISSING_CODE))
+            arrays[name] = pa.DictionaryArray.from_arrays(indices, pa.array(strings[name], type=pa.string()))
+        else:
+            arrays[name] = pa.array(column)
+    table = pa.table(arrays)
+    if metadata is not None:
+        table = table.replace_schema_metadata({b"polaris": json.dumps(metadata, ensure_ascii=False).encode("utf-8")})
+    return table
+
+
+def write_columns(output_dir, columns, sidecar, storage="npy", strings=None):
+    """
+    Write columns plus the metadata.json sidecar into an export directory
+
+    Args:
+        output_dir: Export directory (created if needed)
+        columns: Dict of column name → 1-D NumPy array
+        sidecar: JSON-serializable metadata dict
+        storage: "npy", "arrow" or "parquet"
+        strings: Optional dict of string field → values for code columns
+
+    Returns:
+        List of written file paths
+    """
+    if storage not in STORAGES:
+        raise ValueError(f"Unknown storage: {storage}")
+    if storage != "npy" and not PYARROW_AVAILABLE:
+        raise RuntimeError(f"{storage} export requires pyarrow (pip install pyarrow)")
+    os.makedirs(output_dir, exist_ok=True)
+
+    sidecar = dict(sidecar)
+    sidecar["storage"] = storage
+    sidecar["column_layout"] = _column_layout(columns)
+    if strings is not None:
+        sidecar["strings"] = strings
+
+    written = []
+    if storage == "npy":
+        for name, column in columns.items():
+            path = os.path.join(output_dir, f"{name}.npy")
+            np.save(path, column)
+            written.append(path)
+    elif storage == "arrow":
+        path = os.path.join(output_dir, ARROW_FILE)
+        table = _arrow_table(columns, strings, sidecar)
+        with pa.OSFile(path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        written.append(path)
+    else:
+        path = os.path.join(output_dir, PARQUET_FILE)
+        pq.write_table(_arrow_table(columns, strings, sidecar), path, compression="zstd")
+        written.append(path)
+
+    path = os.path.join(output_dir, METADATA_FILE)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(sidecar, f, ensure_ascii=False, indent=2)
+    written.append(path)
+    return written
+
+
+def load_columns(export_dir, mmap=True):
+    """
+    Open an export directory written by write_columns
+
+    Args:
+        export_dir: Export directory
+        mmap: Memory-map the column data instead of reading it (npy/arrow)
+
+    Returns:
+        Tuple of (dict of column name → array, sidecar dict). Arrays are
+        read-only memory maps when mmap is True; Parquet is always read.
+    """
+    with open(os.path.join(export_dir, METADATA_FILE), encoding='utf-8') as f:
+        sidecar = json.load(f)
+    storage = sidecar["storage"]
+    names = list(sidecar["column_layout"])
+
+    if storage == "npy":
+        columns = {
+            name: np.load(os.path.join(export_dir, f"{name}.npy"), mmap_mode="r" if mmap else None)
+            for name in names
+        }
+        return columns, sidecar
+
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError(f"Reading {storage} exports requires pyarrow (pip install pyarrow)")
+    if storage == "arrow":
+        path = os.path.join(export_dir, ARROW_FILE)
+        source = pa.memory_map(path, "r") if mmap else pa.OSFile(path, "rb")
+        table = pa.ipc.open_file(source).read_all()
+    else:
+        table = pq.read_table(os.path.join(export_dir, PARQUET_FILE))
+
+    strings = sidecar.get("strings", {})
+    columns = {}
+    for name in names:
+        column = table.column(name).combine_chunks()
+        if name in strings:
+            # Back to int32 codes (MISSING_CODE for nulls), as in the npy layout
+            column = column.indices.fill_null(MISSING_CODE)
+        columns[name] = column.to_numpy(zero_copy_only=False)
+    return columns, sidecar
+
+
+def export_timeline(star, output_dir, storage="npy", start_year=2025, end_year=-3200, future_year=None,
+                    interval_years=100, max_precision=18, reference_time=None, evaluator="decimal",
+                    provenance=DEFAULT_PROVENANCE):
+    """
+    Generate a timeline and export it as binary columns
+
+    Args:
+        output_dir: Export directory
+        storage: "npy", "arrow" or "parquet"
+        provenance: Data provenance recorded in the sidecar
+        (other arguments as for generate_historical_polaris_timeline)
+
+    Returns:
+        List of written file paths
+    """
+    columns, sidecar = timeline_columns(
+        star, start_year, end_year, future_year, interval_years, max_precision, reference_time, evaluator
+    )
+    sidecar["nasa"] = nasa_metadata(provenance)
+    return write_columns(output_dir, columns, sidecar, storage)
+
+
+def export_catalog(catalog, output_dir, storage="npy", provenance=DEFAULT_PROVENANCE):
+    """
+    Export a StarCatalog snapshot as binary columns
+
+    Args:
+        catalog: StarCatalog (or sequence of Star objects)
+        output_dir: Export directory
+        storage: "npy", "arrow" or "parquet"
+        provenance: Data provenance recorded in the sidecar
+
+    Returns:
+        List of written file paths
+    """
+    if not isinstance(catalog, StarCatalog):
+        catalog = StarCatalog.from_stars(catalog)
+    columns, strings = catalog_columns(catalog)
+    sidecar = {
+        "format": CATALOG_COLUMNS_FORMAT,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "size": len(catalog),
+        "nasa": nasa_metadata(provenance)
+    }
+    return write_columns(output_dir, columns, sidecar, storage, strings=strings)
+
+
+def load_catalog(export_dir):
+    """Rebuild a StarCatalog from an export written by export_catalog"""
+    columns, sidecar = load_columns(export_dir, mmap=False)
+    if sidecar.get("format") != CATALOG_COLUMNS_FORMAT:
+        raise ValueError(f"Not a catalog export: {sidecar.get('format')}")
+    values = {}
+    for name, column in columns.items():
+        if name in STRING_FIELDS:
+            table = sidecar["strings"][name]
+            values[name] = [None if code == MISSING_CODE else table[code] for code in column]
+        else:
+            values[name] = column
+    return StarCatalog.from_columns(**values)
+
+
+def timeline_report(columns, sidecar):
+    """
+    Restore the full timeline report (as generate_historical_polaris_timeline
+    returns it) from exported columns and their sidecar
+    """
+    compact = {key: value for key, value in sidecar.items() if key not in ("storage", "column_layout", "nasa")}
+    compact["format"] = TIMELINE_COMPACT_FORMAT
+    compact["columns"] = {}
+    for name in TIMELINE_COMPACT_COLUMNS + tuple(name for name in TIMELINE_COMPACT_OPTIONAL_COLUMNS if name in columns):
+        column = np.asarray(columns[name])
+        values = column.tolist()
+        if column.dtype.kind == "f":
+            values = [None if value != value else value for value in values]
+        compact["columns"][name] = values
+    return expand_compact_timeline(compact)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export timelines and catalog snapshots as binary columns")
+    parser.add_argument("--storage", choices=STORAGES, default="npy")
+    parser.add_argument("--output-dir", default="exports")
+    parser.add_argument("--start-year", type=int, default=2025)
+    parser.add_argument("--end-year", type=int, default=-3200)
+    parser.add_argument("--future-year", type=int, default=None)
+    parser.add_argument("--interval", type=int, default=100, help="Interval in years")
+    parser.add_argument("--max-precision", type=int, default=18)
+    parser.add_argument("--evaluator", choices=("decimal", "compensated", "fixed", "direct"), default="decimal")
+    parser.add_argument("--catalog", action="store_true", help="Also export the popular stars catalog")
+    args = parser.parse_args(argv)
+
+    timeline_dir = os.path.join(args.output_dir, f"polaris_{args.interval}years")
+    written = export_timeline(
+        POLARIS, timeline_dir, args.storage, args.start_year, args.end_year, args.future_year,
+        args.interval, args.max_precision, evaluator=args.evaluator
+    )
+    if args.catalog:
+        from popular_stars import POPULAR_STARS
+        written += export_catalog(POPULAR_STARS, os.path.join(args.output_dir, "popular_stars"), args.storage)
+
+    for path in written:
+        print(f"  {path}: {os.path.getsize(path):,} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,429 @@
+"""
+Polaris Timeline Store
+Indexed, memory-mapped store of precomputed timelines for range queries
+
+The store is a directory of binary column exports (see timeline_export.py),
+one per (star, interval), named like the JSON timelines:
+
+    timeline_store/polaris_100years/   year.npy, distance_ly.npy, ..., metadata.json
+    timeline_store/polaris_1years/
+
+Columns are memory-mapped and the year column is sorted, so a range query
+is two binary searches plus a strided slice: only the pages holding the
+requested window are touched. Results can be downsampled to a point budget
+with MinMax-LTTB, which keeps the visual shape (and the extremes) of the
+distance curve.
+
+Each export's metadata.json records a model key (TIMELINE_MODEL_VERSION
+plus a hash of the star data it was computed from). Exports whose key no
+longer matches are treated as missing, so a changed catalog entry or
+model change never serves stale values. A store with a build spec rebuilds
+missing timelines on a background thread; until a build finishes,
+covers() reports the star as not covered.
+
+Build a store:
+    python timeline_store.py --stars all --intervals 100,10,1 --store-dir timeline_store
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import hashlib
+import json
+import os
+import shutil
+import sys
+import threading
+
+import numpy as np
+
+from precompute_timelines import resolve_stars, timeline_basename
+from star_catalog import STAR_FIELDS
+from timeline_export import (
+    METADATA_FILE,
+    TIMELINE_COLUMNS_FORMAT,
+    export_timeline,
+    load_columns,
+)
+
+# Columns returned by range queries
+QUERY_COLUMNS = ("year", "distance_ly", "distance_ly_precision", "distance_ly_uncertainty")
+
+# Candidates kept per output point by the MinMax preselection before LTTB
+MINMAX_RATIO = 4
+
+# Bumped whenever the stored values change for the same star data
+# (2: distances follow the t = -years_ago sign convention)
+TIMELINE_MODEL_VERSION = 2
+
+
+def timeline_model_key(star):
+    """Key of the model version and star data a stored timeline is computed from"""
+    payload = json.dumps({
+        "version": TIMELINE_MODEL_VERSION,
+        "star": {field: getattr(star, field, None) for field in STAR_FIELDS}
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets downsampling
+
+    Keeps the first and last point and, from each of n_out - 2 equal-count
+    buckets in between, the point forming the largest triangle with the
+    previously selected point and the average of the next bucket.
+
+    Args:
+        x, y: 1-D arrays (x sorted ascending)
+        n_out: Number of points to keep
+
+    Returns:
+        Sorted integer array of selected indices
+    """
+    n = len(x)
+    if n_out >= n or n <= 2:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1])
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    every = (n - 2) / (n_out - 2)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    a = 0
+    for i in range(n_out - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        # Twice the triangle area; the constant factor does not change argmax
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    selected[-1] = n - 1
+    return selected
+
+
+def minmax_indices(y, n_buckets):
+    """
+    Indices of the minimum and maximum of y in each of n_buckets equal-count buckets
+
+    The first and last points are always included.
+    """
+    n = len(y)
+    edges = np.linspace(1, n - 1, n_buckets + 1).astype(np.int64)
+    selected = [0]
+    for start, end in zip(edges[:-1], edges[1:]):
+        if end > start:
+            bucket = y[start:end]
+            selected.append(start + int(np.argmin(bucket)))
+            selected.append(start + int(np.argmax(bucket)))
+    selected.append(n - 1)
+    return np.unique(np.asarray(selected, dtype=np.int64))
+
+
+def minmax_lttb_indices(x, y, n_out, ratio=MINMAX_RATIO):
+    """
+    MinMax-LTTB: preselect per-bucket extremes, then run LTTB on the candidates
+
+    Much cheaper than LTTB over every point for long series, and extremes
+    that plain LTTB might skip survive into the candidate set.
+
+    Returns:
+        Sorted integer array of selected indices into x / y
+    """
+    n = len(x)
+    if n_out >= n:
+        return np.arange(n)
+    if n <= n_out * ratio:
+        return lttb_indices(x, y, n_out)
+    candidates = minmax_indices(np.asarray(y), n_out * ratio // 2)
+    chosen = lttb_indices(np.asarray(x)[candidates], np.asarray(y)[candidates], n_out)
+    return candidates[chosen]
+
+
+def window_result(star_name, window, from_year, to_year, step, source, source_interval_years,
+                  reference_time, max_points=None):
+    """
+    JSON payload of a timeline window, downsampled to max_points if needed
+
+    Args:
+        star_name: Star name
+        window: Dict of QUERY_COLUMNS arrays, sorted by year
+        from_year, to_year: Requested range (reported when the window is empty)
+        step: Spacing in years between points
+        source: "store" (precomputed) or "tiles" (computed on demand)
+        source_interval_years: Interval of the timeline the points come from
+        reference_time: Reference time (ISO string) or None
+        max_points: Point budget for MinMax-LTTB downsampling
+
+    Returns:
+        Dict with the resolved range, point counts and the columns as lists
+    """
+    total = len(window["year"])
+    if max_points is not None and total > max_points:
+        keep = minmax_lttb_indices(window["year"], window["distance_ly"], max_points)
+        window = {name: column[keep] for name, column in window.items()}
+
+    uncertainty = window["distance_ly_uncertainty"]
+    return {
+        "star": star_name,
+        "from_year": int(window["year"][0]) if total else from_year,
+        "to_year": int(window["year"][-1]) if total else to_year,
+        "step": step,
+        "source": source,
+        "source_interval_years": source_interval_years,
+        "reference_time": reference_time,
+        "total_points": total,
+        "returned_points": len(window["year"]),
+        "downsampled": len(window["year"]) < total,
+        "columns": {
+            "year": window["year"].tolist(),
+            "distance_ly": window["distance_ly"].tolist(),
+            "distance_ly_precision": window["distance_ly_precision"].tolist(),
+            "distance_ly_uncertainty": np.where(np.isnan(uncertainty), None, uncertainty).tolist()
+        }
+    }
+
+
+class TimelineNotFoundError(KeyError):
+    """No timeline is stored (or buildable) for the requested star"""
+
+
+class TimelineStore:
+    """
+    Memory-mapped timelines indexed by star and interval
+
+    Args:
+        root: Store directory
+        build_spec: Optional dict of generate_historical_polaris_timeline
+            arguments (start_year, end_year, future_year, intervals) used to
+            build missing or stale timelines in the background; None
+            disables building
+    """
+
+    def __init__(self, root, build_spec=None):
+        self.root = root
+        self.build_spec = build_spec
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._building = set()
+        self._builder = None
+        self.build_errors = {}
+
+    def intervals(self, star):
+        """Intervals (years) stored for a star's current data, finest first"""
+        prefix = timeline_basename(star, 0)[:-len("0years")]
+        model_key = timeline_model_key(star)
+        found = []
+        if os.path.isdir(self.root):
+            for name in os.listdir(self.root):
+                if name.startswith(prefix) and name.endswith("years"):
+                    interval = name[len(prefix):-len("years")]
+                    if (interval.isdigit() and os.path.exists(os.path.join(self.root, name, METADATA_FILE))
+                            and self.open(star, int(interval))[1].get("model_key") == model_key):
+                        found.append(int(interval))
+        return sorted(found)
+
+    def open(self, star, interval_years):
+        """Return the (columns, sidecar) of one stored timeline, memory-mapped and cached"""
+        key = (star.name, interval_years)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                path = os.path.join(self.root, timeline_basename(star, interval_years))
+                columns, sidecar = load_columns(path, mmap=True)
+                if sidecar.get("format") != TIMELINE_COLUMNS_FORMAT:
+                    raise ValueError(f"{path} is not a timeline export")
+                entry = self._entries[key] = (columns, sidecar)
+            return entry
+
+    def build(self, star, intervals, start_year=2025, end_year=-3200, future_year=None):
+        """
+        Export the given intervals of a star's timeline into the store
+
+        Each export is written next to its final directory and swapped in
+        with a rename, so readers never see a half-written timeline.
+        """
+        model_key = timeline_model_key(star)
+        for interval_years in intervals:
+            path = os.path.join(self.root, timeline_basename(star, interval_years))
+            building, stale = path + ".building", path + ".stale"
+            shutil.rmtree(building, ignore_errors=True)
+            export_timeline(
+                star, building, start_year=start_year, end_year=end_year, future_year=future_year,
+                interval_years=interval_years
+            )
+            metadata_path = os.path.join(building, METADATA_FILE)
+            with open(metadata_path, encoding='utf-8') as f:
+                sidecar = json.load(f)
+            sidecar["model_key"] = model_key
+            with open(metadata_path, 'w', encoding='utf-8') as f:
+                json.dump(sidecar, f, ensure_ascii=False, indent=2)
+
+            with self._lock:
+                shutil.rmtree(stale, ignore_errors=True)
+                if os.path.exists(path):
+                    os.replace(path, stale)
+                os.replace(building, path)
+                self._entries.pop((star.name, interval_years), None)
+            # Memory maps of the old files stay valid after the unlink
+            shutil.rmtree(stale, ignore_errors=True)
+
+    def schedule_build(self, star):
+        """
+        Queue a background build of a star's missing build_spec intervals
+
+        Returns:
+            True if a build is queued or running for the star
+        """
+        if self.build_spec is None:
+            return False
+        missing = [interval for interval in self.build_spec["intervals"] if interval not in self.intervals(star)]
+        with self._lock:
+            if star.name in self._building:
+                return True
+            if not missing or star.name in self.build_errors:
+                return False
+            self._building.add(star.name)
+            if self._builder is None:
+                self._builder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="timeline-store")
+            self._builder.submit(self._build_from_spec, star, missing)
+        return True
+
+    def _build_from_spec(self, star, intervals):
+        spec = {name: value for name, value in self.build_spec.items() if name != "intervals"}
+        try:
+            self.build(star, intervals, **spec)
+        except Exception as e:
+            # Remembered (and not retried) so a broken build does not loop per request
+            self.build_errors[star.name] = str(e)
+        finally:
+            with self._lock:
+                self._building.discard(star.name)
+
+    def is_building(self, star):
+        """Whether a background build is queued or running for the star"""
+        with self._lock:
+            return star.name in self._building
+
+    def covers(self, star, from_year=None, to_year=None, step=None):
+        """
+        Whether query can answer this range and step from stored timelines
+
+        Missing or stale build_spec timelines are queued for a background
+        build (see schedule_build) and are not covered until it finishes.
+        """
+        self.schedule_build(star)
+        intervals = self.intervals(star)
+        usable = [interval for interval in intervals if step is None or step % interval == 0]
+        if not usable:
+            return False
+        time_span = self.open(star, usable[0] if step is None else usable[-1])[1]["time_span"]
+        first_year = min(time_span["end_year"], time_span["start_year"])
+        last_year = max(time_span["start_year"], time_span.get("future_year") or time_span["start_year"])
+        return ((from_year is None or from_year >= first_year) and
+                (to_year is None or to_year <= last_year))
+
+    def query(self, star, from_year=None, to_year=None, step=None, max_points=None):
+        """
+        Return the stored periods with from_year <= year <= to_year
+
+        Without step every stored point of the finest interval is returned.
+        With step, only years on the step grid anchored at the timeline's
+        reference year are returned (start_year - year divisible by step,
+        the grid of a timeline generated with interval_years=step), read
+        from the coarsest stored interval that divides step. With
+        max_points the slice is downsampled with MinMax-LTTB.
+
+        Args:
+            star: Star object
+            from_year, to_year: Inclusive year range (default: whole timeline)
+            step: Spacing in years between returned points
+            max_points: Point budget for downsampling
+
+        Returns:
+            Dict with the resolved range, source interval, point counts and
+            the columns in QUERY_COLUMNS as lists
+
+        Raises:
+            TimelineNotFoundError: No current timeline is stored for the star
+            ValueError: Invalid range, step or point budget
+        """
+        if step is not None and step <= 0:
+            raise ValueError("step must be positive")
+        if max_points is not None and max_points < 2:
+            raise ValueError("max_points must be at least 2")
+        if from_year is not None and to_year is not None and from_year > to_year:
+            raise ValueError("from must not be after to")
+
+        intervals = self.intervals(star)
+        if not intervals:
+            raise TimelineNotFoundError(star.name)
+        usable = [interval for interval in intervals if step is None or step % interval == 0]
+        if not usable:
+            raise ValueError(f"step must be a multiple of a stored interval ({', '.join(map(str, intervals))} years)")
+        interval_years = usable[0] if step is None else usable[-1]
+        columns, sidecar = self.open(star, interval_years)
+
+        years = columns["year"]
+        lo = 0 if from_year is None else int(np.searchsorted(years, from_year, side="left"))
+        hi = len(years) if to_year is None else int(np.searchsorted(years, to_year, side="right"))
+        if step is None:
+            selection = slice(lo, hi)
+        else:
+            # Grid points only (drops off-grid range endpoints such as 3200 BC)
+            start_year = sidecar["time_span"]["start_year"]
+            selection = lo + np.flatnonzero((start_year - years[lo:hi]) % step == 0)
+        window = {name: columns[name][selection] for name in QUERY_COLUMNS}
+        return window_result(
+            star.name, window, from_year, to_year, step or interval_years, "store",
+            interval_years, sidecar["metadata"]["calculation_date"], max_points
+        )
+
+    def stats(self):
+        """Build state for health/monitoring endpoints"""
+        with self._lock:
+            return {
+                "building": sorted(self._building),
+                "build_errors": dict(self.build_errors)
+            }
+
+
+def _build_timeline(root, star, interval_years, start_year, end_year, future_year):
+    TimelineStore(root).build(star, [interval_years], start_year, end_year, future_year)
+    return interval_years
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the precomputed timeline store used by /api/timeline")
+    parser.add_argument("--stars", default="all", help='Comma-separated star names ("all" for every known star)')
+    parser.add_argument("--intervals", default="100,10,1", help="Comma-separated interval lengths in years")
+    parser.add_argument("--start-year", type=int, default=2025)
+    parser.add_argument("--end-year", type=int, default=-3200)
+    parser.add_argument("--future-year", type=int, default=2500)
+    parser.add_argument("--store-dir", default="timeline_store")
+    parser.add_argument("--processes", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    try:
+        stars = resolve_stars([name.strip() for name in args.stars.split(",") if name.strip()])
+        intervals = [int(value) for value in args.intervals.split(",") if value.strip()]
+    except ValueError as e:
+        parser.error(str(e))
+
+    with ProcessPoolExecutor(max_workers=args.processes) as pool:
+        futures = [
+            (star, pool.submit(_build_timeline, args.store_dir, star, interval_years,
+                               args.start_year, args.end_year, args.future_year))
+            for star in stars for interval_years in intervals
+        ]
+        for star, future in futures:
+            print(f"  {star.name}: {future.result()}-year interval stored")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
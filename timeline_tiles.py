@@ -0,0 +1,199 @@
+"""
+Polaris Timeline Tiles
+Lazily computed timeline blocks with a bounded LRU cache
+
+A tile is a fixed-size block of consecutive grid points of one star's
+timeline at one resolution. Grid points are anchored at the reference
+year, year = start_year + g · interval_years (g < 0 in the past), and tile
+t holds g in [t · tile_size, (t + 1) · tile_size). Tiles are computed on
+first request with the incremental evaluator and kept in an LRU cache, so
+any resolution and any range is available without precomputing it. Tiles
+overlapping the hot range (the last hot_years before the reference year)
+are pinned and never evicted.
+
+Values are identical to the periods of generate_historical_polaris_timeline
+at the same interval.
+"""
+
+from collections import OrderedDict
+import math
+import threading
+
+import numpy as np
+
+from polaris import iter_arithmetic_distances
+from timeline_store import QUERY_COLUMNS, window_result
+
+# Grid points per tile
+DEFAULT_TILE_SIZE = 1024
+
+# Tiles kept in memory (about 22 bytes per point, ~23 KB per default tile)
+DEFAULT_MAX_TILES = 512
+
+# Tiles covering the last hot_years before the reference year stay resident
+DEFAULT_HOT_YEARS = 1000
+
+# Upper bound on pinned tiles (one or two per star and resolution)
+DEFAULT_MAX_PINNED_TILES = 256
+
+
+def compute_tile(star, interval_years, tile_index, tile_size=DEFAULT_TILE_SIZE, start_year=2025,
+                 max_precision=18, evaluator="decimal"):
+    """
+    Evaluate one tile
+
+    Distances and uncertainties are rounded exactly like timeline periods
+    (float of the value formatted to its precision).
+
+    Args:
+        star: Star object
+        interval_years: Grid resolution in years
+        tile_index: Tile number (negative tiles lie before the reference year)
+        tile_size: Grid points per tile
+        start_year: Reference year the grid is anchored at
+        max_precision: Maximum decimal precision
+        evaluator: "decimal" or "compensated" (see iter_arithmetic_distances)
+
+    Returns:
+        Dict of QUERY_COLUMNS arrays sorted by year
+    """
+    first = tile_index * tile_size
+    years = start_year + (first + np.arange(tile_size, dtype=np.int64)) * interval_years
+    distance = np.empty(tile_size)
+    precision = np.empty(tile_size, dtype=np.int8)
+    uncertainty = np.empty(tile_size)
+
+    # years_ago runs from -first·interval in steps of -interval (oldest first)
+    values = iter_arithmetic_distances(star, -first * interval_years, -interval_years, tile_size,
+                                       max_precision, mode=evaluator)
+    for i, (value, decimals, sigma) in enumerate(values):
+        distance[i] = float(f"{value:.{decimals}f}")
+        precision[i] = decimals
+        uncertainty[i] = round(sigma, decimals) if sigma else np.nan
+
+    return {
+        "year": years,
+        "distance_ly": distance,
+        "distance_ly_precision": precision,
+        "distance_ly_uncertainty": uncertainty,
+    }
+
+
+class TimelineTiles:
+    """
+    Thread-safe LRU cache of lazily computed timeline tiles
+
+    Args:
+        max_tiles: Unpinned tiles kept before the least recently used are evicted
+        tile_size: Grid points per tile
+        start_year: Reference year the grids are anchored at
+        max_precision: Maximum decimal precision
+        hot_years: Tiles overlapping [start_year - hot_years, start_year] are pinned
+        max_pinned_tiles: Hot tiles beyond this many go to the LRU like any other
+        evaluator: "decimal" or "compensated"
+    """
+
+    def __init__(self, max_tiles=DEFAULT_MAX_TILES, tile_size=DEFAULT_TILE_SIZE, start_year=2025,
+                 max_precision=18, hot_years=DEFAULT_HOT_YEARS, max_pinned_tiles=DEFAULT_MAX_PINNED_TILES,
+                 evaluator="decimal"):
+        self.max_tiles = max_tiles
+        self.max_pinned_tiles = max_pinned_tiles
+        self.tile_size = tile_size
+        self.start_year = start_year
+        self.max_precision = max_precision
+        self.hot_years = hot_years
+        self.evaluator = evaluator
+        self._tiles = OrderedDict()
+        self._pinned = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def tile_range(self, interval_years, from_year, to_year):
+        """Indices of the tiles holding grid points between from_year and to_year"""
+        span = self.tile_size * interval_years
+        first = math.floor((from_year - self.start_year) / span)
+        last = math.floor((to_year - self.start_year) / span)
+        return range(first, last + 1)
+
+    def is_hot(self, interval_years, tile_index):
+        """Whether a tile overlaps the pinned hot range"""
+        first_year = self.start_year + tile_index * self.tile_size * interval_years
+        last_year = first_year + (self.tile_size - 1) * interval_years
+        return first_year <= self.start_year and last_year >= self.start_year - self.hot_years
+
+    def get(self, star, interval_years, tile_index):
+        """Return a tile, computing and caching it on first request"""
+        key = (star.name, interval_years, tile_index)
+        with self._lock:
+            tile = self._pinned.get(key)
+            if tile is None:
+                tile = self._tiles.get(key)
+                if tile is not None:
+                    self._tiles.move_to_end(key)
+            if tile is not None:
+                self.hits += 1
+                return tile
+            self.misses += 1
+
+        tile = compute_tile(star, interval_years, tile_index, self.tile_size, self.start_year,
+                            self.max_precision, self.evaluator)
+        for column in tile.values():
+            column.flags.writeable = False
+
+        with self._lock:
+            if self.is_hot(interval_years, tile_index) and len(self._pinned) < self.max_pinned_tiles:
+                self._pinned[key] = tile
+            else:
+                self._tiles[key] = tile
+                while len(self._tiles) > self.max_tiles:
+                    self._tiles.popitem(last=False)
+                    self.evictions += 1
+        return tile
+
+    def query(self, star, from_year, to_year, step=1, max_points=None):
+        """
+        Return the grid points from_year <= year <= to_year at a step-year resolution
+
+        Args:
+            star: Star object
+            from_year, to_year: Inclusive year range
+            step: Grid resolution in years
+            max_points: Point budget for MinMax-LTTB downsampling
+
+        Returns:
+            Dict in the same layout as TimelineStore.query
+        """
+        if step <= 0:
+            raise ValueError("step must be positive")
+        if from_year > to_year:
+            raise ValueError("from must not be after to")
+
+        parts = []
+        for tile_index in self.tile_range(step, from_year, to_year):
+            tile = self.get(star, step, tile_index)
+            lo = int(np.searchsorted(tile["year"], from_year, side="left"))
+            hi = int(np.searchsorted(tile["year"], to_year, side="right"))
+            parts.append({name: column[lo:hi] for name, column in tile.items()})
+        window = {name: np.concatenate([part[name] for part in parts]) for name in QUERY_COLUMNS}
+        return window_result(star.name, window, from_year, to_year, step, "tiles", step, None, max_points)
+
+    def clear(self):
+        """Drop all tiles, including pinned ones"""
+        with self._lock:
+            self._tiles.clear()
+            self._pinned.clear()
+
+    def stats(self):
+        """Cache counters for health/monitoring endpoints"""
+        with self._lock:
+            return {
+                "tiles": len(self._tiles),
+                "pinned_tiles": len(self._pinned),
+                "max_tiles": self.max_tiles,
+                "tile_size": self.tile_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
@@ -3,6 +3,7 @@ Update Polaris parameters with real data from Hipparcos/GAIA EDR3 / SIMBAD
 Run this script to fetch latest data and update calculations
 """
 
+from catalog_cache import CatalogCache
 from data_fetcher import AstronomicalDataFetcher
 from polaris import POLARIS, Star
 import json
@@ -19,8 +20,10 @@ def update_polaris_with_real_data():
     print("  - SIMBAD database")
     print("\n")
     
-    fetcher = AstronomicalDataFetcher()
-    real_data = fetcher.get_best_available_data()
+    # Unchanged records are served from (or revalidated against) the on-disk cache
+    with CatalogCache() as catalog_cache:
+        fetcher = AstronomicalDataFetcher(catalog_cache=catalog_cache)
+        real_data = fetcher.get_best_available_data()
     
     if not real_data:
         print("⚠ Could not fetch real data, keeping default values")